@@ -3,18 +3,26 @@
 import logging
 import os
 import sys
+import time
 from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from flask import Flask, request
+from flask import Flask, g, jsonify, request
 from flask_talisman import Talisman
 from spotipy.exceptions import SpotifyException
 
+from src.application.playlist_specs import encode_playlists_state
 from src.application.spotify_auth_handler import SpotifyAuthHandler
-from src.config.constants import REQUIRED_ENV
+from src.config.constants import (
+    HEALTH_ROUTE,
+    IMPORT_MAX_BYTES,
+    REQUEST_LOG_MESSAGE,
+    REQUIRED_ENV,
+)
 from src.infrastructure.logger import LoggerSingleton
 from src.infrastructure.return_handler import INFO, ReturnHandler
 from src.infrastructure.serveo_tunnel_manager import ServeoTunnelManager
+from src.infrastructure.tracing import TracingMiddleware, tracer
 
 # Atribuição do logger
 logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
@@ -40,6 +48,11 @@ app = Flask(
     static_folder="./src/static",
     static_url_path="",
 )
+app.config["MAX_CONTENT_LENGTH"] = IMPORT_MAX_BYTES
+
+# Tracing das requisições (seção `tracing` do settings.yaml; desligado por padrão)
+tracer.configure_from_settings()
+app.wsgi_app = TracingMiddleware(app.wsgi_app)
 
 # Força HTTPS e adiciona headers de segurança
 Talisman(app, force_https=True)
@@ -48,15 +61,34 @@ Talisman(app, force_https=True)
 logger.info("Instanciando ReturnHandler, SpotifyAuthHandler e ServeoTunnelManager.")
 return_handler = ReturnHandler()
 spotify_auth = SpotifyAuthHandler(return_handler)
-# serveo_manager = ServeoTunnelManager(return_handler)
+serveo_manager = ServeoTunnelManager(return_handler)
+
+# Inicia o túnel Serveo supervisionado ANTES do servidor Flask (`serveo.enabled`)
+if serveo_manager.enabled:
+    logger.info("Iniciando supervisão do túnel Serveo antes do servidor Flask.")
+    serveo_manager.supervise()
+
 
-# Inicia o túnel Serveo ANTES do servidor Flask
-# logger.info("Iniciando túnel Serveo antes do servidor Flask.")
-# serveo_proc = serveo_manager.start_tunnel()
-# if serveo_proc is not None:
-#     logger.info(f"Processo do túnel Serveo iniciado (PID: {serveo_proc.pid}).")
-# else:
-#     logger.warning("Processo do túnel Serveo não foi iniciado corretamente.")
+@app.before_request
+def start_timer() -> None:
+    """Marca o início da requisição para o log de latência."""
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def log_request(response: str) -> str:
+    """Registra método, rota, status e duração da requisição (ver `log_analytics`)."""
+    started = g.get("request_started")
+    if started is not None:
+        logger.info(
+            REQUEST_LOG_MESSAGE.format(
+                method=request.method,
+                path=request.path,
+                status=response.status_code,
+                ms=(time.perf_counter() - started) * 1000,
+            )
+        )
+    return response
 
 
 @app.after_request
@@ -70,7 +102,8 @@ def apply_csp(response: str) -> str:
 def route_login() -> str:
     """Rota inicial: inicia o fluxo de autenticação do usuário com o Spotify."""
     logger.info("Rota '/' acessada. Iniciando fluxo de login do usuário.")
-    return spotify_auth.login()
+    # `/?playlist=Nome&playlist=Outra` cria essas playlists em vez das do settings.yaml.
+    return spotify_auth.login(encode_playlists_state(request.args.getlist("playlist")))
 
 
 @app.route("/callback")
@@ -86,6 +119,33 @@ def route_callback() -> str:
         )
 
 
+@app.route("/import", methods=["GET", "POST"])
+def route_import() -> str:
+    """Rota de importação: recebe um CSV/M3U e inicia o login para criar a playlist."""
+    if request.method == "GET":
+        logger.info("Rota '/import' acessada. Exibindo formulário de importação.")
+        return spotify_auth.templates.render_cached("import.html")
+    logger.info("Rota '/import' acessada. Recebendo arquivo de importação.")
+    return spotify_auth.start_import(request.files.get("file"))
+
+
+@app.route(HEALTH_ROUTE)
+def route_health() -> str:
+    """Rota de saúde: estado do túnel e uso e limitação de cada credencial do Spotify."""
+    return jsonify(
+        status="ok",
+        tunnel=serveo_manager.snapshot(),
+        credentials=spotify_auth.credentials.metrics(),
+    )
+
+
+@app.route("/playlists/<playlist_id>/export")
+def route_export(playlist_id: str) -> str:
+    """Rota de exportação: transmite as faixas da playlist em CSV ou JSON Lines."""
+    logger.info(f"Rota '/playlists/{playlist_id}/export' acessada.")
+    return spotify_auth.export_playlist(playlist_id)
+
+
 try:
     logger.info(
         "Iniciando servidor Flask na porta 8888, aceitando conexões de todas as interfaces."
@@ -94,8 +154,6 @@ try:
 except KeyboardInterrupt:
     logger.info("Interrupção recebida. Encerrando servidor Flask e túnel Serveo...")
 finally:
-    # if serveo_proc is not None:
-    #     logger.info(f"Encerrando túnel Serveo (PID: {serveo_proc.pid}).")
-    #     serveo_manager.stop_tunnel(serveo_proc)
+    serveo_manager.stop()
     logger.info("Aplicação finalizada.")
     sys.exit(0)
@@ -0,0 +1,344 @@
+"""Executor offline de jobs de playlist para vários usuários a partir dos refresh tokens salvos.
+
+Execute a partir da raiz do projeto: `python -m src.application.batch_job_runner --workers 4`.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import cache
+import importlib
+from itertools import batched
+import multiprocessing
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from dotenv import load_dotenv
+from spotipy.oauth2 import SpotifyOauthError
+
+from src.application.playlist_importer import PlaylistImporter
+from src.application.playlist_specs import PlaylistSpec, load_playlist_specs
+from src.common.base.base_class import BaseClass
+from src.common.echo import echo
+from src.config.constants import (
+    BATCH_GLOBAL_CONCURRENCY,
+    BATCH_PROCESS_CONCURRENCY,
+    BATCH_USERS_PER_TASK,
+    OAUTH_REVOKED_ERROR,
+    SPOTIFY_ADD_ITEMS_LIMIT,
+    SPOTIFY_PLAYLISTS_LIMIT,
+    TOKEN_STORE_PATH,
+)
+from src.config.constypes import PathLike
+from src.infrastructure.credential_pool import CredentialPool, credential_scope
+from src.infrastructure.logger import LoggerSingleton
+from src.infrastructure.resilience import ResilientCaller
+from src.infrastructure.token_store import TokenStore
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from multiprocessing.synchronize import BoundedSemaphore
+
+    import spotipy
+
+type UserJob = Callable[["spotipy.Spotify", str, ResilientCaller], None]
+"""Job por usuário: recebe o cliente autenticado, o ID do usuário e o caller resiliente."""
+
+type StoredUser = tuple[str, str, str | None]
+"""Usuário salvo no `TokenStore`: ID, refresh token e client ID da credencial que o autorizou."""
+
+DEFAULT_JOB: str = "src.application.batch_job_runner:create_default_playlist"
+"""Caminho (`módulo:função`) do job executado quando nenhum outro é informado."""
+
+
+@cache
+def _default_spec() -> PlaylistSpec:
+    """Retorna a primeira playlist do settings.yaml, lida uma vez por processo."""
+    return load_playlist_specs()[0]
+
+
+def _find_playlist(
+    spotify_client: "spotipy.Spotify", user_id: str, name: str, resilience: ResilientCaller
+) -> str | None:
+    """Procura, entre as playlists do usuário, a que ele possui com o nome informado."""
+    offset = 0
+    while True:
+        page = resilience.call(
+            "me/playlists",
+            spotify_client.current_user_playlists,
+            limit=SPOTIFY_PLAYLISTS_LIMIT,
+            offset=offset,
+            idempotent=True,
+        )
+        for playlist in page.get("items") or []:
+            if playlist and playlist["name"] == name and playlist["owner"]["id"] == user_id:
+                return playlist["id"]
+        if not page.get("next"):
+            return None
+        offset += SPOTIFY_PLAYLISTS_LIMIT
+
+
+def create_default_playlist(
+    spotify_client: "spotipy.Spotify", user_id: str, resilience: ResilientCaller
+) -> None:
+    """Regenera a playlist padrão do usuário, criando-a apenas na primeira execução."""
+    spec = _default_spec()
+    # Reaproveitar a playlist existente evita uma nova cópia na biblioteca a cada noite.
+    playlist_id = _find_playlist(spotify_client, user_id, spec.name, resilience)
+    if playlist_id is None:
+        playlist = resilience.call(
+            "users/playlists",
+            spotify_client.user_playlist_create,
+            user=user_id,
+            name=spec.name,
+            public=spec.public,
+        )
+        playlist_id = playlist["id"]
+    track_uris = list(spec.tracks)
+    if spec.queries:
+        track_uris.extend(PlaylistImporter(resilience).resolve(spotify_client, spec.queries))
+    # A substituição aceita um lote; as demais faixas são adicionadas em seguida.
+    resilience.call(
+        "playlists/tracks",
+        spotify_client.playlist_replace_items,
+        playlist_id,
+        track_uris[:SPOTIFY_ADD_ITEMS_LIMIT],
+        idempotent=True,
+    )
+    for start in range(SPOTIFY_ADD_ITEMS_LIMIT, len(track_uris), SPOTIFY_ADD_ITEMS_LIMIT):
+        resilience.call(
+            "playlists/tracks",
+            spotify_client.playlist_add_items,
+            playlist_id,
+            track_uris[start : start + SPOTIFY_ADD_ITEMS_LIMIT],
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class UserResult:
+    """Resultado do job de um usuário."""
+
+    user_id: str
+    """ID do usuário no Spotify."""
+
+    ok: bool
+    """Indica se o job terminou sem erros."""
+
+    seconds: float
+    """Duração do job, incluindo a renovação do token."""
+
+    error: str | None = None
+    """Descrição do erro, quando houver."""
+
+
+@dataclass(slots=True, frozen=True)
+class BatchReport:
+    """Resumo de uma execução do batch."""
+
+    succeeded: int
+    """Quantidade de usuários processados com sucesso."""
+
+    failed: int
+    """Quantidade de usuários cujo job falhou."""
+
+    seconds: float
+    """Duração total da execução."""
+
+    @property
+    def users_per_minute(self) -> float:
+        """Retorna a vazão da execução em usuários por minuto."""
+        return (self.succeeded + self.failed) / self.seconds * 60 if self.seconds else 0.0
+
+
+_worker: dict[str, Any] = {}
+"""Estado de cada processo do pool, criado uma única vez pelo inicializador."""
+
+
+def _resolve_job(path: str) -> UserJob:
+    """Importa o job a partir de um caminho no formato `módulo:função`."""
+    module_name, _, function_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _init_worker(
+    oauth_configs: list[dict[str, str]],
+    job_path: str,
+    store_path: PathLike,
+    semaphore: "BoundedSemaphore",
+) -> None:
+    """Prepara o processo: pool de credenciais, caller resiliente e limite global."""
+    _worker["logger"] = LoggerSingleton.logger or LoggerSingleton.get_logger()
+    _worker["credentials"] = CredentialPool(oauth_configs)
+    _worker["job"] = _resolve_job(job_path)
+    _worker["store"] = TokenStore(store_path)
+    _worker["resilience"] = ResilientCaller()
+    _worker["semaphore"] = semaphore
+
+
+def _run_user(user_id: str, refresh_token: str, client_id: str | None) -> UserResult:
+    """Renova o token do usuário e executa o job, respeitando o limite global de concorrência."""
+    logger: Logger = _worker["logger"]
+    resilience: ResilientCaller = _worker["resilience"]
+    credentials: CredentialPool = _worker["credentials"]
+    # O refresh token só é aceito pela credencial (app) que autorizou o usuário.
+    credential = credentials.get(client_id)
+    started = time.perf_counter()
+    # O semáforo é compartilhado entre processos e limita o total de usuários simultâneos.
+    with _worker["semaphore"], credential_scope(credential):
+        try:
+            token_info = resilience.call(
+                "oauth/token", credential.oauth.refresh_access_token, refresh_token
+            )
+        except SpotifyOauthError as error:
+            if error.error == OAUTH_REVOKED_ERROR:
+                # Autorização revogada: o usuário sai do batch até fazer login de novo.
+                logger.warning(f"Refresh token do usuário {user_id} rejeitado. Removendo-o.")
+                _worker["store"].delete(user_id)
+            else:
+                logger.exception(f"Erro ao renovar o token do usuário {user_id}.")
+            return UserResult(user_id, False, time.perf_counter() - started, repr(error))  # noqa: FBT003
+        try:
+            # O Spotify pode rotacionar o refresh token; o novo precisa substituir o antigo.
+            _worker["store"].save(user_id, token_info, credential.client_id)
+            spotify_client = credentials.user_client(token_info["access_token"], credential)
+            _worker["job"](spotify_client, user_id, resilience)
+        except Exception as error:
+            logger.exception(f"Job do usuário {user_id} falhou.")
+            return UserResult(user_id, False, time.perf_counter() - started, repr(error))  # noqa: FBT003
+    return UserResult(user_id, True, time.perf_counter() - started)  # noqa: FBT003
+
+
+async def _run_users_async(users: list[StoredUser], concurrency: int) -> list[UserResult]:
+    """Executa os usuários do bloco com concorrência asyncio limitada dentro do processo."""
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run_one(user_id: str, refresh_token: str, client_id: str | None) -> UserResult:
+        async with limit:
+            # O spotipy é síncrono; cada job roda em uma thread sem bloquear o loop.
+            return await asyncio.to_thread(_run_user, user_id, refresh_token, client_id)
+
+    return await asyncio.gather(*(run_one(*user) for user in users))
+
+
+def _run_task(users: list[StoredUser], concurrency: int) -> list[UserResult]:
+    """Ponto de entrada de uma tarefa do pool de processos."""
+    return asyncio.run(_run_users_async(users, concurrency))
+
+
+class BatchJobRunner(BaseClass):
+    """Distribui jobs de playlist por usuário em um pool de processos com asyncio interno."""
+
+    def __init__(
+        self,
+        oauth_configs: list[dict[str, str]],
+        *,
+        workers: int | None = None,
+        process_concurrency: int = BATCH_PROCESS_CONCURRENCY,
+        global_concurrency: int = BATCH_GLOBAL_CONCURRENCY,
+        job_path: str = DEFAULT_JOB,
+    ) -> None:
+        """Inicializa o executor com a configuração OAuth e os limites de concorrência."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.oauth_configs = oauth_configs
+        self.workers = workers or os.cpu_count() or 1
+        self.process_concurrency = process_concurrency
+        self.global_concurrency = global_concurrency
+        self.job_path = job_path
+        self.store_path: PathLike = TOKEN_STORE_PATH
+        _resolve_job(job_path)
+        self.logger.info(
+            f"BatchJobRunner inicializado: workers={self.workers}, "
+            f"process_concurrency={process_concurrency}, "
+            f"global_concurrency={global_concurrency}, job={job_path}"
+        )
+
+    def run(self, users: Iterable[StoredUser] | None = None) -> BatchReport:
+        """Executa o job para todos os usuários (ou os informados) e retorna o resumo."""
+        if users is None:
+            users = TokenStore(self.store_path).iter_refresh_tokens()
+        semaphore = multiprocessing.BoundedSemaphore(self.global_concurrency)
+        started = time.perf_counter()
+        succeeded = failed = 0
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.oauth_configs, self.job_path, self.store_path, semaphore),
+        ) as executor:
+            for results in self._completed(
+                executor, batched(users, BATCH_USERS_PER_TASK, strict=False)
+            ):
+                succeeded += sum(result.ok for result in results)
+                failed += sum(not result.ok for result in results)
+                elapsed = time.perf_counter() - started
+                echo(
+                    f"{succeeded + failed} usuários processados ({failed} falhas), "
+                    f"{(succeeded + failed) / elapsed * 60:.1f} usuários/min.",
+                    "progress",
+                )
+        report = BatchReport(succeeded, failed, time.perf_counter() - started)
+        self.logger.info(
+            f"Batch concluído: {report.succeeded} sucessos, {report.failed} falhas em "
+            f"{report.seconds:.1f}s ({report.users_per_minute:.1f} usuários/min)."
+        )
+        return report
+
+    def _completed(
+        self,
+        executor: ProcessPoolExecutor,
+        chunks: Iterator[tuple[StoredUser, ...]],
+    ) -> Iterator[list[UserResult]]:
+        """Envia blocos de usuários sob demanda, mantendo no máximo dois por processo na fila."""
+        pending: set[Future] = set()
+        for chunk in chunks:
+            pending.add(executor.submit(_run_task, list(chunk), self.process_concurrency))
+            if len(pending) >= self.workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def main() -> None:
+    """Lê os argumentos da linha de comando e executa o batch para todos os usuários salvos."""
+    parser = argparse.ArgumentParser(description="Executa jobs de playlist para vários usuários.")
+    parser.add_argument("--workers", type=int, default=None, help="Processos no pool.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BATCH_PROCESS_CONCURRENCY,
+        help="Usuários simultâneos por processo.",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=BATCH_GLOBAL_CONCURRENCY,
+        help="Usuários simultâneos somando todos os processos.",
+    )
+    parser.add_argument("--job", default=DEFAULT_JOB, help="Job no formato `módulo:função`.")
+    args = parser.parse_args()
+
+    load_dotenv()
+    # Importado aqui para reaproveitar a validação de ambiente do handler sem o Flask ativo.
+    from src.application.spotify_auth_handler import SpotifyAuthHandler  # noqa: PLC0415
+    from src.infrastructure.return_handler import ReturnHandler  # noqa: PLC0415
+
+    oauth_configs = SpotifyAuthHandler(ReturnHandler()).oauth_configs()
+    report = BatchJobRunner(
+        oauth_configs,
+        workers=args.workers,
+        process_concurrency=args.concurrency,
+        global_concurrency=args.max_in_flight,
+        job_path=args.job,
+    ).run()
+    echo(
+        f"Concluído: {report.succeeded} sucessos, {report.failed} falhas, "
+        f"{report.users_per_minute:.1f} usuários/min.",
+        "success" if not report.failed else "warn",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Carregador em lote (padrão DataLoader) para consultas de faixas, artistas e álbuns por ID."""
+
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future
+import threading
+from typing import TYPE_CHECKING, Any
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import (
+    BATCH_LOADER_WINDOW,
+    SPOTIFY_ALBUMS_LIMIT,
+    SPOTIFY_ARTISTS_LIMIT,
+    SPOTIFY_TRACKS_LIMIT,
+)
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    import spotipy
+
+    from src.infrastructure.resilience import ResilientCaller
+
+
+class BatchLoader[K: Hashable, V](BaseClass):
+    """Agrupa chamadas individuais `load(id)` em lotes máximos, deduplicados e memoizados."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], list[V | None]],
+        max_batch_size: int,
+        window: float = BATCH_LOADER_WINDOW,
+        *,
+        cache: bool = True,
+        name: str = "batch",
+    ) -> None:
+        """Inicializa o carregador com a função de lote, o tamanho máximo e a janela de espera."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self.cache_enabled = cache
+        self.name = name
+        self._cache: dict[K, Future] = {}
+        self._pending: dict[K, Future] = {}
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+
+        self.requested: int = 0
+        """Quantidade de chamadas `load` recebidas."""
+
+        self.batches: int = 0
+        """Quantidade de chamadas em lote efetivamente executadas."""
+
+    def load(self, key: K) -> Future:
+        """Agenda a consulta de uma chave e retorna um `Future` com o valor (ou None)."""
+        ready: dict[K, Future] | None = None
+        with self._lock:
+            self.requested += 1
+            future = self._cache.get(key) or self._pending.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[key] = future
+            if self.cache_enabled:
+                self._cache[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                ready = self._take_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.dispatch)
+                self._timer.daemon = True
+                self._timer.start()
+        if ready:
+            self._execute(ready)
+        return future
+
+    def load_many(self, keys: Iterable[K]) -> list[Future]:
+        """Agenda a consulta de várias chaves, preservando a ordem recebida."""
+        return [self.load(key) for key in keys]
+
+    def get(self, key: K) -> V | None:
+        """Retorna o valor de uma chave, aguardando o lote em que ela foi agrupada."""
+        return self.load(key).result()
+
+    def get_many(self, keys: Iterable[K]) -> list[V | None]:
+        """Retorna os valores de várias chaves, disparando os lotes pendentes imediatamente."""
+        futures = self.load_many(keys)
+        self.dispatch()
+        return [future.result() for future in futures]
+
+    def dispatch(self) -> None:
+        """Executa imediatamente os lotes pendentes, sem aguardar o fim da janela."""
+        with self._lock:
+            ready = self._take_pending()
+        if ready:
+            self._execute(ready)
+
+    def clear(self) -> None:
+        """Descarta os valores memoizados (ex: ao final de uma requisição)."""
+        with self._lock:
+            self._cache.clear()
+
+    def _take_pending(self) -> dict[K, Future]:
+        """Retira as chaves pendentes e cancela o timer da janela (com o lock adquirido)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        ready, self._pending = self._pending, {}
+        return ready
+
+    def _execute(self, ready: dict[K, Future]) -> None:
+        """Executa a função de lote em blocos do tamanho máximo e distribui os resultados."""
+        keys = list(ready)
+        for offset in range(0, len(keys), self.max_batch_size):
+            chunk = keys[offset : offset + self.max_batch_size]
+            with self._lock:
+                self.batches += 1
+            try:
+                values = self.batch_fn(chunk)
+            except Exception as error:
+                self.logger.exception(f"Erro ao carregar lote '{self.name}' com {len(chunk)} IDs.")
+                self._fail(ready, chunk, error)
+                continue
+            if len(values) != len(chunk):
+                msg = f"Lote '{self.name}' retornou {len(values)} valores para {len(chunk)} IDs."
+                self.logger.error(msg)
+                self._fail(ready, chunk, ValueError(msg))
+                continue
+            for key, value in zip(chunk, values, strict=True):
+                ready[key].set_result(value)
+        self.logger.debug(
+            f"Lote '{self.name}': {len(keys)} IDs distintos, "
+            f"{self.requested} solicitações e {self.batches} chamadas até agora."
+        )
+
+    def _fail(self, ready: dict[K, Future], chunk: list[K], error: BaseException) -> None:
+        """Propaga a falha de um lote aos solicitantes sem memoizá-la."""
+        with self._lock:
+            # Falhas não são memoizadas para que uma nova consulta possa tentar de novo.
+            for key in chunk:
+                self._cache.pop(key, None)
+        for key in chunk:
+            ready[key].set_exception(error)
+
+
+class SpotifyCatalogLoader(BaseClass):
+    """Carregadores em lote para os endpoints `/tracks`, `/artists` e `/albums` do Spotify."""
+
+    def __init__(
+        self,
+        spotify_client: "spotipy.Spotify",
+        resilience: "ResilientCaller",
+        window: float = BATCH_LOADER_WINDOW,
+        *,
+        cache: bool = True,
+    ) -> None:
+        """Inicializa um carregador por tipo de recurso com o limite de IDs de cada endpoint."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.client = spotify_client
+        self.resilience = resilience
+        self.tracks: BatchLoader[str, dict[str, Any]] = BatchLoader(
+            self._fetch_tracks, SPOTIFY_TRACKS_LIMIT, window, cache=cache, name="tracks"
+        )
+        self.artists: BatchLoader[str, dict[str, Any]] = BatchLoader(
+            self._fetch_artists, SPOTIFY_ARTISTS_LIMIT, window, cache=cache, name="artists"
+        )
+        self.albums: BatchLoader[str, dict[str, Any]] = BatchLoader(
+            self._fetch_albums, SPOTIFY_ALBUMS_LIMIT, window, cache=cache, name="albums"
+        )
+
+    def dispatch(self) -> None:
+        """Executa imediatamente os lotes pendentes de todos os recursos."""
+        for loader in (self.tracks, self.artists, self.albums):
+            loader.dispatch()
+
+    def _fetch_tracks(self, ids: list[str]) -> list[dict[str, Any] | None]:
+        """Consulta um lote de faixas em uma única chamada."""
+        response = self.resilience.call("tracks", self.client.tracks, ids, idempotent=True)
+        return response["tracks"]
+
+    def _fetch_artists(self, ids: list[str]) -> list[dict[str, Any] | None]:
+        """Consulta um lote de artistas em uma única chamada."""
+        response = self.resilience.call("artists", self.client.artists, ids, idempotent=True)
+        return response["artists"]
+
+    def _fetch_albums(self, ids: list[str]) -> list[dict[str, Any] | None]:
+        """Consulta um lote de álbuns em uma única chamada."""
+        response = self.resilience.call("albums", self.client.albums, ids, idempotent=True)
+        return response["albums"]
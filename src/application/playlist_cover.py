@@ -0,0 +1,254 @@
+"""Geração de capas de playlist (mosaico de capas de álbuns ou cartão com o título).
+
+Decodificar, redimensionar e codificar imagens consome CPU: esse trabalho roda em um pool de
+processos, enquanto threads baixam as capas de álbum e enviam o resultado ao Spotify. A thread
+da requisição apenas agenda a geração. Requer o extra opcional `cover` (Pillow).
+"""
+
+import base64
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import importlib.util
+import io
+import textwrap
+import threading
+from typing import TYPE_CHECKING
+import zlib
+
+from requests.exceptions import RequestException
+from spotipy.exceptions import SpotifyException
+
+from src.application.track_store import TrackStore
+from src.common.base.base_class import BaseClass
+from src.common.errors.errors import CircuitOpenError, DeadlineExceededError
+from src.config.constants import (
+    COVER_ART_CACHE_SIZE,
+    COVER_JPEG_QUALITIES,
+    COVER_MAX_BYTES,
+    COVER_MOSAIC_GRID,
+    COVER_PROCESS_WORKERS,
+    COVER_SIZES,
+    COVER_THREAD_WORKERS,
+    SPOTIFY_REQUEST_TIMEOUT,
+    SPOTIFY_TRACKS_LIMIT,
+)
+from src.infrastructure.logger import LoggerSingleton
+from src.infrastructure.tracing import TracedSession
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from PIL.Image import Image
+    import spotipy
+
+    from src.application.batch_loader import SpotifyCatalogLoader
+    from src.infrastructure.resilience import ResilientCaller
+
+type Artwork = tuple[str, bytes]
+"""Capa de álbum baixada: URL (chave do cache) e bytes do arquivo original."""
+
+_TITLE_WRAP: int = 14
+"""Quantidade de caracteres por linha do título no cartão."""
+
+_TITLE_MAX_LINES: int = 4
+"""Quantidade máxima de linhas do título no cartão."""
+
+_decoded_art: "OrderedDict[tuple[str, int], Image]" = OrderedDict()
+"""Cache LRU, por processo do pool, das capas de álbum já decodificadas e redimensionadas."""
+
+
+def render_cover(title: str, artworks: list[Artwork]) -> str:
+    """Monta a capa e a retorna como JPEG em base64 dentro do limite do Spotify."""
+    grid = COVER_MOSAIC_GRID if len(artworks) >= COVER_MOSAIC_GRID**2 else 1
+    tile = COVER_SIZES[0] // grid
+    tiles = []
+    for url, data in artworks[: grid * grid]:
+        decoded = _decode_art(url, data, tile)
+        if decoded is not None:
+            tiles.append(decoded)
+    image = _mosaic(tiles, grid, tile) if len(tiles) == grid * grid else _title_card(title)
+    return _encode(image)
+
+
+def _decode_art(url: str, data: bytes, size: int) -> "Image | None":
+    """Decodifica e recorta a capa em um quadrado do tamanho informado, usando o cache."""
+    from PIL import Image, ImageOps, UnidentifiedImageError  # noqa: PLC0415
+
+    key = (url, size)
+    cached = _decoded_art.get(key)
+    if cached is not None:
+        _decoded_art.move_to_end(key)
+        return cached
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            source.draft("RGB", (size, size))
+            decoded = ImageOps.fit(source.convert("RGB"), (size, size), Image.Resampling.LANCZOS)
+    except (UnidentifiedImageError, OSError):
+        return None
+    _decoded_art[key] = decoded
+    if len(_decoded_art) > COVER_ART_CACHE_SIZE:
+        _decoded_art.popitem(last=False)
+    return decoded
+
+
+def _mosaic(tiles: list["Image"], grid: int, tile: int) -> "Image":
+    """Posiciona as capas de álbum em uma grade quadrada."""
+    from PIL import Image  # noqa: PLC0415
+
+    image = Image.new("RGB", (grid * tile, grid * tile))
+    for index, decoded in enumerate(tiles):
+        row, column = divmod(index, grid)
+        image.paste(decoded, (column * tile, row * tile))
+    return image
+
+
+def _title_card(title: str) -> "Image":
+    """Desenha um cartão com o título sobre uma cor derivada do próprio título."""
+    from PIL import Image, ImageDraw, ImageFont  # noqa: PLC0415
+
+    size = COVER_SIZES[0]
+    # `crc32` é estável entre processos, ao contrário de `hash`: o mesmo título gera a mesma cor.
+    seed = zlib.crc32(title.encode("utf-8"))
+    background = (seed & 0x7F, (seed >> 8) & 0x7F, (seed >> 16) & 0x7F)
+    image = Image.new("RGB", (size, size), background)
+    draw = ImageDraw.Draw(image)
+    text = "\n".join(
+        textwrap.wrap(title, _TITLE_WRAP, max_lines=_TITLE_MAX_LINES, placeholder="…") or [""]
+    )
+    font = ImageFont.load_default(size=size // 10)
+    left, top, right, bottom = draw.multiline_textbbox((0, 0), text, font=font, align="center")
+    position = ((size - (right - left)) / 2 - left, (size - (bottom - top)) / 2 - top)
+    draw.multiline_text(position, text, fill="white", font=font, align="center")
+    return image
+
+
+def _encode(image: "Image") -> str:
+    """Codifica em JPEG reduzindo qualidade e tamanho até caber em `COVER_MAX_BYTES`."""
+    from PIL import Image  # noqa: PLC0415
+
+    for size in COVER_SIZES:
+        resized = (
+            image if image.width == size else image.resize((size, size), Image.Resampling.LANCZOS)
+        )
+        for quality in COVER_JPEG_QUALITIES:
+            buffer = io.BytesIO()
+            resized.save(buffer, "JPEG", quality=quality, optimize=True)
+            encoded = base64.b64encode(buffer.getvalue())
+            if len(encoded) <= COVER_MAX_BYTES:
+                return encoded.decode("ascii")
+    msg = f"Capa acima de {COVER_MAX_BYTES} bytes mesmo no menor tamanho e qualidade."
+    raise ValueError(msg)
+
+
+class PlaylistCoverGenerator(BaseClass):
+    """Gera e envia capas de playlists em segundo plano, sem bloquear a requisição."""
+
+    def __init__(self, resilience: "ResilientCaller", catalog: "SpotifyCatalogLoader") -> None:
+        """Inicializa as threads de rede; o pool de processos é criado no primeiro uso."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.resilience = resilience
+        self.catalog = catalog
+        self.enabled = importlib.util.find_spec("PIL") is not None
+        if not self.enabled:
+            self.logger.warning("Pillow não instalado: playlists serão criadas sem capa.")
+        self._threads = ThreadPoolExecutor(
+            max_workers=COVER_THREAD_WORKERS, thread_name_prefix="cover"
+        )
+        self._processes: ProcessPoolExecutor | None = None
+        self._session = TracedSession()
+        self._artworks: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        spotify_client: "spotipy.Spotify",
+        playlist_id: str,
+        title: str,
+        track_uris: list[str] | None = None,
+    ) -> Future | None:
+        """Agenda a geração e o envio da capa, retornando imediatamente."""
+        if not self.enabled:
+            return None
+        future = self._threads.submit(
+            self._generate, spotify_client, playlist_id, title, list(track_uris or [])
+        )
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def shutdown(self) -> None:
+        """Encerra as threads e o pool de processos, descartando capas ainda não geradas."""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+    def _generate(
+        self, spotify_client: "spotipy.Spotify", playlist_id: str, title: str, track_uris: list[str]
+    ) -> None:
+        """Baixa as capas de álbum, monta a capa em outro processo e a envia ao Spotify."""
+        artworks = []
+        for url in self._artwork_urls(track_uris):
+            data = self._download(url)
+            if data is not None:
+                artworks.append((url, data))
+        cover = self._process_pool().submit(render_cover, title, artworks).result()
+        self.resilience.call(
+            "playlists/images",
+            spotify_client.playlist_upload_cover_image,
+            playlist_id,
+            cover,
+            idempotent=True,
+        )
+        self.logger.info(
+            f"Capa enviada para a playlist {playlist_id} ({len(artworks)} capas de álbum, "
+            f"{len(cover)} bytes)."
+        )
+
+    def _artwork_urls(self, track_uris: list[str]) -> list[str]:
+        """Retorna as URLs das capas dos primeiros álbuns distintos das faixas."""
+        if not track_uris:
+            return []
+        # Sem `dispatch`: capas geradas ao mesmo tempo (várias playlists por login) dividem
+        # as mesmas chamadas a `/tracks`, com IDs repetidos consultados uma única vez.
+        futures = self.catalog.tracks.load_many(track_uris[:SPOTIFY_TRACKS_LIMIT])
+        store = TrackStore()
+        store.extend_from_page({"tracks": [future.result() for future in futures]})
+        urls = [url for url in store.albums.extras if url]
+        return urls[: COVER_MOSAIC_GRID**2]
+
+    def _download(self, url: str) -> bytes | None:
+        """Baixa a capa de álbum, reaproveitando o cache de capas já baixadas."""
+        with self._lock:
+            data = self._artworks.get(url)
+            if data is not None:
+                self._artworks.move_to_end(url)
+                return data
+        try:
+            response = self._session.get(url, timeout=SPOTIFY_REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except RequestException:
+            self.logger.warning(f"Falha ao baixar a capa de álbum {url}.")
+            return None
+        with self._lock:
+            self._artworks[url] = response.content
+            if len(self._artworks) > COVER_ART_CACHE_SIZE:
+                self._artworks.popitem(last=False)
+        return response.content
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        """Cria o pool de processos no primeiro uso."""
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=COVER_PROCESS_WORKERS)
+            return self._processes
+
+    def _log_failure(self, future: Future) -> None:
+        """Registra a falha da geração; a playlist já criada permanece sem capa."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(
+            error, (SpotifyException, CircuitOpenError, DeadlineExceededError, ValueError)
+        ):
+            self.logger.warning(f"Capa não enviada: {type(error).__name__}: {error}")
+        elif error is not None:
+            self.logger.error(f"Erro inesperado ao gerar capa: {error!r}")
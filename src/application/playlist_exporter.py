@@ -0,0 +1,132 @@
+"""Exportação de playlists em CSV ou JSON Lines, transmitida página a página."""
+
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+import csv
+import io
+import json
+from typing import TYPE_CHECKING, Any
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import EXPORT_FIELDS, EXPORT_FORMATS, SPOTIFY_PLAYLIST_ITEMS_LIMIT
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    import spotipy
+
+    from src.infrastructure.resilience import ResilientCaller
+
+EXPORT_COLUMNS: tuple[str, ...] = (
+    "position",
+    "uri",
+    "name",
+    "artists",
+    "album",
+    "duration_ms",
+    "added_at",
+)
+"""Colunas exportadas para cada faixa, na ordem do CSV."""
+
+
+def export_row(position: int, item: dict[str, Any]) -> dict[str, Any] | None:
+    """Converte um item da playlist em linha de exportação, ignorando itens sem faixa."""
+    track = item.get("track")
+    if not track or not track.get("uri"):
+        return None
+    return {
+        "position": position,
+        "uri": track["uri"],
+        "name": track.get("name"),
+        "artists": ", ".join(artist["name"] for artist in track.get("artists") or []),
+        "album": (track.get("album") or {}).get("name"),
+        "duration_ms": track.get("duration_ms"),
+        "added_at": item.get("added_at"),
+    }
+
+
+class PlaylistExporter(BaseClass):
+    """Gera a exportação de uma playlist em blocos de texto, buscando a próxima página antes."""
+
+    def __init__(self, resilience: "ResilientCaller") -> None:
+        """Inicializa o exportador com o caller resiliente usado nas chamadas paginadas."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.resilience = resilience
+
+    def first_page(self, spotify_client: "spotipy.Spotify", playlist_id: str) -> dict[str, Any]:
+        """Busca a primeira página, para que erros (ex: 404) ocorram antes do streaming."""
+        return self.resilience.call(
+            "playlists/tracks",
+            spotify_client.playlist_items,
+            playlist_id,
+            fields=EXPORT_FIELDS,
+            limit=SPOTIFY_PLAYLIST_ITEMS_LIMIT,
+            additional_types=("track",),
+            idempotent=True,
+        )
+
+    def export(
+        self, spotify_client: "spotipy.Spotify", first_page: dict[str, Any], export_format: str
+    ) -> Iterator[str]:
+        """Produz o documento no formato informado, um bloco por página recebida."""
+        if export_format not in EXPORT_FORMATS:
+            msg = f"Formato de exportação não suportado: '{export_format}'."
+            raise ValueError(msg)
+        rows = self._rows(spotify_client, first_page)
+        if export_format == "csv":
+            return self._csv_chunks(rows)
+        return self._jsonl_chunks(rows)
+
+    def _rows(
+        self, spotify_client: "spotipy.Spotify", first_page: dict[str, Any]
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Itera sobre as linhas de cada página enquanto a seguinte já está sendo buscada."""
+        position = 0
+        page: dict[str, Any] | None = first_page
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+        upcoming: Future | None = None
+        try:
+            while page is not None:
+                if page.get("next"):
+                    upcoming = executor.submit(
+                        copy_context().run,
+                        self.resilience.call,
+                        "playlists/tracks",
+                        spotify_client.next,
+                        page,
+                        idempotent=True,
+                    )
+                rows = []
+                for item in page.get("items") or []:
+                    row = export_row(position, item)
+                    position += 1
+                    if row is not None:
+                        rows.append(row)
+                yield rows
+                page, upcoming = (upcoming.result() if upcoming else None), None
+        finally:
+            # O cliente pode desconectar no meio do download; a busca pendente é descartada.
+            if upcoming is not None:
+                upcoming.cancel()
+            executor.shutdown(wait=False)
+            self.logger.info(f"Exportação encerrada após {position} itens.")
+
+    @staticmethod
+    def _csv_chunks(pages: Iterator[list[dict[str, Any]]]) -> Iterator[str]:
+        """Serializa as páginas como CSV, com o cabeçalho no primeiro bloco."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        for rows in pages:
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    @staticmethod
+    def _jsonl_chunks(pages: Iterator[list[dict[str, Any]]]) -> Iterator[str]:
+        """Serializa as páginas como JSON Lines, um objeto por faixa."""
+        for rows in pages:
+            yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
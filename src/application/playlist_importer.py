@@ -0,0 +1,270 @@
+"""Importação de playlists a partir de arquivos CSV ou M3U com resolução paralela de buscas."""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+import csv
+from dataclasses import dataclass
+import io
+from pathlib import Path
+import re
+import threading
+import time
+from typing import IO, TYPE_CHECKING
+import unicodedata
+
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+from spotipy.exceptions import SpotifyException
+
+from src.common.base.base_class import BaseClass
+from src.common.errors.errors import CircuitOpenError, DeadlineExceededError
+from src.config.constants import (
+    IMPORT_CACHE_SIZE,
+    IMPORT_CONCURRENCY,
+    IMPORT_NEGATIVE_CACHE_TTL,
+    IMPORT_SUFFIXES,
+)
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    import spotipy
+
+    from src.infrastructure.resilience import ResilientCaller
+
+_SEPARATOR = re.compile(r"\s+[-–—]\s+")
+"""Separador (hífen, meia-risca ou travessão) entre artista e título em uma linha."""
+
+_NOISE = re.compile(
+    r"\((?:feat|ft|with|remaster|live|radio edit)[^)]*\)|\[[^]]*\]"
+    r"|\s-\s(?:\d{4}\s)?remaster(?:ed)?(?:\s\d{4})?.*$|\b(?:feat|ft)\.?\s.*$",
+    re.IGNORECASE,
+)
+"""Trechos que variam entre fontes (participações, remasterizações) e atrapalham a busca."""
+
+_HEADER_ARTIST = {"artist", "artista", "artist name", "artist name(s)", "artists"}
+"""Nomes aceitos para a coluna de artista em CSVs com cabeçalho."""
+
+_HEADER_TITLE = {"title", "titulo", "título", "track", "track name", "name", "song", "musica"}
+"""Nomes aceitos para a coluna de título em CSVs com cabeçalho."""
+
+
+@dataclass(slots=True, frozen=True)
+class ImportLine:
+    """Linha de importação com artista e título já separados."""
+
+    artist: str
+    """Nome do artista informado no arquivo."""
+
+    title: str
+    """Título da faixa informado no arquivo."""
+
+    @property
+    def key(self) -> str:
+        """Retorna a consulta normalizada usada como chave de memoização."""
+        return normalize_query(self.artist, self.title)
+
+
+def normalize_query(artist: str, title: str) -> str:
+    """Normaliza artista e título removendo acentos, caixa, ruídos e espaços repetidos."""
+    text = f"{_NOISE.sub('', artist)} {_NOISE.sub('', title)}"
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[^\w\s]", " ", text.casefold())
+    return " ".join(text.split())
+
+
+def split_line(text: str) -> ImportLine | None:
+    """Separa uma linha `artista - título`, retornando None se não houver separador."""
+    parts = _SEPARATOR.split(text.strip(), maxsplit=1)
+    if len(parts) != 2 or not all(part.strip() for part in parts):  # noqa: PLR2004
+        return None
+    return ImportLine(parts[0].strip(), parts[1].strip())
+
+
+def _parse_csv(lines: Iterable[str]) -> Iterator[ImportLine | None]:
+    """Lê um CSV com colunas de artista e título (com ou sem cabeçalho) ou linhas únicas."""
+    reader = csv.reader(lines)
+    artist_column, title_column = 0, 1
+    for index, row in enumerate(reader):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        lowered = [cell.casefold() for cell in cells]
+        if index == 0 and _HEADER_ARTIST & set(lowered) and _HEADER_TITLE & set(lowered):
+            artist_column = next(i for i, cell in enumerate(lowered) if cell in _HEADER_ARTIST)
+            title_column = next(i for i, cell in enumerate(lowered) if cell in _HEADER_TITLE)
+            continue
+        if len(cells) > max(artist_column, title_column):
+            yield ImportLine(cells[artist_column], cells[title_column])
+        else:
+            yield split_line(",".join(cells))
+
+
+def _parse_m3u(lines: Iterable[str]) -> Iterator[ImportLine | None]:
+    """Lê um M3U usando o título do `#EXTINF` ou, na falta dele, o nome do arquivo."""
+    pending_title: str | None = None
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.upper().startswith("#EXTINF"):
+            _, _, pending_title = line.partition(",")
+            continue
+        if line.startswith("#"):
+            continue
+        yield split_line(pending_title or Path(line.replace("\\", "/")).stem)
+        pending_title = None
+
+
+def parse_import_file(stream: IO[bytes], filename: str) -> Iterator[ImportLine | None]:
+    """Lê o arquivo em fluxo, linha a linha, produzindo None para linhas não reconhecidas."""
+    suffix = Path(filename).suffix.lower()
+    if suffix not in IMPORT_SUFFIXES:
+        msg = f"Formato de importação não suportado: '{suffix}'."
+        raise ValueError(msg)
+    # `utf-8-sig` descarta o BOM gravado por planilhas; bytes inválidos não interrompem a leitura.
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        if suffix == ".csv":
+            yield from _parse_csv(text)
+        else:
+            yield from _parse_m3u(text)
+    finally:
+        text.detach()
+
+
+class PlaylistImporter(BaseClass):
+    """Resolve linhas de importação em URIs do Spotify com memoização e cache negativo."""
+
+    def __init__(
+        self,
+        resilience: "ResilientCaller",
+        concurrency: int = IMPORT_CONCURRENCY,
+        negative_ttl: float = IMPORT_NEGATIVE_CACHE_TTL,
+        cache_size: int = IMPORT_CACHE_SIZE,
+    ) -> None:
+        """Inicializa o importador com o limite de buscas simultâneas e o TTL do cache negativo."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.resilience = resilience
+        self.concurrency = concurrency
+        self.negative_ttl = negative_ttl
+        self.cache_size = cache_size
+        # Os caches vivem tanto quanto o app: ambos são limitados e descartam os mais antigos.
+        self._found: OrderedDict[str, str] = OrderedDict()
+        self._missing: OrderedDict[str, float] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.logger.info(
+            f"PlaylistImporter inicializado: concurrency={concurrency}, "
+            f"negative_ttl={negative_ttl}s, cache_size={cache_size}"
+        )
+
+    def resolve(
+        self, spotify_client: "spotipy.Spotify", lines: Iterable[ImportLine | None]
+    ) -> list[str]:
+        """Resolve as linhas em URIs na ordem do arquivo, descartando as não encontradas."""
+        started = time.perf_counter()
+        futures: list[Future] = []
+        unparsed = 0
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="import"
+        ) as executor:
+            # As buscas começam enquanto o arquivo ainda está sendo lido.
+            for line in lines:
+                if line is None:
+                    unparsed += 1
+                    continue
+                futures.append(self._lookup(executor, spotify_client, line))
+            uris = [future.result() for future in futures]
+        matched = [uri for uri in uris if uri]
+        self.logger.info(
+            f"Importação resolvida em {time.perf_counter() - started:.2f}s: "
+            f"{len(matched)}/{len(futures)} faixas encontradas, {unparsed} linhas ignoradas."
+        )
+        return matched
+
+    def _lookup(
+        self,
+        executor: ThreadPoolExecutor,
+        spotify_client: "spotipy.Spotify",
+        line: ImportLine,
+    ) -> Future:
+        """Retorna o `Future` da busca, reaproveitando memo, cache negativo e buscas em curso."""
+        key = line.key
+        with self._lock:
+            future = self._cached(key)
+            if future is not None:
+                return future
+            future = executor.submit(copy_context().run, self._search, spotify_client, line, key)
+            self._in_flight[key] = future
+        return future
+
+    def _cached(self, key: str) -> Future | None:
+        """Retorna um `Future` já resolvido a partir dos caches (com o lock adquirido)."""
+        if key in self._in_flight:
+            return self._in_flight[key]
+        result: str | None
+        if key in self._found:
+            self._found.move_to_end(key)
+            result = self._found[key]
+        elif key in self._missing and self._missing[key] > time.monotonic():
+            result = None
+        else:
+            self._missing.pop(key, None)
+            return None
+        future: Future = Future()
+        future.set_result(result)
+        return future
+
+    def _search(self, spotify_client: "spotipy.Spotify", line: ImportLine, key: str) -> str | None:
+        """Busca a faixa no Spotify e registra o resultado nos caches."""
+        title = _NOISE.sub("", line.title).strip() or line.title
+        artist = _NOISE.sub("", line.artist).strip() or line.artist
+        query = f'track:"{title}" artist:"{artist}"'
+        try:
+            response = self.resilience.call(
+                "search", spotify_client.search, q=query, type="track", limit=1, idempotent=True
+            )
+        except (
+            SpotifyException,
+            CircuitOpenError,
+            DeadlineExceededError,
+            RequestsConnectionError,
+            Timeout,
+        ):
+            # Erros de uma consulta isolada não derrubam a importação nem entram no cache negativo;
+            # com o Spotify indisponível, as linhas restantes ficam sem faixa.
+            self.logger.exception(f"Erro ao buscar faixa: {line.artist} – {line.title}")
+            with self._lock:
+                self._in_flight.pop(key, None)
+            return None
+        except Exception:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            raise
+        items = response["tracks"]["items"]
+        uri: str | None = items[0]["uri"] if items else None
+        with self._lock:
+            if uri is None:
+                self.logger.debug(f"Faixa não encontrada: {line.artist} – {line.title}")
+                self._remember_missing(key)
+            else:
+                self._found[key] = uri
+                if len(self._found) > self.cache_size:
+                    self._found.popitem(last=False)
+            self._in_flight.pop(key, None)
+        return uri
+
+    def _remember_missing(self, key: str) -> None:
+        """Registra a busca sem resultado e descarta as expiradas (com o lock adquirido)."""
+        now = time.monotonic()
+        self._missing[key] = now + self.negative_ttl
+        self._missing.move_to_end(key)
+        # Com TTL fixo, a ordem de inserção é a de expiração: basta olhar o início do cache.
+        while self._missing and (
+            len(self._missing) > self.cache_size or next(iter(self._missing.values())) <= now
+        ):
+            self._missing.popitem(last=False)
@@ -0,0 +1,131 @@
+"""Especificações das playlists criadas a cada autorização, do settings.yaml ou do login."""
+
+import base64
+from dataclasses import dataclass
+import json
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from src.application.playlist_importer import ImportLine, split_line
+from src.config.constants import (
+    DEFAULT_PLAYLIST_NAME,
+    PLAYLIST_NAME_MAX_LENGTH,
+    PLAYLIST_SPECS_MAX,
+    PLAYLISTS_STATE_PREFIX,
+    SETTINGS_FILE,
+    SPOTIFY_ID_LENGTH,
+)
+
+_TRACK_URI_PREFIX = "spotify:track:"
+"""Prefixo das URIs de faixa do Spotify."""
+
+_TRACK_URL_PREFIX = "https://open.spotify.com/track/"
+"""Prefixo dos links públicos de faixa do Spotify."""
+
+
+@dataclass(slots=True, frozen=True)
+class PlaylistSpec:
+    """Playlist a ser criada: nome, visibilidade e faixas iniciais."""
+
+    name: str
+    """Nome da playlist."""
+
+    public: bool = True
+    """Indica se a playlist é pública; privadas exigem o escopo `playlist-modify-private`."""
+
+    tracks: tuple[str, ...] = ()
+    """URIs das faixas adicionadas, na ordem informada."""
+
+    queries: tuple[ImportLine, ...] = ()
+    """Faixas no formato `artista – título`, buscadas no Spotify e adicionadas após `tracks`."""
+
+    smooth_order: bool = False
+    """Indica se as faixas são reordenadas para suavizar as transições."""
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PlaylistSpec":
+        """Cria a especificação a partir de um item da seção `playlists` do settings.yaml."""
+        name = str(data.get("name") or "").strip()
+        if not name:
+            msg = f"Playlist sem nome nas configurações: {data}."
+            raise ValueError(msg)
+        queries = []
+        for line in data.get("queries") or []:
+            query = split_line(str(line))
+            if query is None:
+                msg = f"Consulta inválida na playlist '{name}': '{line}'. Use 'artista – título'."
+                raise ValueError(msg)
+            queries.append(query)
+        return cls(
+            name=name[:PLAYLIST_NAME_MAX_LENGTH],
+            public=bool(data.get("public", True)),
+            tracks=tuple(track_uri(str(track)) for track in data.get("tracks") or []),
+            queries=tuple(queries),
+            smooth_order=bool(data.get("smooth_order", False)),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class PlaylistResult:
+    """Resultado da criação de uma playlist."""
+
+    name: str
+    """Nome da playlist."""
+
+    url: str | None = None
+    """Link da playlist no Spotify, quando criada."""
+
+    error: str | None = None
+    """Mensagem de erro, quando a criação falhou."""
+
+
+def track_uri(value: str) -> str:
+    """Converte um ID, URI ou link de faixa do Spotify em URI."""
+    track_id = value.strip().removeprefix(_TRACK_URI_PREFIX).removeprefix(_TRACK_URL_PREFIX)
+    track_id = track_id.split("?", 1)[0]
+    if len(track_id) != SPOTIFY_ID_LENGTH or not track_id.isalnum():
+        msg = f"Faixa inválida: '{value}'. Use um ID, URI ou link de faixa do Spotify."
+        raise ValueError(msg)
+    return f"{_TRACK_URI_PREFIX}{track_id}"
+
+
+def load_playlist_specs(settings_file: str | Path = SETTINGS_FILE) -> list[PlaylistSpec]:
+    """Carrega a seção `playlists` do settings.yaml; sem ela, apenas a playlist padrão."""
+    path = Path(settings_file)
+    items: list[dict[str, Any]] = []
+    if path.is_file():
+        with path.open("r", encoding="utf-8") as file:
+            items = (yaml.safe_load(file) or {}).get("playlists") or []
+    specs = [PlaylistSpec.from_dict(item) for item in items[:PLAYLIST_SPECS_MAX]]
+    return specs or [PlaylistSpec(DEFAULT_PLAYLIST_NAME)]
+
+
+def encode_playlists_state(names: list[str]) -> str | None:
+    """Codifica no `state` do OAuth os nomes das playlists pedidas no login."""
+    names = [name.strip()[:PLAYLIST_NAME_MAX_LENGTH] for name in names if name.strip()]
+    if not names:
+        return None
+    payload = json.dumps(names[:PLAYLIST_SPECS_MAX], ensure_ascii=False).encode("utf-8")
+    return PLAYLISTS_STATE_PREFIX + base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_playlists_state(state: str) -> list[PlaylistSpec] | None:
+    """Recupera as playlists pedidas no login, ou None se o `state` não as contiver."""
+    if not state.startswith(PLAYLISTS_STATE_PREFIX):
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(state.removeprefix(PLAYLISTS_STATE_PREFIX))
+        names = json.loads(payload)
+    except ValueError:
+        # Cobre `binascii.Error`, `UnicodeDecodeError`, `JSONDecodeError` e texto não ASCII.
+        return None
+    if not isinstance(names, list):
+        return None
+    specs = [
+        PlaylistSpec(name.strip()[:PLAYLIST_NAME_MAX_LENGTH])
+        for name in names[:PLAYLIST_SPECS_MAX]
+        if isinstance(name, str) and name.strip()
+    ]
+    return specs or None
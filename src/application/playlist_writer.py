@@ -0,0 +1,81 @@
+"""Inserção de faixas em playlists com checkpoint por lote e retomada sem duplicatas."""
+
+from typing import TYPE_CHECKING
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import SPOTIFY_ADD_ITEMS_LIMIT
+from src.infrastructure.checkpoint_store import CheckpointStore, PlaylistJob
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    import spotipy
+
+    from src.infrastructure.resilience import ResilientCaller
+
+
+class PlaylistWriter(BaseClass):
+    """Adiciona as faixas de um job em lotes, confirmando cada lote no `CheckpointStore`."""
+
+    def __init__(self, resilience: "ResilientCaller", checkpoints: CheckpointStore) -> None:
+        """Inicializa o escritor com o caller resiliente e o armazenamento de checkpoints."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.resilience = resilience
+        self.checkpoints = checkpoints
+
+    def write(self, spotify_client: "spotipy.Spotify", job: PlaylistJob) -> PlaylistJob:
+        """Insere as faixas ainda não confirmadas do job e retorna o estado final."""
+        job = self._reconcile(spotify_client, job)
+        if job.committed:
+            self.logger.info(
+                f"Retomando job {job.job_id} a partir de {job.committed}/{job.total} faixas."
+            )
+        for start in range(job.committed, job.total, SPOTIFY_ADD_ITEMS_LIMIT):
+            stop = min(start + SPOTIFY_ADD_ITEMS_LIMIT, job.total)
+            response = self.resilience.call(
+                "playlists/tracks",
+                spotify_client.playlist_add_items,
+                job.playlist_id,
+                job.track_uris[start:stop],
+            )
+            job = self.checkpoints.commit_batch(job, stop, (response or {}).get("snapshot_id"))
+        self.logger.info(f"Job {job.job_id} concluído: {job.total} faixas na playlist.")
+        # Um job concluído não será retomado; mantê-lo só faria o banco crescer sem limite.
+        self.checkpoints.delete(job.job_id)
+        return job
+
+    def resume_pending(self, spotify_client: "spotipy.Spotify", user_id: str) -> int:
+        """Retoma todos os jobs pendentes do usuário e retorna quantos foram concluídos."""
+        finished = 0
+        for job in self.checkpoints.iter_pending(user_id):
+            finished += self.write(spotify_client, job).done
+        return finished
+
+    def _reconcile(self, spotify_client: "spotipy.Spotify", job: PlaylistJob) -> PlaylistJob:
+        """Confirma um lote aplicado pelo Spotify mas não registrado antes de uma interrupção."""
+        playlist = self.resilience.call(
+            "playlists",
+            spotify_client.playlist,
+            job.playlist_id,
+            fields="snapshot_id,tracks.total",
+            idempotent=True,
+        )
+        if playlist["snapshot_id"] == job.snapshot_id:
+            return job
+        # A playlist só recebe faixas deste job, em ordem; se ela tem mais faixas do que o
+        # checkpoint, o último lote enviado foi aplicado e não deve ser reenviado.
+        applied = min(playlist["tracks"]["total"], job.total)
+        if applied <= job.committed:
+            return job
+        self.logger.warning(
+            f"Job {job.job_id}: {applied - job.committed} faixas já aplicadas sem checkpoint."
+        )
+        return self.checkpoints.commit_batch(job, applied, playlist["snapshot_id"])
+
+
+def resume_pending_jobs(
+    spotify_client: "spotipy.Spotify", user_id: str, resilience: "ResilientCaller"
+) -> None:
+    """Job do `batch_job_runner` que retoma os jobs de playlist interrompidos do usuário."""
+    PlaylistWriter(resilience, CheckpointStore()).resume_pending(spotify_client, user_id)
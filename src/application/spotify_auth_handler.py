@@ -1,23 +1,64 @@
 """Classe utilitária para autenticação e integração com o Spotify."""
 
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 import os
+from pathlib import Path
+import time
 from typing import TYPE_CHECKING
+import uuid
 
-from flask import redirect, render_template, request
+from flask import Response, redirect, request, stream_with_context
 from jinja2.exceptions import TemplateError
 from requests.exceptions import HTTPError
 import spotipy
 from spotipy.exceptions import SpotifyException
-from spotipy.oauth2 import SpotifyOAuth
+from werkzeug.utils import secure_filename
 
+from src.application.batch_loader import BatchLoader, SpotifyCatalogLoader
+from src.application.playlist_cover import PlaylistCoverGenerator
+from src.application.playlist_exporter import PlaylistExporter
+from src.application.playlist_importer import PlaylistImporter, parse_import_file
+from src.application.playlist_specs import (
+    PlaylistResult,
+    PlaylistSpec,
+    decode_playlists_state,
+    load_playlist_specs,
+)
+from src.application.playlist_writer import PlaylistWriter
+from src.application.track_ordering import TrackOrderingOptimizer
 from src.common.base.base_class import BaseClass
-from src.config.constants import APP_TEMPLATE
+from src.common.errors.errors import CircuitOpenError, DeadlineExceededError
+from src.config.constants import (
+    APP_TEMPLATE,
+    CREDENTIAL_POOL_ENV,
+    DEFAULT_PLAYLIST_NAME,
+    EXPORT_FORMATS,
+    IMPORT_DIR,
+    IMPORT_REQUEST_DEADLINE,
+    IMPORT_STATE_PREFIX,
+    IMPORT_SUFFIXES,
+    PLAYLIST_CONCURRENCY,
+    REQUEST_DEADLINE_DEFAULT,
+    REQUEST_DEADLINE_HEADER,
+    SPOTIFY_AUDIO_FEATURES_LIMIT,
+    SPOTIFY_ID_LENGTH,
+    SPOTIFY_SCOPE,
+)
+from src.infrastructure.checkpoint_store import CheckpointStore, PlaylistJob
+from src.infrastructure.credential_pool import Credential, CredentialPool, credential_scope
 from src.infrastructure.logger import LoggerSingleton
+from src.infrastructure.resilience import ResilientCaller, deadline_scope
 from src.infrastructure.return_handler import ERROR, INFO, WARNING, ReturnHandler
+from src.infrastructure.template_renderer import TemplateRenderer
+from src.infrastructure.token_store import TokenStore
+from src.infrastructure.tracing import traced
 
 if TYPE_CHECKING:
     from logging import Logger
 
+    from werkzeug.datastructures import FileStorage
+
 
 class SpotifyAuthHandler(BaseClass):
     """Gerencia o fluxo de autenticação e criação de playlists no Spotify."""
@@ -27,21 +68,133 @@ class SpotifyAuthHandler(BaseClass):
         self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
         self.logger.info("Inicializando handler com ReturnHandler.")
         self.handler = return_handler
-        self.scope = "playlist-modify-public"
+        self.scope = SPOTIFY_SCOPE
         self.logger.info(f"Escopo definido: {self.scope}")
-        self.spotify_oauth = self._load_spotify_oauth()
+        self.credentials = CredentialPool(self._load_oauth_configs())
+        self.track_optimizer = TrackOrderingOptimizer()
+        self.resilience = ResilientCaller()
+        self.importer = PlaylistImporter(self.resilience)
+        self.token_store = TokenStore()
+        self.checkpoints = CheckpointStore()
+        self.playlist_writer = PlaylistWriter(self.resilience, self.checkpoints)
+        self.exporter = PlaylistExporter(self.resilience)
+        # Cliente de aplicação (client credentials) para leituras que dispensam o usuário.
+        self.app_client = self.credentials.app_client()
+        # Sem memoização: o carregador vive tanto quanto o app e só agrupa consultas simultâneas.
+        self.catalog = SpotifyCatalogLoader(self.app_client, self.resilience, cache=False)
+        self.covers = PlaylistCoverGenerator(self.resilience, self.catalog)
+        self.templates = TemplateRenderer()
+        self.playlist_specs = load_playlist_specs()
+        self._playlist_executor = ThreadPoolExecutor(
+            max_workers=PLAYLIST_CONCURRENCY, thread_name_prefix="playlists"
+        )
         self.logger.info("SpotifyAuthHandler inicializado com sucesso.")
 
-    def login(self) -> str:
+    def oauth_configs(self) -> list[dict[str, str]]:
+        """Retorna as configurações OAuth validadas, para uso fora do contexto de requisição."""
+        return self.credentials.oauth_configs()
+
+    @traced("auth.login")
+    def login(self, state: str | None = None) -> str:
         """Inicia o fluxo de autenticação do usuário com o Spotify."""
         self.logger.info("Iniciando fluxo de login do usuário.")
-        auth_url = self.spotify_oauth.get_authorize_url()
+        auth_url = self.credentials.login_url(state)
         self.logger.info(f"URL de autenticação gerada: {auth_url}")
         return redirect(auth_url)
 
+    @traced("auth.start_import")
+    def start_import(self, upload: "FileStorage | None") -> str:
+        """Armazena o arquivo CSV/M3U enviado e inicia o login para criar a playlist importada."""
+        if upload is None or not upload.filename:
+            return self._handle_error(
+                "Nenhum arquivo de importação enviado.",
+                "Nenhum arquivo de importação enviado.",
+                warning=True,
+            )
+        filename = secure_filename(upload.filename)
+        suffix = Path(filename).suffix.lower()
+        if suffix not in IMPORT_SUFFIXES:
+            return self._handle_error(
+                f"Formato de importação não suportado: {suffix}",
+                "Envie um arquivo .csv ou .m3u.",
+                warning=True,
+            )
+        import_id = uuid.uuid4().hex
+        path = self._ensure_path(IMPORT_DIR / f"{import_id}_{filename}")
+        # `save` copia o upload em blocos, sem carregar o arquivo inteiro em memória.
+        upload.save(path)
+        self.logger.info(f"Arquivo de importação armazenado: {path}")
+        return self.login(state=f"{IMPORT_STATE_PREFIX}{import_id}")
+
+    @traced("auth.export_playlist")
+    def export_playlist(self, playlist_id: str) -> Response | str:
+        """Transmite as faixas de uma playlist em CSV ou JSON Lines, página a página."""
+        export_format = (request.args.get("format") or "csv").lower()
+        self.logger.info(f"Exportando playlist {playlist_id} em {export_format}.")
+        if export_format not in EXPORT_FORMATS:
+            return self._handle_error(
+                f"Formato de exportação inválido: {export_format}",
+                f"Formato inválido. Use um destes: {', '.join(EXPORT_FORMATS)}.",
+                warning=True,
+            )
+        if len(playlist_id) != SPOTIFY_ID_LENGTH or not playlist_id.isalnum():
+            return self._handle_error(
+                f"ID de playlist inválido: {playlist_id}",
+                "ID de playlist inválido.",
+                warning=True,
+            )
+        try:
+            first_page = self.exporter.first_page(self.app_client, playlist_id)
+        except SpotifyException as error:
+            self.logger.exception(f"Erro ao obter a playlist {playlist_id}.")
+            return self._handle_error(
+                f"Erro {error.http_status} ao obter a playlist {playlist_id}.",
+                "Playlist não encontrada ou indisponível para exportação.",
+            )
+        except (CircuitOpenError, DeadlineExceededError):
+            self.logger.exception("Spotify indisponível ao exportar playlist.")
+            return self._handle_error(
+                "Spotify indisponível ao exportar playlist.",
+                "Spotify indisponível no momento. Tente novamente.",
+            )
+        chunks = self.exporter.export(self.app_client, first_page, export_format)
+        return Response(
+            stream_with_context(chunks),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{playlist_id}.{export_format}"'
+            },
+        )
+
+    @traced("auth.callback")
     def callback(self) -> str:
         """Recebe o callback do Spotify após autenticação e cria uma playlist."""
         self.logger.info("Recebida requisição de callback do Spotify.")
+        # O `state` identifica a credencial que autorizou o usuário e, após ela, a importação.
+        credential, state = self.credentials.decode_state(request.args.get("state") or "")
+        deadline = (
+            IMPORT_REQUEST_DEADLINE
+            if state.startswith(IMPORT_STATE_PREFIX)
+            else self._request_deadline()
+        )
+        with deadline_scope(deadline), credential_scope(credential):
+            return self._process_callback(credential, state)
+
+    def _request_deadline(self) -> float:
+        """Retorna o prazo da requisição de entrada, informado pelo cabeçalho ou o padrão."""
+        raw_deadline = request.headers.get(REQUEST_DEADLINE_HEADER)
+        try:
+            deadline = float(raw_deadline) if raw_deadline else REQUEST_DEADLINE_DEFAULT
+        except ValueError:
+            self.logger.warning(f"Cabeçalho {REQUEST_DEADLINE_HEADER} inválido: {raw_deadline}")
+            deadline = REQUEST_DEADLINE_DEFAULT
+        if deadline <= 0:
+            deadline = REQUEST_DEADLINE_DEFAULT
+        self.logger.info(f"Prazo da requisição: {deadline}s")
+        return deadline
+
+    def _process_callback(self, credential: Credential, state: str) -> str:
+        """Valida os parâmetros do callback, obtém o token e cria a playlist."""
         code = request.args.get("code")
         error = request.args.get("error")
         self.logger.info(f"Parâmetros recebidos: code={code}, error={error}")
@@ -57,7 +210,7 @@ class SpotifyAuthHandler(BaseClass):
                 warning=True,
             )
 
-        token_info = self._get_token_info(code)
+        token_info = self._get_token_info(code, credential)
         self.logger.info(f"Token info obtido: {token_info}")
         if not token_info or token_info.get("access_token") is None:
             self.logger.error("Token de acesso não foi obtido.")
@@ -65,24 +218,164 @@ class SpotifyAuthHandler(BaseClass):
                 message="Token de acesso não foi obtido.",
                 level=ERROR,
             )
-            return redirect(self.spotify_oauth.get_authorize_url())
+            return self.login(state or None)
+
+        user_id = self._register_user(token_info, credential)
+        access_token = token_info["access_token"]
+        if not state.startswith(IMPORT_STATE_PREFIX):
+            # Playlists pedidas no login têm prioridade sobre as do settings.yaml.
+            specs = decode_playlists_state(state) or self.playlist_specs
+            return self._render_playlist_template(
+                self._create_playlists(access_token, specs, user_id)
+            )
 
-        playlist_url, error_msg = self._create_playlist(token_info["access_token"])
+        return self._process_import(access_token, state.removeprefix(IMPORT_STATE_PREFIX), user_id)
+
+    def _process_import(self, access_token: str, import_id: str, user_id: str | None) -> str:
+        """Cria a playlist do arquivo importado, ou retoma a importação já iniciada."""
+        # O checkpoint só pode ser retomado pelo seu dono: o ID do usuário vem antes de tudo.
+        user_id = user_id or self._current_user_id(access_token)
+        if user_id is None:
+            return self._handle_error(
+                f"Usuário não identificado na importação {import_id}.",
+                "Usuário não identificado.",
+            )
+        job = self.checkpoints.get(import_id)
+        if job is not None:
+            # Uma importação já iniciada é retomada pelo checkpoint, sem reprocessar o arquivo.
+            return self._resume_import(access_token, job, user_id)
+        track_uris, name = self._import_tracks(access_token, import_id)
+        if not track_uris:
+            return self._handle_error(
+                f"Nenhuma faixa encontrada na importação {import_id}.",
+                "Nenhuma faixa do arquivo foi encontrada no Spotify.",
+                warning=True,
+            )
+        playlist_url, error_msg = self._create_playlist(
+            access_token, track_uris, name=name, user_id=user_id, job_id=import_id
+        )
         self.logger.info(f"Playlist URL: {playlist_url}, error_msg: {error_msg}")
-        return self._render_playlist_template(playlist_url, error_msg)
+        return self._render_playlist_template([PlaylistResult(name, playlist_url, error_msg)])
+
+    @traced("auth.create_playlists")
+    def _create_playlists(
+        self, access_token: str, specs: list[PlaylistSpec], user_id: str | None
+    ) -> list[PlaylistResult]:
+        """Cria as playlists em paralelo, com o ID do usuário obtido uma única vez."""
+        # Se o registro do usuário falhou (ex.: erro transitório), tenta obter o ID mais uma vez.
+        user_id = user_id or self._current_user_id(access_token)
+        if user_id is None:
+            return [PlaylistResult(spec.name, error="Usuário não identificado.") for spec in specs]
+        started = time.perf_counter()
+        if len(specs) == 1:
+            results = [self._create_from_spec(access_token, specs[0], user_id)]
+        else:
+            # Cada tarefa recebe uma cópia do contexto: prazo, credencial e span da requisição.
+            futures = [
+                self._playlist_executor.submit(
+                    copy_context().run, self._create_from_spec, access_token, spec, user_id
+                )
+                for spec in specs
+            ]
+            results = [future.result() for future in futures]
+        created = sum(result.url is not None for result in results)
+        self.logger.info(
+            f"{created}/{len(results)} playlists criadas em {time.perf_counter() - started:.2f}s."
+        )
+        return results
+
+    def _current_user_id(self, access_token: str) -> str | None:
+        """Obtém o ID do usuário autenticado, ou None se o Spotify não o retornar."""
+        spotify_client = self.credentials.user_client(access_token)
+        try:
+            user = self.resilience.call("me", spotify_client.current_user, idempotent=True)
+        except (SpotifyException, CircuitOpenError, DeadlineExceededError):
+            self.logger.exception("Erro ao obter o usuário autenticado.")
+            return None
+        return user.get("id") if user else None
+
+    def _create_from_spec(
+        self, access_token: str, spec: PlaylistSpec, user_id: str
+    ) -> PlaylistResult:
+        """Resolve as faixas da especificação e cria a playlist, isolando falhas das demais."""
+        try:
+            track_uris = list(spec.tracks)
+            if spec.queries:
+                spotify_client = self.credentials.user_client(access_token)
+                track_uris.extend(self.importer.resolve(spotify_client, spec.queries))
+            playlist_url, error_msg = self._create_playlist(
+                access_token,
+                track_uris or None,
+                name=spec.name,
+                public=spec.public,
+                smooth_order=spec.smooth_order,
+                user_id=user_id,
+            )
+        except Exception:
+            # Uma playlist com erro não interrompe as demais da mesma autorização.
+            self.logger.exception(f"Erro ao criar a playlist '{spec.name}'.")
+            return PlaylistResult(spec.name, error="Erro ao criar a playlist no Spotify.")
+        if playlist_url is None:
+            return PlaylistResult(spec.name, error=error_msg or "Erro ao criar a playlist.")
+        return PlaylistResult(spec.name, playlist_url)
+
+    @traced("auth.register_user")
+    def _register_user(self, token_info: dict, credential: Credential) -> str | None:
+        """Obtém o ID do usuário autenticado e armazena seu token para execuções offline."""
+        spotify_client = self.credentials.user_client(token_info["access_token"], credential)
+        try:
+            user = self.resilience.call("me", spotify_client.current_user, idempotent=True)
+        except (SpotifyException, CircuitOpenError, DeadlineExceededError):
+            self.logger.exception("Erro ao obter o usuário autenticado.")
+            return None
+        if "id" not in user:
+            self.logger.error("Resposta do Spotify não contém o ID do usuário.")
+            return None
+        if token_info.get("refresh_token"):
+            self.token_store.save(user["id"], token_info, credential.client_id)
+        return user["id"]
+
+    @traced("auth.import_tracks")
+    def _import_tracks(self, access_token: str, import_id: str) -> tuple[list[str], str]:
+        """Resolve as faixas do arquivo de importação e retorna as URIs e o nome da playlist."""
+        self.logger.info(f"Processando importação {import_id}.")
+        if not import_id.isalnum():
+            self.logger.warning(f"Identificador de importação inválido: {import_id}")
+            return [], DEFAULT_PLAYLIST_NAME
+        path: Path | None = next(IMPORT_DIR.glob(f"{import_id}_*"), None)
+        if path is None:
+            self.logger.warning(f"Arquivo da importação {import_id} não encontrado.")
+            return [], DEFAULT_PLAYLIST_NAME
+        name = path.stem.removeprefix(f"{import_id}_")
+        spotify_client = self.credentials.user_client(access_token)
+        with path.open("rb") as stream:
+            track_uris = self.importer.resolve(spotify_client, parse_import_file(stream, path.name))
+        if not track_uris:
+            self._discard_import(import_id)
+        return track_uris, name
+
+    def _discard_import(self, import_id: str) -> None:
+        """Remove o arquivo de importação, dispensável depois que o checkpoint foi gravado."""
+        for path in IMPORT_DIR.glob(f"{import_id}_*"):
+            path.unlink(missing_ok=True)
+            self.logger.info(f"Arquivo de importação removido: {path}")
 
     def _handle_error(self, log_message: str, error_msg: str, *, warning: bool = False) -> str:
         """Registra e retorna erro renderizando o template apropriado."""
         level = WARNING if warning else ERROR
         self.logger.log(level, f"{log_message}")
         self.handler.message(message=log_message, level=level)
-        return render_template("error.html", error=error_msg)
+        return self.templates.render_cached("error.html", error=error_msg)
 
-    def _get_token_info(self, code: str) -> dict | None:
+    @traced("auth.get_token_info")
+    def _get_token_info(self, code: str, credential: Credential) -> dict | None:
         """Obtém o token de acesso do Spotify."""
         self.logger.info(f"Obtendo token para code: {code}")
         try:
-            token = self.spotify_oauth.get_access_token(code)
+            # Sem consultar o cache: cada callback pertence a um usuário diferente.
+            token = self.resilience.call(
+                "oauth/token", credential.oauth.get_access_token, code, check_cache=False
+            )
             self.logger.info(f"Token recebido: {token}")
         except HTTPError:
             self.logger.exception("Erro ao obter token de acesso")
@@ -90,26 +383,51 @@ class SpotifyAuthHandler(BaseClass):
                 message="Erro ao obter token de acesso do Spotify.",
                 exception=HTTPError,
             )
+        except (CircuitOpenError, DeadlineExceededError) as error:
+            self.logger.exception("Spotify indisponível ao obter token de acesso.")
+            self.handler.exception(
+                message="Spotify indisponível ao obter token de acesso.",
+                exception=type(error),
+            )
         else:
             return token
 
-    def _create_playlist(self, access_token: str) -> tuple[str | None, str | None]:
+    @traced("auth.create_playlist")
+    def _create_playlist(  # noqa: PLR0913
+        self,
+        access_token: str,
+        track_uris: list[str] | None = None,
+        *,
+        name: str = DEFAULT_PLAYLIST_NAME,
+        public: bool = True,
+        smooth_order: bool = False,
+        user_id: str | None = None,
+        job_id: str | None = None,
+    ) -> tuple[str | None, str | None]:
         """Cria uma playlist para o usuário autenticado e retorna a URL ou mensagem de erro."""
         self.logger.info(f"Criando playlist com access_token: {access_token[:8]}... (ocultado)")
         try:
-            spotify_client = spotipy.Spotify(auth=access_token)
-            user = spotify_client.current_user()
-            self.logger.info(f"Usuário retornado: {user}")
-            if "id" not in user:
-                self.logger.error("Resposta do Spotify não contém o ID do usuário.")
-                return None, self.handler.message(
-                    message="Resposta do Spotify não contém o ID do usuário.",
-                    level=ERROR,
-                )
-            user_id = user["id"]
+            spotify_client = self.credentials.user_client(access_token)
+            if user_id is None:
+                user = self.resilience.call("me", spotify_client.current_user, idempotent=True)
+                self.logger.info(f"Usuário retornado: {user}")
+                if "id" not in user:
+                    self.logger.error("Resposta do Spotify não contém o ID do usuário.")
+                    return None, self.handler.message(
+                        message="Resposta do Spotify não contém o ID do usuário.",
+                        level=ERROR,
+                    )
+                user_id = user["id"]
             self.logger.info(f"Usuário autenticado: {user_id}")
-            playlist = spotify_client.user_playlist_create(
-                user=user_id, name="Minha Playlist via Serveo", public=True
+            # A ordem é definida antes da criação: uma falha aqui não deixa playlist vazia.
+            if track_uris and smooth_order:
+                track_uris = self._order_tracks(spotify_client, track_uris)
+            playlist = self.resilience.call(
+                "users/playlists",
+                spotify_client.user_playlist_create,
+                user=user_id,
+                name=name,
+                public=public,
             )
             self.logger.info(f"Playlist retornada: {playlist}")
             if (
@@ -126,6 +444,11 @@ class SpotifyAuthHandler(BaseClass):
                     level=ERROR,
                 )
             self.logger.info(f"Playlist criada com sucesso: {playlist['id']}")
+            # A capa é gerada em segundo plano, em paralelo à inserção das faixas.
+            self.covers.submit(spotify_client, playlist["id"], name, track_uris)
+            if track_uris:
+                job = self._start_job(playlist, track_uris, user_id, job_id)
+                self.playlist_writer.write(spotify_client, job)
             return playlist["external_urls"]["spotify"], None
         except SpotifyException:
             self.logger.exception("Erro ao criar playlist no Spotify.")
@@ -133,6 +456,12 @@ class SpotifyAuthHandler(BaseClass):
                 message="Erro ao criar playlist no Spotify.",
                 exception=SpotifyException,
             )
+        except (CircuitOpenError, DeadlineExceededError) as error:
+            self.logger.exception("Spotify indisponível ao criar playlist.")
+            self.handler.exception(
+                message="Spotify indisponível ao criar playlist.",
+                exception=type(error),
+            )
         except KeyError:
             self.logger.exception("Erro ao acessar chave obrigatória.")
             self.handler.exception(
@@ -140,18 +469,85 @@ class SpotifyAuthHandler(BaseClass):
                 exception=KeyError,
             )
 
-    def _render_playlist_template(self, playlist_url: str | None, error_msg: str | None) -> str:
-        """Renderiza o template de playlist ou de erro."""
+    def _start_job(
+        self, playlist: dict, track_uris: list[str], user_id: str | None, job_id: str | None
+    ) -> PlaylistJob:
+        """Grava o checkpoint do job e, numa importação, descarta o arquivo já dispensável."""
+        job = self.checkpoints.start(job_id or uuid.uuid4().hex, user_id, playlist, track_uris)
+        # Só com o checkpoint gravado a importação pode ser retomada sem o arquivo.
+        if job_id is not None:
+            self._discard_import(job_id)
+        return job
+
+    @traced("auth.resume_job")
+    def _resume_import(self, access_token: str, job: PlaylistJob, user_id: str) -> str:
+        """Retoma a importação interrompida do usuário, enviando só os lotes pendentes."""
+        if job.user_id != user_id:
+            # Nunca cria outra playlist: o arquivo já foi descartado quando o job começou.
+            return self._handle_error(
+                f"Importação {job.job_id} pertence a outro usuário.",
+                "Importação não encontrada.",
+                warning=True,
+            )
+        spotify_client = self.credentials.user_client(access_token)
+        try:
+            job = self.playlist_writer.write(spotify_client, job)
+        except SpotifyException as error:
+            self.logger.exception(f"Erro ao retomar a importação {job.job_id}.")
+            return self._handle_error(
+                f"Erro {error.http_status} ao retomar a importação {job.job_id}.",
+                "Erro ao retomar a importação. Tente novamente.",
+            )
+        except (CircuitOpenError, DeadlineExceededError):
+            self.logger.exception("Spotify indisponível ao retomar a importação.")
+            return self._handle_error(
+                "Spotify indisponível ao retomar a importação.",
+                "Spotify indisponível no momento. Tente novamente.",
+            )
+        return self._render_playlist_template(
+            [PlaylistResult(DEFAULT_PLAYLIST_NAME, job.playlist_url)]
+        )
+
+    @traced("auth.order_tracks")
+    def _order_tracks(self, spotify_client: spotipy.Spotify, track_uris: list[str]) -> list[str]:
+        """Reordena as faixas para suavizar transições; se falhar, mantém a ordem original."""
+        self.logger.info(f"Obtendo atributos de áudio de {len(track_uris)} faixas.")
+
+        def fetch(chunk: list[str]) -> list[dict | None]:
+            response = self.resilience.call(
+                "audio-features", spotify_client.audio_features, chunk, idempotent=True
+            )
+            return response or [None] * len(chunk)
+
+        # O carregador consulta cada faixa repetida uma única vez, em lotes do tamanho máximo.
+        loader = BatchLoader(fetch, SPOTIFY_AUDIO_FEATURES_LIMIT, name="audio-features")
+        try:
+            features = loader.get_many(track_uris)
+        except (SpotifyException, CircuitOpenError, DeadlineExceededError):
+            # Ex.: 403 em apps sem acesso ao endpoint; a playlist sai na ordem do pedido.
+            self.logger.exception("Atributos de áudio indisponíveis; mantendo a ordem original.")
+            return track_uris
         self.logger.info(
-            f"Renderizando template. playlist_url={playlist_url}, error_msg={error_msg}"
+            f"Atributos de áudio: {loader.requested} faixas em {loader.batches} chamadas."
         )
+        return self.track_optimizer.order_uris(track_uris, features)
+
+    @traced("auth.render_template")
+    def _render_playlist_template(self, results: list[PlaylistResult]) -> str:
+        """Renderiza o template das playlists criadas, ou o de erro se nenhuma foi criada."""
+        self.logger.info(f"Renderizando template. playlists={results}")
         try:
-            if error_msg:
+            if not any(result.url for result in results):
+                error_msg = next(
+                    (result.error for result in results if result.error),
+                    "Nenhuma playlist foi criada.",
+                )
                 self.logger.warning(f"Renderizando template de erro: {error_msg}")
-                return render_template("error.html", error=error_msg)
-            self.logger.info("Renderizando template do app com playlist_url.")
+                return self.templates.render_cached("error.html", error=error_msg)
+            self.logger.info("Renderizando template do app com as playlists.")
             # APP_TEMPLATE agora é uma string com o nome do template (ex: 'app.html')
-            return render_template(APP_TEMPLATE, playlist_url=playlist_url)
+            # Links únicos por usuário: a página não se repete e fica fora do cache.
+            return self.templates.render(APP_TEMPLATE, playlists=results)
         except (TemplateError, KeyError):
             self.logger.exception("Erro ao renderizar template.")
             self.handler.exception(
@@ -159,8 +555,8 @@ class SpotifyAuthHandler(BaseClass):
                 exception=TemplateError,
             )
 
-    def _load_spotify_oauth(self) -> SpotifyOAuth:
-        """Carrega e valida as variáveis de ambiente para o SpotifyOAuth."""
+    def _load_oauth_configs(self) -> list[dict[str, str]]:
+        """Carrega e valida as credenciais do Spotify: a principal e as extras do pool."""
         self.logger.info("Carregando variáveis de ambiente do Spotify.")
         client_id = os.getenv("SPOTIPY_CLIENT_ID")
         client_secret = os.getenv("SPOTIPY_CLIENT_SECRET")
@@ -180,18 +576,24 @@ class SpotifyAuthHandler(BaseClass):
             msg = f"Variáveis de ambiente ausentes: {', '.join(missing)}"
             self.logger.error(f"{msg}")
             self.handler.exception(message=msg, exception=OSError)
-        try:
-            self.logger.info("Inicializando SpotifyOAuth com as variáveis de ambiente.")
-            return SpotifyOAuth(
-                client_id=client_id,
-                client_secret=client_secret,
-                redirect_uri=redirect_uri,
-                scope=self.scope,
-            )
-        except Exception:
-            self.logger.exception("Erro ao inicializar SpotifyOAuth.")
-            self.handler.exception(
-                message="Erro ao inicializar SpotifyOAuth.",
-                exception=OSError,
-            )
-            raise
+        pairs = [(client_id, client_secret)]
+        for entry in (os.getenv(CREDENTIAL_POOL_ENV) or "").split(","):
+            if not entry.strip():
+                continue
+            extra_id, separator, extra_secret = entry.strip().partition(":")
+            if not separator or not extra_id or not extra_secret:
+                msg = f"Credencial inválida em {CREDENTIAL_POOL_ENV}; use `id:secret`."
+                self.logger.error(f"{msg}")
+                self.handler.exception(message=msg, exception=OSError)
+            if extra_id not in {pair[0] for pair in pairs}:
+                pairs.append((extra_id, extra_secret))
+        self.logger.info(f"{len(pairs)} credenciais do Spotify configuradas.")
+        return [
+            {
+                "client_id": pair_id,
+                "client_secret": pair_secret,
+                "redirect_uri": redirect_uri,
+                "scope": self.scope,
+            }
+            for pair_id, pair_secret in pairs
+        ]
@@ -0,0 +1,337 @@
+"""Otimizador de ordenação de faixas para suavizar transições entre músicas consecutivas."""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+from itertools import pairwise, repeat
+import math
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import (
+    TRACK_ORDERING_CHUNK_SIZE,
+    TRACK_ORDERING_NEIGHBORS,
+    TRACK_ORDERING_PARALLEL_THRESHOLD,
+    TRACK_ORDERING_TIME_BUDGET,
+    TRACK_ORDERING_WEIGHTS,
+)
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+type Point = tuple[float, float, float, float, float]
+"""Vetor de atributos de uma faixa: (log2 do tempo, cos e sen da roda Camelot, modo, energia)."""
+
+_DEFAULT_TEMPO: float = 120.0
+"""Tempo (BPM) usado quando a faixa não possui atributos de áudio."""
+
+_DEFAULT_ENERGY: float = 0.5
+"""Energia usada quando a faixa não possui atributos de áudio."""
+
+_EPSILON: float = 1e-9
+"""Ganho mínimo para que um movimento de melhoria seja aplicado."""
+
+_MIN_TRACKS_TO_OPTIMIZE: int = 3
+"""Quantidade mínima de faixas para que a ordenação tenha efeito."""
+
+
+def camelot_position(key: int, mode: int) -> int:
+    """Converte tonalidade e modo do Spotify para a posição (0 a 11) na roda Camelot."""
+    major_key = key if mode == 1 else (key + 3) % 12
+    return (major_key * 7 + 7) % 12
+
+
+def feature_point(features: dict[str, Any] | None) -> Point:
+    """Converte os atributos de áudio do Spotify em um ponto no espaço de transições."""
+    weights = TRACK_ORDERING_WEIGHTS
+    if not features:
+        features = {}
+    tempo = float(features.get("tempo") or _DEFAULT_TEMPO)
+    energy = float(features.get("energy", _DEFAULT_ENERGY))
+    key = int(features.get("key", -1))
+    mode = int(features.get("mode", 1))
+    # Faixas sem tonalidade detectada ficam no centro da roda, equidistantes de todas as outras.
+    if key < 0:
+        key_x = key_y = 0.0
+    else:
+        angle = 2 * math.pi * camelot_position(key, mode) / 12
+        key_x = weights["key"] * math.cos(angle)
+        key_y = weights["key"] * math.sin(angle)
+    return (
+        weights["tempo"] * math.log2(max(tempo, 1.0)),
+        key_x,
+        key_y,
+        weights["mode"] * mode,
+        weights["energy"] * energy,
+    )
+
+
+def distance_matrix(points: list[Point]) -> list[array]:
+    """Calcula a matriz de distâncias euclidianas linha a linha em arrays compactos."""
+    count = len(points)
+    return [array("d", map(math.dist, repeat(point, count), points)) for point in points]
+
+
+def path_cost(order: list[int], matrix: list[array]) -> float:
+    """Calcula o custo total de transições de um caminho."""
+    return sum(matrix[a][b] for a, b in pairwise(order))
+
+
+def _neighbor_lists(matrix: list[array], size: int) -> list[list[int]]:
+    """Retorna, para cada faixa, os índices das faixas mais próximas."""
+    indices = range(len(matrix))
+    return [
+        [j for j in heapq.nsmallest(size + 1, indices, key=row.__getitem__) if j != i][:size]
+        for i, row in enumerate(matrix)
+    ]
+
+
+def _nearest_neighbor_path(matrix: list[array], start: int) -> list[int]:
+    """Constrói um caminho inicial guloso pelo vizinho mais próximo."""
+    unvisited = set(range(len(matrix)))
+    unvisited.remove(start)
+    order = [start]
+    current = start
+    while unvisited:
+        current = min(unvisited, key=matrix[current].__getitem__)
+        unvisited.remove(current)
+        order.append(current)
+    return order
+
+
+def _two_opt_pass(
+    order: list[int],
+    matrix: list[array],
+    neighbors: list[list[int]],
+    deadline: float,
+) -> bool:
+    """Executa uma varredura 2-opt com listas de vizinhos e retorna se houve melhoria."""
+    count = len(order)
+    position = [0] * count
+    for index, node in enumerate(order):
+        position[node] = index
+    improved = False
+    for i in range(count - 1):
+        if time.perf_counter() > deadline:
+            break
+        a = order[i]
+        b = order[i + 1]
+        row_a = matrix[a]
+        current_ab = row_a[b]
+        for c in neighbors[a]:
+            gain_ac = row_a[c]
+            if gain_ac >= current_ab:
+                break
+            j = position[c]
+            if j <= i + 1:
+                continue
+            if j + 1 < count:
+                d = order[j + 1]
+                delta = gain_ac + matrix[b][d] - current_ab - matrix[c][d]
+            else:
+                delta = gain_ac - current_ab
+            if delta < -_EPSILON:
+                order[i + 1 : j + 1] = order[i + 1 : j + 1][::-1]
+                for index in range(i + 1, j + 1):
+                    position[order[index]] = index
+                b = order[i + 1]
+                current_ab = row_a[b]
+                improved = True
+    return _reverse_prefix_pass(order, matrix) or improved
+
+
+def _reverse_prefix_pass(order: list[int], matrix: list[array]) -> bool:
+    """Inverte prefixos do caminho que encurtam a transição, trocando a faixa de abertura."""
+    improved = False
+    first = order[0]
+    for j in range(1, len(order) - 1):
+        if matrix[first][order[j + 1]] - matrix[order[j]][order[j + 1]] < -_EPSILON:
+            order[: j + 1] = order[: j + 1][::-1]
+            first = order[0]
+            improved = True
+    return improved
+
+
+def _or_opt_pass(
+    order: list[int],
+    matrix: list[array],
+    neighbors: list[list[int]],
+    deadline: float,
+) -> bool:
+    """Executa uma varredura or-opt movendo segmentos de 1 a 3 faixas."""
+    improved = False
+    position = [0] * len(order)
+    for index, node in enumerate(order):
+        position[node] = index
+    for length in (1, 2, 3):
+        i = 0
+        while i + length <= len(order):
+            if time.perf_counter() > deadline:
+                return improved
+            if _try_move_segment(order, matrix, neighbors, position, range(i, i + length)):
+                improved = True
+                for index, node in enumerate(order):
+                    position[node] = index
+            else:
+                i += 1
+    return improved
+
+
+def _try_move_segment(
+    order: list[int],
+    matrix: list[array],
+    neighbors: list[list[int]],
+    position: list[int],
+    span: range,
+) -> bool:
+    """Tenta reposicionar o segmento `span` do caminho e retorna se o movimento foi aplicado."""
+    count = len(order)
+    start, length = span.start, len(span)
+    if count <= length + 1:
+        return False
+    segment = order[span.start : span.stop]
+    head, tail = segment[0], segment[-1]
+    before = order[start - 1] if start > 0 else None
+    after = order[start + length] if start + length < count else None
+    removal_gain = (matrix[before][head] if before is not None else 0.0) + (
+        matrix[tail][after] if after is not None else 0.0
+    )
+    if before is not None and after is not None:
+        removal_gain -= matrix[before][after]
+
+    members = set(segment)
+    best_delta = -_EPSILON
+    best_move: tuple[int | None, int | None, bool] | None = None
+    for candidate in {*neighbors[head], *neighbors[tail]} - members:
+        index = position[candidate]
+        left_of = order[index - 1] if index > 0 else None
+        right_of = order[index + 1] if index + 1 < count else None
+        for left, right in ((candidate, right_of), (left_of, candidate)):
+            if left in members or right in members:
+                continue
+            for reverse in (False, True):
+                first, last = (tail, head) if reverse else (head, tail)
+                added = (matrix[left][first] if left is not None else 0.0) + (
+                    matrix[last][right] if right is not None else 0.0
+                )
+                if left is not None and right is not None:
+                    added -= matrix[left][right]
+                delta = added - removal_gain
+                if delta < best_delta:
+                    best_delta = delta
+                    best_move = (left, right, reverse)
+    if best_move is None:
+        return False
+    left, _right, reverse = best_move
+    del order[start : start + length]
+    insert_at = order.index(left) + 1 if left is not None else 0
+    order[insert_at:insert_at] = segment[::-1] if reverse else segment
+    return True
+
+
+def optimize_path(points: list[Point], time_budget: float, neighbor_count: int) -> list[int]:
+    """Ordena os pontos minimizando a soma das distâncias entre vizinhos (TSP aproximado)."""
+    count = len(points)
+    if count < _MIN_TRACKS_TO_OPTIMIZE:
+        return list(range(count))
+    deadline = time.perf_counter() + time_budget
+    matrix = distance_matrix(points)
+    neighbors = _neighbor_lists(matrix, min(neighbor_count, count - 1))
+    # Começa pela faixa de menor energia para favorecer um aquecimento gradual.
+    start = min(range(count), key=lambda index: points[index][4])
+    order = _nearest_neighbor_path(matrix, start)
+    while time.perf_counter() < deadline:
+        improved = _two_opt_pass(order, matrix, neighbors, deadline)
+        improved = _or_opt_pass(order, matrix, neighbors, deadline) or improved
+        if not improved:
+            break
+    return order
+
+
+def _optimize_chunk(points: list[Point], time_budget: float, neighbor_count: int) -> list[int]:
+    """Executa a otimização de um bloco de faixas em um processo do pool."""
+    return optimize_path(points, time_budget, neighbor_count)
+
+
+class TrackOrderingOptimizer(BaseClass):
+    """Ordena faixas minimizando saltos de tempo, tonalidade e energia entre faixas consecutivas."""
+
+    def __init__(
+        self,
+        time_budget: float = TRACK_ORDERING_TIME_BUDGET,
+        max_workers: int | None = None,
+    ) -> None:
+        """Inicializa o otimizador com orçamento de tempo e limite de processos."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.time_budget = time_budget
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.logger.info(
+            f"Otimizador de ordenação inicializado: time_budget={self.time_budget}s, "
+            f"max_workers={self.max_workers}"
+        )
+
+    def order(self, features: list[dict[str, Any] | None]) -> list[int]:
+        """Retorna os índices das faixas na ordem que suaviza as transições."""
+        started = time.perf_counter()
+        points = [feature_point(item) for item in features]
+        if len(points) > TRACK_ORDERING_PARALLEL_THRESHOLD:
+            order = self._order_in_chunks(points)
+        else:
+            order = optimize_path(points, self.time_budget, TRACK_ORDERING_NEIGHBORS)
+        self.logger.info(
+            f"Ordenação de {len(points)} faixas concluída em {time.perf_counter() - started:.3f}s."
+        )
+        return order
+
+    def order_uris(self, uris: list[str], features: list[dict[str, Any] | None]) -> list[str]:
+        """Reordena as URIs de faixas conforme os atributos de áudio correspondentes."""
+        if len(uris) != len(features):
+            self._handle_error(ValueError, "Quantidade de URIs e de atributos de áudio difere.")
+        return [uris[index] for index in self.order(features)]
+
+    def _order_in_chunks(self, points: list[Point]) -> list[int]:
+        """Divide faixas em blocos harmônicos, otimiza cada bloco em paralelo e os encadeia."""
+        # Blocos contíguos na roda Camelot e no tempo mantêm as junções entre blocos curtas.
+        ranked = sorted(
+            range(len(points)),
+            key=lambda index: (math.atan2(points[index][2], points[index][1]), points[index][0]),
+        )
+        chunks = [
+            ranked[offset : offset + TRACK_ORDERING_CHUNK_SIZE]
+            for offset in range(0, len(ranked), TRACK_ORDERING_CHUNK_SIZE)
+        ]
+        workers = min(self.max_workers, len(chunks))
+        self.logger.info(
+            f"Ordenando {len(points)} faixas em {len(chunks)} blocos com {workers} processos."
+        )
+        chunk_points = [[points[index] for index in chunk] for chunk in chunks]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                local_orders = list(
+                    executor.map(
+                        _optimize_chunk,
+                        chunk_points,
+                        repeat(self.time_budget),
+                        repeat(TRACK_ORDERING_NEIGHBORS),
+                    )
+                )
+        else:
+            local_orders = [
+                _optimize_chunk(item, self.time_budget, TRACK_ORDERING_NEIGHBORS)
+                for item in chunk_points
+            ]
+        paths = [
+            [chunk[index] for index in local_order]
+            for chunk, local_order in zip(chunks, local_orders, strict=True)
+        ]
+        order = paths[0]
+        for path in paths[1:]:
+            # Orienta cada bloco para que sua primeira faixa fique próxima do fim do anterior.
+            last = points[order[-1]]
+            if math.dist(last, points[path[-1]]) < math.dist(last, points[path[0]]):
+                path.reverse()
+            order.extend(path)
+        return order
@@ -0,0 +1,254 @@
+"""Armazenamento compacto de faixas em colunas (struct-of-arrays) com IDs internados."""
+
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+import sys
+from typing import TYPE_CHECKING, Any
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import SPOTIFY_ID_LENGTH
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    import spotipy
+
+
+@dataclass(slots=True, frozen=True)
+class TrackRecord:
+    """Visão materializada sob demanda de uma faixa do `TrackStore`."""
+
+    id: str
+    """ID da faixa no Spotify."""
+
+    name: str
+    """Nome da faixa."""
+
+    artist_ids: tuple[str, ...]
+    """IDs dos artistas da faixa, na ordem retornada pelo Spotify."""
+
+    album_id: str
+    """ID do álbum da faixa."""
+
+    duration_ms: int
+    """Duração da faixa em milissegundos."""
+
+    popularity: int
+    """Popularidade da faixa (0 a 100)."""
+
+    explicit: bool
+    """Indica se a faixa possui conteúdo explícito."""
+
+    @property
+    def uri(self) -> str:
+        """Retorna a URI da faixa no formato `spotify:track:<id>`."""
+        return f"spotify:track:{self.id}"
+
+
+class _InternTable:
+    """Tabela de internação que mapeia IDs repetidos para índices inteiros."""
+
+    __slots__ = ("_index", "extras", "values")
+
+    def __init__(self) -> None:
+        """Inicializa a tabela vazia."""
+        self._index: dict[str, int] = {}
+        self.values: list[str] = []
+        self.extras: list[str | None] = []
+
+    def intern(self, value: str, extra: str | None = None) -> int:
+        """Retorna o índice do valor, registrando-o (e o dado extra) na primeira ocorrência."""
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.values)
+            self._index[value] = index
+            self.values.append(value)
+            self.extras.append(extra)
+        return index
+
+    def __len__(self) -> int:
+        """Retorna a quantidade de valores distintos."""
+        return len(self.values)
+
+
+class TrackStore(BaseClass):
+    """Armazena faixas em colunas compactas, descartando o JSON bruto das respostas."""
+
+    def __init__(self) -> None:
+        """Inicializa as colunas vazias do armazenamento."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+
+        self._ids = bytearray()
+        """IDs das faixas em ASCII de largura fixa (`SPOTIFY_ID_LENGTH` bytes por faixa)."""
+
+        self._names = bytearray()
+        """Nomes das faixas concatenados em UTF-8."""
+
+        self._name_offsets = array("I", [0])
+        """Deslocamentos de início e fim de cada nome em `_names`."""
+
+        self._artist_refs = array("I")
+        """Índices internados dos artistas de todas as faixas, concatenados."""
+
+        self._artist_offsets = array("I", [0])
+        """Deslocamentos de início e fim dos artistas de cada faixa em `_artist_refs`."""
+
+        self._album_refs = array("I")
+        """Índice internado do álbum de cada faixa."""
+
+        self._durations = array("I")
+        """Duração de cada faixa em milissegundos."""
+
+        self._popularity = array("B")
+        """Popularidade de cada faixa (0 a 100)."""
+
+        self._explicit = array("B")
+        """Indicador de conteúdo explícito de cada faixa (0 ou 1)."""
+
+        self.artists = _InternTable()
+        """IDs de artistas internados, com o nome do artista como dado extra."""
+
+        self.albums = _InternTable()
+        """IDs de álbuns internados, com a URL da capa como dado extra."""
+
+        self.skipped: int = 0
+        """Quantidade de itens ignorados por não serem faixas do catálogo (ex: arquivos locais)."""
+
+    def __len__(self) -> int:
+        """Retorna a quantidade de faixas armazenadas."""
+        return len(self._album_refs)
+
+    def __getitem__(self, index: int) -> TrackRecord:
+        """Materializa a faixa na posição informada como `TrackRecord`."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Índice de faixa fora do intervalo.")
+        artist_values = self.artists.values
+        artist_refs = self._artist_refs[
+            self._artist_offsets[index] : self._artist_offsets[index + 1]
+        ]
+        return TrackRecord(
+            id=self.track_id(index),
+            name=self._names[self._name_offsets[index] : self._name_offsets[index + 1]].decode(
+                "utf-8"
+            ),
+            artist_ids=tuple(artist_values[ref] for ref in artist_refs),
+            album_id=self.albums.values[self._album_refs[index]],
+            duration_ms=self._durations[index],
+            popularity=self._popularity[index],
+            explicit=bool(self._explicit[index]),
+        )
+
+    def __iter__(self) -> Iterator[TrackRecord]:
+        """Itera sobre as faixas materializando um `TrackRecord` por vez."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def track_id(self, index: int) -> str:
+        """Retorna o ID da faixa na posição informada sem materializar o registro completo."""
+        start = index * SPOTIFY_ID_LENGTH
+        return self._ids[start : start + SPOTIFY_ID_LENGTH].decode("ascii")
+
+    def uris(self) -> list[str]:
+        """Retorna as URIs de todas as faixas na ordem de inserção."""
+        return [f"spotify:track:{self.track_id(index)}" for index in range(len(self))]
+
+    def append(self, track: dict[str, Any] | None) -> bool:
+        """Adiciona uma faixa a partir do objeto JSON do Spotify e retorna se ela foi armazenada."""
+        if not track or track.get("type", "track") != "track" or track.get("is_local"):
+            self.skipped += 1
+            return False
+        track_id = track.get("id")
+        name = track.get("name")
+        artists = track.get("artists")
+        if (
+            not track_id
+            or len(track_id) != SPOTIFY_ID_LENGTH
+            or not track_id.isascii()
+            or not isinstance(name, str)
+            or not isinstance(artists, list)
+        ):
+            self.skipped += 1
+            return False
+        # Todos os campos são lidos antes da primeira escrita: uma faixa inválida não pode
+        # deixar as colunas com tamanhos diferentes.
+        artist_entries = [
+            (artist["id"], artist.get("name")) for artist in artists if artist and artist.get("id")
+        ]
+        # Faixas simplificadas (ex: listagem de um álbum) não trazem o objeto `album`.
+        album = track.get("album") or {}
+        images = album.get("images") or []
+        # O Spotify ordena as imagens da maior para a menor; a intermediária basta para mosaicos.
+        image_url = images[min(1, len(images) - 1)]["url"] if images else None
+        duration = int(track.get("duration_ms") or 0)
+        popularity = int(track.get("popularity") or 0)
+        self._ids += track_id.encode("ascii")
+        self._names += name.encode("utf-8")
+        self._name_offsets.append(len(self._names))
+        for artist_id, artist_name in artist_entries:
+            self._artist_refs.append(self.artists.intern(artist_id, artist_name))
+        self._artist_offsets.append(len(self._artist_refs))
+        self._album_refs.append(self.albums.intern(album.get("id") or "", image_url))
+        self._durations.append(duration)
+        self._popularity.append(popularity)
+        self._explicit.append(1 if track.get("explicit") else 0)
+        return True
+
+    def extend_from_page(self, page: dict[str, Any]) -> int:
+        """Adiciona as faixas de uma página de resposta do Spotify e retorna quantas entraram."""
+        if "tracks" in page and isinstance(page["tracks"], dict):
+            # Respostas de busca encapsulam a página em `tracks`.
+            page = page["tracks"]
+        items = page.get("items")
+        if items is None:
+            # Respostas de `/tracks?ids=` retornam a lista diretamente em `tracks`.
+            items = page.get("tracks") or []
+        added = 0
+        for item in items:
+            # Itens de playlist encapsulam a faixa em `track`; buscas e álbuns não.
+            track = item.get("track", item) if isinstance(item, dict) else None
+            added += self.append(track)
+        return added
+
+    def load_pages(self, spotify_client: "spotipy.Spotify", first_page: dict[str, Any]) -> int:
+        """Percorre a paginação a partir da primeira página, descartando cada página após lida."""
+        added = 0
+        page: dict[str, Any] | None = first_page
+        while page:
+            added += self.extend_from_page(page)
+            inner = page["tracks"] if isinstance(page.get("tracks"), dict) else page
+            page = spotify_client.next(inner) if inner.get("next") else None
+        self.logger.info(
+            f"{added} faixas carregadas no TrackStore ({len(self)} no total, "
+            f"{self.skipped} ignoradas, {self.nbytes() / 1_048_576:.1f} MiB)."
+        )
+        return added
+
+    def load_playlist(self, spotify_client: "spotipy.Spotify", playlist_id: str) -> int:
+        """Carrega todas as faixas de uma playlist paginando diretamente para as colunas."""
+        self.logger.info(f"Carregando faixas da playlist {playlist_id} no TrackStore.")
+        return self.load_pages(spotify_client, spotify_client.playlist_items(playlist_id))
+
+    def nbytes(self) -> int:
+        """Estima os bytes ocupados pelas colunas e tabelas de internação."""
+        columns = (
+            self._ids,
+            self._names,
+            self._name_offsets,
+            self._artist_refs,
+            self._artist_offsets,
+            self._album_refs,
+            self._durations,
+            self._popularity,
+            self._explicit,
+        )
+        total = sum(sys.getsizeof(column) for column in columns)
+        for table in (self.artists, self.albums):
+            total += sys.getsizeof(table.values) + sys.getsizeof(table.extras)
+            total += sys.getsizeof(table._index)  # noqa: SLF001
+            total += sum(sys.getsizeof(value) for value in table.values)
+            total += sum(sys.getsizeof(extra) for extra in table.extras if extra)
+        return total
@@ -11,3 +11,11 @@ class LoggerError(ProjectError):
 
 class SettingsManagerError(ProjectError):
     """Exceção para erros relacionados à classe SettingsManager."""
+
+
+class CircuitOpenError(ProjectError):
+    """Exceção para chamadas rejeitadas por um circuit breaker aberto."""
+
+
+class DeadlineExceededError(ProjectError):
+    """Exceção para chamadas interrompidas pelo prazo da requisição de entrada."""
@@ -12,6 +12,12 @@ VERSION: str = "0.1.0"
 LOG_DIR: Path = Path("./logs")
 """Caminho para o diretório de logs: `./logs`"""
 
+LOG_FORMAT: str = "%(asctime)s - %(module)s:%(lineno)03d - %(levelname)s - %(message)s"
+"""Formato das linhas de log; o analisador de logs depende do prefixo com data e hora."""
+
+LOG_DATE_FORMAT: str = "%Y-%m-%d %H:%M:%S"
+"""Formato da data e hora no início de cada linha de log: `%Y-%m-%d %H:%M:%S`"""
+
 SETTINGS_FILE: Path = Path("./src/config/files/settings.yaml")
 """Caminho para o arquivo de configuração global: `./src/config/files/settings.yaml`"""
 
@@ -23,3 +29,229 @@ REQUIRED_ENV: list[str] = ["SPOTIPY_CLIENT_ID", "SPOTIPY_CLIENT_SECRET", "SPOTIP
 
 APP_TEMPLATE = "app.html"
 """Nome do template da aplicação: `app.html`"""
+
+TEMPLATE_DIR: Path = Path("./src/templates")
+"""Diretório dos templates HTML, pré-compilados na inicialização: `./src/templates`"""
+
+TEMPLATE_RENDER_CACHE_SIZE: int = 256
+"""Quantidade de páginas renderizadas mantidas em cache por combinação de parâmetros: `256`"""
+
+SPOTIFY_ADD_ITEMS_LIMIT: int = 100
+"""Quantidade máxima de faixas por requisição de inclusão em playlist: `100`"""
+
+SPOTIFY_AUDIO_FEATURES_LIMIT: int = 100
+"""Quantidade máxima de IDs por requisição de atributos de áudio: `100`"""
+
+TRACK_ORDERING_TIME_BUDGET: float = 1.0
+"""Orçamento de tempo, em segundos, da otimização de ordenação de faixas: `1.0`"""
+
+TRACK_ORDERING_NEIGHBORS: int = 10
+"""Quantidade de vizinhos mais próximos avaliados por faixa na busca local: `10`"""
+
+TRACK_ORDERING_PARALLEL_THRESHOLD: int = 1500
+"""Quantidade de faixas a partir da qual a ordenação é distribuída entre processos: `1500`"""
+
+TRACK_ORDERING_CHUNK_SIZE: int = 1000
+"""Quantidade de faixas por bloco na ordenação distribuída entre processos: `1000`"""
+
+TRACK_ORDERING_WEIGHTS: dict[str, float] = {
+    "tempo": 4.0,
+    "key": 1.0,
+    "mode": 0.25,
+    "energy": 2.0,
+}
+"""Pesos de tempo, tonalidade, modo e energia no cálculo da distância entre faixas."""
+
+SPOTIFY_ID_LENGTH: int = 22
+"""Quantidade de caracteres (base62) de um ID do Spotify: `22`"""
+
+SPOTIFY_REQUEST_TIMEOUT: float = 5.0
+"""Timeout padrão, em segundos, de cada requisição HTTP ao Spotify: `5.0`"""
+
+REQUEST_DEADLINE_HEADER: str = "X-Request-Timeout"
+"""Cabeçalho com o prazo, em segundos, definido pelo cliente para a requisição de entrada."""
+
+REQUEST_DEADLINE_DEFAULT: float = 20.0
+"""Prazo padrão, em segundos, de uma requisição de entrada sem cabeçalho de prazo: `20.0`"""
+
+RESILIENCE_MAX_ATTEMPTS: int = 3
+"""Quantidade máxima de tentativas por chamada ao Spotify: `3`"""
+
+RESILIENCE_BASE_DELAY: float = 0.2
+"""Espera base, em segundos, do backoff exponencial entre tentativas: `0.2`"""
+
+RESILIENCE_MAX_DELAY: float = 5.0
+"""Espera máxima, em segundos, entre tentativas: `5.0`"""
+
+RESILIENCE_BREAKER_FAILURE_THRESHOLD: int = 5
+"""Quantidade de falhas consecutivas que abre o circuit breaker de um endpoint: `5`"""
+
+RESILIENCE_BREAKER_RESET_TIMEOUT: float = 30.0
+"""Tempo, em segundos, até o circuit breaker aberto liberar uma chamada de sonda: `30.0`"""
+
+RESILIENCE_LATENCY_WINDOW: int = 200
+"""Quantidade de latências recentes mantidas por endpoint para cálculo do p95: `200`"""
+
+RESILIENCE_HEDGE_MIN_SAMPLES: int = 20
+"""Quantidade mínima de amostras antes de habilitar requisições duplicadas (hedging): `20`"""
+
+RESILIENCE_HEDGE_MAX_WORKERS: int = 16
+"""Quantidade máxima de threads para chamadas com requisições duplicadas: `16`"""
+
+SPOTIFY_PLAYLISTS_LIMIT: int = 50
+"""Quantidade máxima de playlists por página de `/me/playlists`: `50`"""
+
+SPOTIFY_TRACKS_LIMIT: int = 50
+"""Quantidade máxima de IDs por requisição ao endpoint `/tracks`: `50`"""
+
+SPOTIFY_ARTISTS_LIMIT: int = 50
+"""Quantidade máxima de IDs por requisição ao endpoint `/artists`: `50`"""
+
+SPOTIFY_ALBUMS_LIMIT: int = 20
+"""Quantidade máxima de IDs por requisição ao endpoint `/albums`: `20`"""
+
+BATCH_LOADER_WINDOW: float = 0.01
+"""Janela, em segundos, para agrupar consultas individuais em um mesmo lote: `0.01`"""
+
+DEFAULT_PLAYLIST_NAME: str = "Minha Playlist via Serveo"
+"""Nome padrão das playlists criadas pelo fluxo de autenticação."""
+
+IMPORT_DIR: Path = Path("./archive/imports")
+"""Diretório temporário dos arquivos enviados para importação: `./archive/imports`"""
+
+IMPORT_SUFFIXES: tuple[str, ...] = (".csv", ".m3u", ".m3u8")
+"""Extensões de arquivo aceitas na importação de playlists."""
+
+IMPORT_MAX_BYTES: int = 5 * 1024 * 1024
+"""Tamanho máximo, em bytes, de um arquivo de importação: `5 MiB`"""
+
+IMPORT_CONCURRENCY: int = 16
+"""Quantidade máxima de buscas simultâneas durante uma importação: `16`"""
+
+IMPORT_NEGATIVE_CACHE_TTL: float = 24 * 60 * 60
+"""Tempo, em segundos, que uma busca sem resultado permanece no cache negativo: `24 h`"""
+
+IMPORT_CACHE_SIZE: int = 50_000
+"""Quantidade máxima de consultas em cada cache do importador (encontradas e não encontradas)."""
+
+IMPORT_REQUEST_DEADLINE: float = 300.0
+"""Prazo, em segundos, de um callback que executa uma importação: `300.0`"""
+
+IMPORT_STATE_PREFIX: str = "import:"
+"""Prefixo do parâmetro `state` do OAuth que identifica uma importação pendente."""
+
+PLAYLISTS_STATE_PREFIX: str = "playlists:"
+"""Prefixo do parâmetro `state` do OAuth com os nomes das playlists pedidas no login."""
+
+PLAYLIST_SPECS_MAX: int = 10
+"""Quantidade máxima de playlists criadas em uma única autorização: `10`"""
+
+PLAYLIST_NAME_MAX_LENGTH: int = 100
+"""Quantidade máxima de caracteres do nome de uma playlist: `100`"""
+
+PLAYLIST_CONCURRENCY: int = 4
+"""Quantidade de playlists criadas simultaneamente, somando todas as requisições: `4`"""
+
+SPOTIFY_SCOPE: str = "playlist-modify-public playlist-modify-private ugc-image-upload"
+"""Escopos OAuth solicitados ao Spotify; `playlist-modify-private` permite `public: false`."""
+
+TOKEN_STORE_PATH: Path = Path("./archive/tokens.sqlite3")
+"""Caminho do banco SQLite com os refresh tokens dos usuários: `./archive/tokens.sqlite3`"""
+
+BATCH_USERS_PER_TASK: int = 50
+"""Quantidade de usuários enviados a cada tarefa do pool de processos do batch: `50`"""
+
+BATCH_PROCESS_CONCURRENCY: int = 8
+"""Quantidade de usuários processados simultaneamente dentro de cada processo do batch: `8`"""
+
+BATCH_GLOBAL_CONCURRENCY: int = 32
+"""Quantidade máxima de usuários processados simultaneamente em todos os processos: `32`"""
+
+SQLITE_BUSY_TIMEOUT: float = 30.0
+"""Segundos de espera por um banco SQLite bloqueado por outra conexão: `30.0`"""
+
+OAUTH_REVOKED_ERROR: str = "invalid_grant"
+"""Erro OAuth do Spotify para refresh token revogado ou inválido: `invalid_grant`"""
+
+CHECKPOINT_STORE_PATH: Path = Path("./archive/checkpoints.sqlite3")
+"""Caminho do banco SQLite com os checkpoints dos jobs: `./archive/checkpoints.sqlite3`"""
+
+SPOTIFY_PLAYLIST_ITEMS_LIMIT: int = 100
+"""Quantidade máxima de itens por página do endpoint `/playlists/{id}/tracks`: `100`"""
+
+EXPORT_FORMATS: dict[str, str] = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+"""Formatos aceitos na exportação de playlists e seus tipos MIME."""
+
+EXPORT_FIELDS: str = "next,items(added_at,track(uri,name,duration_ms,album(name),artists(name)))"
+"""Campos solicitados ao Spotify em cada página da exportação, para reduzir o payload."""
+
+CREDENTIAL_POOL_ENV: str = "SPOTIPY_CLIENT_POOL"
+"""Variável de ambiente opcional com credenciais extras no formato `id:secret,id:secret`."""
+
+CREDENTIAL_BUDGET_WINDOW: float = 30.0
+"""Janela móvel, em segundos, usada pelo Spotify para o limite de requisições por app: `30.0`"""
+
+CREDENTIAL_WINDOW_BUDGET: int = 150
+"""Estimativa de requisições por credencial dentro da janela antes de preferir outra: `150`"""
+
+CREDENTIAL_STATE_SEPARATOR: str = "."
+"""Separador entre o client ID e o restante do parâmetro `state` do OAuth: `.`"""
+
+TRACING_DEFAULT_SAMPLE_RATE: float = 0.1
+"""Fração dos traces gravados quando a seção `tracing` não define `sample_rate`: `0.1`"""
+
+TRACING_DEFAULT_PATH: Path = Path("./logs/traces.jsonl")
+"""Arquivo JSON Lines padrão dos traces gravados: `./logs/traces.jsonl`"""
+
+COVER_MAX_BYTES: int = 256 * 1024
+"""Tamanho máximo, em bytes, do JPEG em base64 aceito como capa pelo Spotify: `262144`"""
+
+COVER_SIZES: tuple[int, ...] = (640, 480, 320)
+"""Lados, em pixels, tentados ao codificar a capa, do maior para o menor: `(640, 480, 320)`"""
+
+COVER_JPEG_QUALITIES: tuple[int, ...] = (85, 75, 60, 45)
+"""Qualidades JPEG tentadas em cada tamanho até a capa caber no limite: `(85, 75, 60, 45)`"""
+
+COVER_MOSAIC_GRID: int = 2
+"""Quantidade de capas de álbum por lado do mosaico (2 x 2): `2`"""
+
+COVER_PROCESS_WORKERS: int = 2
+"""Quantidade de processos que decodificam, redimensionam e codificam as capas: `2`"""
+
+COVER_THREAD_WORKERS: int = 4
+"""Quantidade de threads que baixam as capas de álbum e enviam as capas geradas: `4`"""
+
+COVER_ART_CACHE_SIZE: int = 256
+"""Quantidade de capas de álbum mantidas em cache (baixadas e decodificadas): `256`"""
+
+TUNNEL_COMMAND: list[str] = ["ssh", "-R", "{domain}", "serveo.net"]
+"""Comando padrão do túnel; `{domain}` recebe o `serveo.domain` do settings.yaml."""
+
+TUNNEL_PROBE_INTERVAL: float = 15.0
+"""Intervalo, em segundos, entre as verificações de saúde do túnel: `15.0`"""
+
+TUNNEL_PROBE_TIMEOUT: float = 5.0
+"""Timeout, em segundos, da requisição de verificação de saúde do túnel: `5.0`"""
+
+TUNNEL_PROBE_FAILURES: int = 3
+"""Quantidade de verificações seguidas com falha que reinicia o túnel: `3`"""
+
+TUNNEL_BACKOFF_INITIAL: float = 1.0
+"""Espera, em segundos, antes do primeiro reinício do túnel, dobrada a cada falha: `1.0`"""
+
+TUNNEL_BACKOFF_MAX: float = 60.0
+"""Espera máxima, em segundos, entre reinícios do túnel: `60.0`"""
+
+TUNNEL_STOP_TIMEOUT: float = 5.0
+"""Tempo, em segundos, aguardado após `terminate` antes de forçar o fim do túnel: `5.0`"""
+
+HEALTH_ROUTE: str = "/healthz"
+"""Rota de verificação de saúde do app, usada pelo supervisor do túnel: `/healthz`"""
+
+REQUEST_LOG_MESSAGE: str = (
+    "Requisição {method} {path} concluída: status={status} duracao_ms={ms:.1f}"
+)
+"""Mensagem de log ao fim de cada requisição, usada no cálculo de latência dos logs."""
+
+LOG_ANALYTICS_TOP: int = 15
+"""Quantidade de módulos e modelos de mensagem exibidos no relatório de logs: `15`"""
@@ -2,9 +2,9 @@
 
 import json
 from pathlib import Path
+import sys
 import time
 from typing import Any
-import winsound
 
 import yaml
 
@@ -50,12 +50,22 @@ class SettingsManager(BaseClass):
             self.separator_line()
             echo(f"Tempo de execução: {round(time.time() - self.timer, 2)} segundos.", "info")
             if beep:
-                # winsound.Beep(400, 10)
-                winsound.MessageBeep()
+                self._beep()
         except SettingsManagerError:
             echo("Erro inesperado ao calcular o tempo de execução.", "error")
             raise
 
+    @staticmethod
+    def _beep() -> None:
+        """Emite um aviso sonoro: `winsound` no Windows, caractere de alerta nos demais."""
+        if sys.platform == "win32":
+            import winsound  # noqa: PLC0415
+
+            # winsound.Beep(400, 10)
+            winsound.MessageBeep()
+        else:
+            print("\a", end="", flush=True)
+
     def _load_yaml(self, file_path: PathLike, key: str | None = None) -> dict[str, Any]:
         """Carrega um dicionário a partir de um arquivo YAML."""
         try:
@@ -0,0 +1,183 @@
+"""Checkpoints duráveis, em SQLite, de operações longas de escrita em playlists."""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+import json
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import CHECKPOINT_STORE_PATH
+from src.config.constypes import PathLike
+from src.infrastructure.logger import LoggerSingleton
+from src.infrastructure.sqlite_connection import sqlite_connection
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    user_id TEXT,
+    playlist_id TEXT NOT NULL,
+    playlist_url TEXT,
+    snapshot_id TEXT,
+    track_uris TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    committed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batches (
+    job_id TEXT NOT NULL REFERENCES jobs(job_id),
+    start INTEGER NOT NULL,
+    stop INTEGER NOT NULL,
+    snapshot_id TEXT,
+    committed_at REAL NOT NULL,
+    PRIMARY KEY (job_id, start)
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs(user_id) WHERE committed < total;
+"""
+"""Esquema dos jobs (estado atual) e do diário de lotes confirmados (somente inserção)."""
+
+
+@dataclass(slots=True, frozen=True)
+class PlaylistJob:
+    """Estado de um job de inserção de faixas no último lote confirmado."""
+
+    job_id: str
+    """Identificador do job (ex: o ID da importação)."""
+
+    user_id: str | None
+    """ID do usuário dono da playlist."""
+
+    playlist_id: str
+    """ID da playlist de destino, gravado antes do primeiro lote."""
+
+    playlist_url: str | None
+    """URL pública da playlist."""
+
+    snapshot_id: str | None
+    """`snapshot_id` retornado pelo Spotify no último lote confirmado."""
+
+    track_uris: list[str]
+    """Todas as URIs do job, na ordem de inserção."""
+
+    committed: int
+    """Quantidade de faixas já confirmadas na playlist."""
+
+    @property
+    def total(self) -> int:
+        """Retorna a quantidade total de faixas do job."""
+        return len(self.track_uris)
+
+    @property
+    def done(self) -> bool:
+        """Indica se todas as faixas já foram confirmadas."""
+        return self.committed >= self.total
+
+
+class CheckpointStore(BaseClass):
+    """Persiste o progresso de jobs de playlist para retomá-los após falhas sem refazer lotes."""
+
+    def __init__(self, path: PathLike = CHECKPOINT_STORE_PATH) -> None:
+        """Abre (ou cria) o banco de checkpoints no caminho informado."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.path = self._ensure_path(path)
+        with sqlite_connection(self.path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        self.logger.info(f"CheckpointStore inicializado em {self.path}")
+
+    def start(
+        self,
+        job_id: str,
+        user_id: str | None,
+        playlist: dict[str, Any],
+        track_uris: list[str],
+    ) -> PlaylistJob:
+        """Registra um novo job logo após a criação da playlist, ou retorna o já existente."""
+        now = time.time()
+        with sqlite_connection(self.path) as connection:
+            connection.execute(
+                """
+                INSERT OR IGNORE INTO jobs (job_id, user_id, playlist_id, playlist_url,
+                                            snapshot_id, track_uris, total, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job_id,
+                    user_id,
+                    playlist["id"],
+                    playlist.get("external_urls", {}).get("spotify"),
+                    playlist.get("snapshot_id"),
+                    json.dumps(track_uris),
+                    len(track_uris),
+                    now,
+                    now,
+                ),
+            )
+        self.logger.info(f"Job {job_id} registrado para a playlist {playlist['id']}.")
+        job = self.get(job_id)
+        if job is None or job.playlist_id != playlist["id"]:
+            msg = f"Job {job_id} já registrado para outra playlist."
+            raise ValueError(msg)
+        return job
+
+    def get(self, job_id: str) -> PlaylistJob | None:
+        """Retorna o estado do job, ou None se ele não existir."""
+        with sqlite_connection(self.path) as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def commit_batch(self, job: PlaylistJob, stop: int, snapshot_id: str | None) -> PlaylistJob:
+        """Confirma as faixas até `stop` e registra o lote no diário em uma única transação."""
+        now = time.time()
+        with sqlite_connection(self.path) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO batches VALUES (?, ?, ?, ?, ?)",
+                (job.job_id, job.committed, stop, snapshot_id, now),
+            )
+            # `MAX` mantém o progresso monotônico mesmo se um lote antigo for reconfirmado.
+            connection.execute(
+                """
+                UPDATE jobs SET committed = MAX(committed, ?), snapshot_id = ?, updated_at = ?
+                WHERE job_id = ?
+                """,
+                (stop, snapshot_id, now, job.job_id),
+            )
+        self.logger.debug(f"Job {job.job_id}: {stop}/{job.total} faixas confirmadas.")
+        return replace(job, snapshot_id=snapshot_id, committed=max(job.committed, stop))
+
+    def delete(self, job_id: str) -> None:
+        """Remove o job e seu diário de lotes, após a conclusão."""
+        with sqlite_connection(self.path) as connection:
+            connection.execute("DELETE FROM batches WHERE job_id = ?", (job_id,))
+            connection.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        self.logger.debug(f"Checkpoint do job {job_id} removido.")
+
+    def iter_pending(self, user_id: str | None = None) -> Iterator[PlaylistJob]:
+        """Itera sobre os jobs não concluídos, opcionalmente de um único usuário."""
+        query = "SELECT * FROM jobs WHERE committed < total"
+        params: tuple[str, ...] = ()
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params = (user_id,)
+        with sqlite_connection(self.path) as connection:
+            rows = connection.execute(f"{query} ORDER BY created_at", params).fetchall()
+        for row in rows:
+            yield self._to_job(row)
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> PlaylistJob:
+        """Converte uma linha da tabela `jobs` em `PlaylistJob`."""
+        return PlaylistJob(
+            row["job_id"],
+            row["user_id"],
+            row["playlist_id"],
+            row["playlist_url"],
+            row["snapshot_id"],
+            json.loads(row["track_uris"]),
+            row["committed"],
+        )
@@ -0,0 +1,264 @@
+"""Pool de credenciais do Spotify para distribuir o limite de requisições entre vários apps."""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import requests
+import spotipy
+from spotipy.cache_handler import MemoryCacheHandler
+from spotipy.exceptions import SpotifyException
+from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOAuth
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import (
+    CREDENTIAL_BUDGET_WINDOW,
+    CREDENTIAL_STATE_SEPARATOR,
+    CREDENTIAL_WINDOW_BUDGET,
+)
+from src.infrastructure.logger import LoggerSingleton
+from src.infrastructure.resilience import DeadlineSession, build_spotify_client, retry_after
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+_HTTP_TOO_MANY_REQUESTS = 429
+"""Status HTTP de limite de requisições excedido."""
+
+_current_credential: ContextVar["Credential | None"] = ContextVar(
+    "current_credential", default=None
+)
+"""Credencial que autorizou o usuário da requisição ou job em andamento."""
+
+
+@contextmanager
+def credential_scope(credential: "Credential") -> Iterator[None]:
+    """Define a credencial do usuário atual para os clientes criados dentro do bloco."""
+    token = _current_credential.set(credential)
+    try:
+        yield
+    finally:
+        _current_credential.reset(token)
+
+
+@dataclass(slots=True)
+class CredentialMetrics:
+    """Contadores de uso de uma credencial."""
+
+    requests: int = 0
+    """Quantidade de respostas HTTP recebidas."""
+
+    throttled: int = 0
+    """Quantidade de respostas 429 recebidas."""
+
+    errors: int = 0
+    """Quantidade de respostas 5xx recebidas."""
+
+    users: int = 0
+    """Quantidade de logins iniciados com a credencial."""
+
+
+class Credential:
+    """Credencial (client ID e secret) de um app do Spotify, com orçamento e métricas próprios."""
+
+    def __init__(self, oauth_config: dict[str, str], window: float, budget: int) -> None:
+        """Inicializa o OAuth do usuário, o cliente de aplicação e o controle de orçamento."""
+        self.client_id = oauth_config["client_id"]
+        self.oauth_config = oauth_config
+        self.window = window
+        self.budget = budget
+        self.metrics = CredentialMetrics()
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        self._recent: deque[float] = deque()
+        self._lock = threading.Lock()
+        self.oauth = SpotifyOAuth(
+            **oauth_config, cache_handler=MemoryCacheHandler(), requests_session=DeadlineSession()
+        )
+        self.app_client = build_spotify_client(
+            session=self.session(),
+            auth_manager=SpotifyClientCredentials(
+                client_id=oauth_config["client_id"],
+                client_secret=oauth_config["client_secret"],
+                cache_handler=MemoryCacheHandler(),
+                requests_session=DeadlineSession(),
+            ),
+        )
+
+    @property
+    def label(self) -> str:
+        """Retorna um identificador curto da credencial, seguro para logs."""
+        return f"{self.client_id[:6]}…"
+
+    def session(self) -> requests.Session:
+        """Cria uma sessão HTTP que registra cada resposta nas métricas da credencial."""
+        session = DeadlineSession()
+        session.hooks["response"].append(self._record_response)
+        return session
+
+    def begin(self) -> None:
+        """Reserva orçamento para uma chamada em andamento."""
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self) -> None:
+        """Libera a reserva feita por `begin`."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def remaining(self, now: float) -> float:
+        """Estima quantas requisições ainda cabem na janela atual (negativo se bloqueada)."""
+        if now < self.blocked_until:
+            return float("-inf")
+        with self._lock:
+            self._expire(now)
+            return self.budget - len(self._recent) - self.in_flight
+
+    def snapshot(self) -> dict[str, Any]:
+        """Retorna as métricas atuais da credencial."""
+        now = time.monotonic()
+        return {
+            "credential": self.label,
+            "requests": self.metrics.requests,
+            "throttled": self.metrics.throttled,
+            "errors": self.metrics.errors,
+            "users": self.metrics.users,
+            "remaining": max(self.remaining(now), 0),
+            "blocked_for": round(max(self.blocked_until - now, 0.0), 1),
+        }
+
+    def _record_response(self, response: requests.Response, *_: Any, **__: Any) -> None:
+        """Registra a resposta na janela de orçamento e nos contadores."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._recent.append(now)
+            self.metrics.requests += 1
+            if response.status_code == _HTTP_TOO_MANY_REQUESTS:
+                self.metrics.throttled += 1
+                delay = retry_after(response) or self.window
+                self.blocked_until = max(self.blocked_until, now + delay)
+            elif response.status_code >= 500:  # noqa: PLR2004
+                self.metrics.errors += 1
+
+    def _expire(self, now: float) -> None:
+        """Descarta as requisições fora da janela (com o lock adquirido)."""
+        while self._recent and self._recent[0] <= now - self.window:
+            self._recent.popleft()
+
+
+class CredentialPool(BaseClass):
+    """Distribui logins e chamadas de aplicação entre credenciais pelo orçamento restante."""
+
+    def __init__(
+        self,
+        oauth_configs: list[dict[str, str]],
+        window: float = CREDENTIAL_BUDGET_WINDOW,
+        budget: int = CREDENTIAL_WINDOW_BUDGET,
+    ) -> None:
+        """Inicializa uma credencial por configuração; a primeira é a principal."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        if not oauth_configs:
+            msg = "O pool de credenciais precisa de ao menos uma credencial."
+            raise ValueError(msg)
+        self.credentials = [Credential(config, window, budget) for config in oauth_configs]
+        self._by_client_id = {credential.client_id: credential for credential in self.credentials}
+        self._lock = threading.Lock()
+        self._turn = 0
+        self.logger.info(f"CredentialPool inicializado com {len(self.credentials)} credenciais.")
+
+    @property
+    def primary(self) -> Credential:
+        """Retorna a credencial principal (`SPOTIPY_CLIENT_ID`)."""
+        return self.credentials[0]
+
+    def get(self, client_id: str | None) -> Credential:
+        """Retorna a credencial do client ID, ou a principal se ele for desconhecido."""
+        return self._by_client_id.get(client_id or "", self.primary)
+
+    def choose(self, exclude: frozenset[str] = frozenset()) -> Credential:
+        """Escolhe a credencial com maior orçamento restante, alternando em caso de empate."""
+        now = time.monotonic()
+        with self._lock:
+            self._turn += 1
+            candidates = [c for c in self.credentials if c.client_id not in exclude]
+            count = len(candidates)
+            rotated = candidates[self._turn % count :] + candidates[: self._turn % count]
+            return max(rotated, key=lambda credential: credential.remaining(now))
+
+    def encode_state(self, credential: Credential, state: str | None) -> str:
+        """Inclui no `state` do OAuth a credencial que autoriza o novo usuário."""
+        return f"{credential.client_id}{CREDENTIAL_STATE_SEPARATOR}{state or ''}"
+
+    def decode_state(self, state: str) -> tuple[Credential, str]:
+        """Separa a credencial e o restante do `state` recebido no callback."""
+        client_id, separator, rest = state.partition(CREDENTIAL_STATE_SEPARATOR)
+        if separator and client_id in self._by_client_id:
+            return self._by_client_id[client_id], rest
+        return self.primary, state
+
+    def login_url(self, state: str | None = None) -> str:
+        """Retorna a URL de autorização usando a credencial com mais orçamento."""
+        credential = self.choose()
+        credential.metrics.users += 1
+        self.logger.info(f"Login atribuído à credencial {credential.label}.")
+        return credential.oauth.get_authorize_url(state=self.encode_state(credential, state))
+
+    def user_client(
+        self, access_token: str, credential: Credential | None = None
+    ) -> spotipy.Spotify:
+        """Cria o cliente do usuário, contabilizado na credencial que o autorizou."""
+        credential = credential or _current_credential.get() or self.primary
+        return build_spotify_client(session=credential.session(), auth=access_token)
+
+    def app_client(self) -> "PooledSpotifyClient":
+        """Retorna um cliente de aplicação que distribui cada chamada entre as credenciais."""
+        return PooledSpotifyClient(self)
+
+    def app_call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Executa um método do spotipy na melhor credencial, trocando de credencial após 429."""
+        tried: set[str] = set()
+        while True:
+            credential = self.choose(frozenset(tried))
+            tried.add(credential.client_id)
+            credential.begin()
+            try:
+                return getattr(credential.app_client, method)(*args, **kwargs)
+            except SpotifyException as error:
+                if error.http_status != _HTTP_TOO_MANY_REQUESTS or len(tried) == len(
+                    self.credentials
+                ):
+                    raise
+                self.logger.warning(
+                    f"Credencial {credential.label} limitada em '{method}'. Tentando outra."
+                )
+            finally:
+                credential.end()
+
+    def oauth_configs(self) -> list[dict[str, str]]:
+        """Retorna as configurações OAuth de todas as credenciais, na ordem do pool."""
+        return [credential.oauth_config for credential in self.credentials]
+
+    def metrics(self) -> list[dict[str, Any]]:
+        """Retorna as métricas de uso e de limitação de cada credencial."""
+        return [credential.snapshot() for credential in self.credentials]
+
+
+class PooledSpotifyClient:
+    """Fachada com a interface do `spotipy.Spotify` que distribui as chamadas pelo pool."""
+
+    def __init__(self, pool: CredentialPool) -> None:
+        """Inicializa a fachada sobre o pool informado."""
+        self._pool = pool
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        """Retorna o método do spotipy executado na credencial com mais orçamento."""
+        if not callable(getattr(spotipy.Spotify, name, None)) or name.startswith("_"):
+            raise AttributeError(name)
+        return partial(self._pool.app_call, name)
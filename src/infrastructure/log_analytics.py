@@ -0,0 +1,333 @@
+"""Análise rápida dos logs da aplicação por intervalo de tempo, com arquivos mapeados em memória.
+
+Execute a partir da raiz do projeto: `python -m src.infrastructure.log_analytics --last 1h`.
+
+Cada arquivo é mapeado com `mmap`, e o início e o fim do intervalo são localizados por busca
+binária no prefixo `%Y-%m-%d %H:%M:%S` das linhas. Apenas o trecho encontrado é lido.
+"""
+
+import argparse
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import gzip
+import math
+import mmap
+from pathlib import Path
+import re
+import time
+
+import yaml
+
+from src.config.constants import (
+    LOG_ANALYTICS_TOP,
+    LOG_DATE_FORMAT,
+    REQUEST_LOG_MESSAGE,
+    SETTINGS_FILE,
+)
+
+_TIMESTAMP_LENGTH = len(time.strftime(LOG_DATE_FORMAT, time.gmtime(0)))
+"""Quantidade de bytes do prefixo de data e hora das linhas de log."""
+
+_RECORD = re.compile(rb"(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) - (\w+):(\d+) - ([A-Z]+) - ([^\r\n]*)")
+"""Início de um registro no formato `LOG_FORMAT`; linhas sem ele continuam o anterior."""
+
+_REQUEST = re.compile(
+    re.escape(REQUEST_LOG_MESSAGE.split("{", 1)[0])
+    + r"(?P<method>\S+) (?P<path>.+?) concluída: status=(?P<status>\d+) "
+    r"duracao_ms=(?P<ms>[\d.]+)"
+)
+"""Mensagem de fim de requisição registrada pelo app (`REQUEST_LOG_MESSAGE`)."""
+
+_PLACEHOLDERS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"https?://\S+"), "<url>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\b[0-9A-Za-z]{22}\b"), "<id>"),
+    (re.compile(r"\b[0-9a-f]{8,}\b"), "<hex>"),
+    (re.compile(r"\d+(?:[.,]\d+)?"), "<n>"),
+)
+"""Trechos variáveis das mensagens substituídos para agrupá-las por modelo."""
+
+_DURATION_UNITS: dict[str, int] = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+"""Segundos por unidade aceita em `--last` (ex: `30m`, `1h`, `2d`)."""
+
+
+@dataclass(slots=True, frozen=True)
+class LogEntry:
+    """Registro de log já separado nos campos do `LOG_FORMAT`."""
+
+    timestamp: str
+    """Data e hora do registro no formato `LOG_DATE_FORMAT`."""
+
+    module: str
+    """Módulo que emitiu o registro."""
+
+    lineno: int
+    """Linha do código que emitiu o registro."""
+
+    level: str
+    """Nível do registro (ex: `INFO`)."""
+
+    message: str
+    """Primeira linha da mensagem."""
+
+
+def message_template(message: str) -> str:
+    """Substitui URLs, textos entre aspas, IDs e números da mensagem por marcadores."""
+    for pattern, placeholder in _PLACEHOLDERS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def log_files(path: Path) -> list[tuple[str, Path]]:
+    """Retorna o log e os rotacionados (`app.log.1`, `.2025-01-01`, `.gz`) com o 1º registro."""
+    files = [candidate for candidate in path.parent.glob(f"{path.name}.*") if candidate.is_file()]
+    if path.is_file():
+        files.append(path)
+    # A ordem cronológica vem do primeiro registro de cada arquivo, não do nome.
+    return sorted((first, file) for file in files if (first := _first_timestamp(file)) is not None)
+
+
+def iter_entries(
+    path: Path, since: str | None = None, until: str | None = None
+) -> Iterator[LogEntry]:
+    """Itera sobre os registros com data e hora em `[since, until)` de um arquivo de log."""
+    if path.suffix == ".gz":
+        yield from _iter_compressed(path, since, until)
+        return
+    if path.stat().st_size == 0:
+        return
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        size = len(mapped)
+        start = _lower_bound(mapped, since.encode("ascii"), size) if since else 0
+        end = _lower_bound(mapped, until.encode("ascii"), size) if until else size
+        mapped.seek(start)
+        while mapped.tell() < end:
+            entry = _parse(mapped.readline())
+            if entry is not None:
+                yield entry
+
+
+def _parse(line: bytes) -> LogEntry | None:
+    """Separa os campos de uma linha de log; retorna None para linhas de continuação."""
+    match = _RECORD.match(line)
+    if match is None:
+        return None
+    timestamp, module, lineno, level, message = match.groups()
+    return LogEntry(
+        timestamp.decode("ascii"),
+        module.decode("ascii"),
+        int(lineno),
+        level.decode("ascii"),
+        message.decode("utf-8", "replace"),
+    )
+
+
+def _record_start(mapped: mmap.mmap, position: int, size: int) -> int:
+    """Retorna o início do primeiro registro na posição informada ou depois dela."""
+    if position > 0:
+        newline = mapped.find(b"\n", position - 1, size)
+        position = size if newline == -1 else newline + 1
+    # Linhas de traceback não começam com data e hora e pertencem ao registro anterior.
+    while position < size and _RECORD.match(mapped, position) is None:
+        newline = mapped.find(b"\n", position, size)
+        position = size if newline == -1 else newline + 1
+    return position
+
+
+def _lower_bound(mapped: mmap.mmap, key: bytes, size: int) -> int:
+    """Busca binária do primeiro registro com data e hora maior ou igual a `key`."""
+    low, high = 0, size
+    while low < high:
+        middle = (low + high) // 2
+        start = _record_start(mapped, middle, size)
+        if start >= size or mapped[start : start + _TIMESTAMP_LENGTH] >= key:
+            high = middle
+        else:
+            low = middle + 1
+    return _record_start(mapped, low, size)
+
+
+def _iter_compressed(path: Path, since: str | None, until: str | None) -> Iterator[LogEntry]:
+    """Itera sobre um log rotacionado comprimido, que não pode ser mapeado nem buscado."""
+    with gzip.open(path, "rb") as file:
+        for line in file:
+            entry = _parse(line)
+            if entry is None or (since and entry.timestamp < since):
+                continue
+            if until and entry.timestamp >= until:
+                return
+            yield entry
+
+
+def _first_timestamp(path: Path) -> str | None:
+    """Retorna a data e hora do primeiro registro do arquivo."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    try:
+        with opener(path, "rb") as file:
+            for line in file:
+                match = _RECORD.match(line)
+                if match is not None:
+                    return match.group(1).decode("ascii")
+    except (OSError, EOFError):
+        return None
+    return None
+
+
+@dataclass(slots=True)
+class LogReport:
+    """Contagens por nível, módulo e modelo de mensagem, e latências por rota."""
+
+    entries: int = 0
+    """Quantidade de registros analisados."""
+
+    first: str | None = None
+    """Data e hora do primeiro registro analisado."""
+
+    last: str | None = None
+    """Data e hora do último registro analisado."""
+
+    levels: Counter[str] = field(default_factory=Counter)
+    """Registros por nível."""
+
+    modules: Counter[tuple[str, str]] = field(default_factory=Counter)
+    """Registros por módulo e nível."""
+
+    templates: Counter[tuple[str, str, int]] = field(default_factory=Counter)
+    """Registros por nível e ponto de emissão (módulo e linha), que definem o modelo."""
+
+    examples: dict[tuple[str, str, int], str] = field(default_factory=dict)
+    """Modelo de mensagem de cada ponto de emissão, gerado a partir do primeiro registro."""
+
+    latencies: defaultdict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    """Durações, em milissegundos, por método e rota (com IDs substituídos)."""
+
+    statuses: Counter[tuple[str, str]] = field(default_factory=Counter)
+    """Requisições por método e rota e classe de status (ex: `5xx`)."""
+
+    def add(self, entry: LogEntry) -> None:
+        """Contabiliza um registro no relatório."""
+        self.entries += 1
+        self.first = self.first or entry.timestamp
+        self.last = entry.timestamp
+        self.levels[entry.level] += 1
+        self.modules[entry.module, entry.level] += 1
+        key = (entry.level, entry.module, entry.lineno)
+        self.templates[key] += 1
+        # Um ponto de emissão produz sempre o mesmo modelo: só o primeiro registro é normalizado.
+        if key not in self.examples:
+            self.examples[key] = message_template(entry.message)
+        request = _REQUEST.match(entry.message)
+        if request is not None:
+            route = f"{request['method']} {message_template(request['path'])}"
+            self.latencies[route].append(float(request["ms"]))
+            self.statuses[route, f"{request['status'][0]}xx"] += 1
+
+    def render(self, top: int = LOG_ANALYTICS_TOP) -> str:
+        """Formata o relatório em texto para o terminal."""
+        lines = [f"Registros: {self.entries} ({self.first or '-'} até {self.last or '-'})", ""]
+        lines.append("Por nível:")
+        lines.extend(f"  {level:<8} {count:>10}" for level, count in self.levels.most_common())
+        lines.extend(["", "Por módulo:"])
+        lines.extend(
+            f"  {module:<24} {level:<8} {count:>10}"
+            for (module, level), count in self.modules.most_common(top)
+        )
+        lines.extend(["", "Por modelo de mensagem:"])
+        for key, count in self.templates.most_common(top):
+            level, module, lineno = key
+            origin = f"{module}:{lineno:03d}"
+            lines.append(f"  {count:>10}  {level:<8} {origin:<28} {self.examples[key][:120]}")
+        if self.latencies:
+            lines.extend(["", "Latência por rota (ms):"])
+            lines.append(
+                f"  {'rota':<40} {'n':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'máx':>9} status"
+            )
+            for route, durations in sorted(self.latencies.items(), key=lambda item: -len(item[1])):
+                durations.sort()
+                statuses = ", ".join(
+                    f"{status}={count}"
+                    for (name, status), count in sorted(self.statuses.items())
+                    if name == route
+                )
+                lines.append(
+                    f"  {route[:40]:<40} {len(durations):>7} {_percentile(durations, 50):>9.1f} "
+                    f"{_percentile(durations, 95):>9.1f} {_percentile(durations, 99):>9.1f} "
+                    f"{durations[-1]:>9.1f} {statuses}"
+                )
+        return "\n".join(lines)
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    """Retorna o percentil (método nearest-rank) de uma lista ordenada."""
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def analyze(path: Path, since: datetime | None = None, until: datetime | None = None) -> LogReport:
+    """Analisa o log e os arquivos rotacionados no intervalo `[since, until]`."""
+    since_key = since.strftime(LOG_DATE_FORMAT) if since else None
+    # O fim é inclusivo na precisão de segundos do log.
+    until_key = (until + timedelta(seconds=1)).strftime(LOG_DATE_FORMAT) if until else None
+    report = LogReport()
+    files = log_files(path)
+    for index, (first, file) in enumerate(files):
+        # Os registros de um arquivo terminam antes do primeiro registro do arquivo seguinte.
+        following = files[index + 1][0] if index + 1 < len(files) else None
+        if (since_key and following and following < since_key) or (
+            until_key and first >= until_key
+        ):
+            continue
+        for entry in iter_entries(file, since_key, until_key):
+            report.add(entry)
+    return report
+
+
+def _default_log_path() -> Path:
+    """Retorna o arquivo de log configurado em `logger.file.path` no settings.yaml."""
+    with SETTINGS_FILE.open("r", encoding="utf-8") as file:
+        settings = yaml.safe_load(file)
+    return Path(settings["logger"]["file"]["path"])
+
+
+def _parse_time(value: str) -> datetime:
+    """Converte data e hora no formato do log (ou só a data) para `datetime`."""
+    for date_format in (LOG_DATE_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, date_format)  # noqa: DTZ007
+        except ValueError:
+            continue
+    msg = f"Data inválida: '{value}'. Use o formato '{LOG_DATE_FORMAT}'."
+    raise argparse.ArgumentTypeError(msg)
+
+
+def _parse_duration(value: str) -> timedelta:
+    """Converte uma duração como `30m`, `1h` ou `2d` para `timedelta`."""
+    unit = value[-1:].lower()
+    if unit not in _DURATION_UNITS or not value[:-1].isdigit():
+        msg = f"Duração inválida: '{value}'. Use um número seguido de s, m, h ou d."
+        raise argparse.ArgumentTypeError(msg)
+    return timedelta(seconds=int(value[:-1]) * _DURATION_UNITS[unit])
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", type=Path, default=None, help="arquivo de log (padrão: settings)")
+    window = parser.add_mutually_exclusive_group()
+    window.add_argument("--since", type=_parse_time, help="início (AAAA-MM-DD HH:MM:SS)")
+    window.add_argument("--last", type=_parse_duration, help="janela até agora (ex: 1h)")
+    parser.add_argument("--until", type=_parse_time, help="fim, inclusivo (AAAA-MM-DD HH:MM:SS)")
+    parser.add_argument("--top", type=int, default=LOG_ANALYTICS_TOP, help="itens por seção")
+    args = parser.parse_args()
+
+    # O log é gravado no horário local, sem fuso, assim como `datetime.now()`.
+    since = datetime.now() - args.last if args.last else args.since  # noqa: DTZ005
+    started = time.perf_counter()
+    report = analyze(args.log or _default_log_path(), since, args.until)
+    print(report.render(args.top))
+    print(f"\nAnálise concluída em {time.perf_counter() - started:.3f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ import yaml
 from src.common.base.base_class import BaseClass
 from src.common.echo import echo
 from src.common.errors.errors import LoggerError
-from src.config.constants import SETTINGS_FILE
+from src.config.constants import LOG_DATE_FORMAT, LOG_FORMAT, SETTINGS_FILE
 from src.config.constypes import LoggerDict, PathLike
 
 
@@ -167,10 +167,7 @@ class LoggerSingleton(BaseClass):
         root_logger.setLevel(getattr(logging, self.console_level, logging.INFO))
 
         # Configura o formato padrão
-        formatter = logging.Formatter(
-            fmt="%(asctime)s - %(module)s:%(lineno)03d - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
+        formatter = logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
 
         # Handler de console
         console_handler = logging.StreamHandler()
@@ -0,0 +1,413 @@
+"""Camada de resiliência para chamadas ao Spotify: circuit breaker, retries, hedging e deadlines."""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import requests
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+import spotipy
+from spotipy.exceptions import SpotifyException
+from spotipy.oauth2 import SpotifyOauthError
+
+from src.common.base.base_class import BaseClass
+from src.common.errors.errors import CircuitOpenError, DeadlineExceededError
+from src.config.constants import (
+    RESILIENCE_BASE_DELAY,
+    RESILIENCE_BREAKER_FAILURE_THRESHOLD,
+    RESILIENCE_BREAKER_RESET_TIMEOUT,
+    RESILIENCE_HEDGE_MAX_WORKERS,
+    RESILIENCE_HEDGE_MIN_SAMPLES,
+    RESILIENCE_LATENCY_WINDOW,
+    RESILIENCE_MAX_ATTEMPTS,
+    RESILIENCE_MAX_DELAY,
+    SPOTIFY_REQUEST_TIMEOUT,
+)
+from src.infrastructure.logger import LoggerSingleton
+from src.infrastructure.tracing import TracedSession, tracer
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+"""Instante (em `time.monotonic()`) em que a requisição de entrada expira."""
+
+_HTTP_TOO_MANY_REQUESTS: int = 429
+"""Status HTTP de limite de requisições excedido."""
+
+_HTTP_SERVER_ERROR: int = 500
+"""Menor status HTTP de erro do servidor."""
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[None]:
+    """Define o prazo da requisição atual, sem estender um prazo mais curto já existente."""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """Retorna os segundos restantes até o prazo da requisição atual, ou None sem prazo."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def request_timeout(default: float = SPOTIFY_REQUEST_TIMEOUT) -> float:
+    """Retorna o timeout de uma chamada HTTP limitado pelo prazo restante da requisição."""
+    remaining = remaining_time()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceededError("Prazo da requisição esgotado antes da chamada.")
+    return min(default, remaining)
+
+
+class DeadlineSession(TracedSession):
+    """Sessão HTTP que limita o timeout de cada requisição ao prazo restante no momento dela."""
+
+    def request(self, method: str | bytes, url: str | bytes, *args: Any, **kwargs: Any) -> Any:
+        """Executa a requisição com o timeout limitado pelo prazo da requisição de entrada."""
+        kwargs["timeout"] = request_timeout(kwargs.get("timeout") or SPOTIFY_REQUEST_TIMEOUT)
+        return super().request(method, url, *args, **kwargs)
+
+
+def build_spotify_client(session: requests.Session | None = None, **kwargs: Any) -> spotipy.Spotify:
+    """Cria um cliente spotipy sem retries internos, delegando-os ao `ResilientCaller`."""
+    # Uma sessão própria evita o adaptador de retries do spotipy, que dorme no `Retry-After`
+    # e converte qualquer status esgotado em 429. O prazo é aplicado por requisição pela
+    # `DeadlineSession`, pois clientes de longa duração são criados fora de qualquer prazo.
+    return spotipy.Spotify(
+        requests_session=session or DeadlineSession(),
+        requests_timeout=SPOTIFY_REQUEST_TIMEOUT,
+        **kwargs,
+    )
+
+
+def _http_status(error: BaseException) -> int | None:
+    """Extrai o status HTTP de exceções do spotipy ou do requests."""
+    if isinstance(error, SpotifyException):
+        return error.http_status
+    response = getattr(error, "response", None)
+    if response is None and isinstance(error, SpotifyOauthError):
+        # O spotipy converte o `HTTPError` do endpoint de token, mantido como contexto.
+        response = getattr(error.__context__, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def retry_after(error: BaseException | requests.Response) -> float | None:
+    """Extrai o cabeçalho `Retry-After` de uma resposta 429 (ou do erro), se presente."""
+    headers = getattr(error, "headers", None) or getattr(
+        getattr(error, "response", None), "headers", None
+    )
+    if not headers or "Retry-After" not in headers:
+        return None
+    try:
+        return float(headers["Retry-After"])
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Circuit breaker por endpoint com estados fechado, aberto e meio-aberto."""
+
+    def __init__(
+        self,
+        failure_threshold: int = RESILIENCE_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = RESILIENCE_BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        """Inicializa o circuito fechado com limite de falhas e tempo de reabertura."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Retorna o estado atual do circuito: `closed`, `open` ou `half-open`."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Retorna se uma chamada pode prosseguir, liberando uma única sonda no meio-aberto."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Fecha o circuito após uma chamada bem-sucedida."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """Libera a sonda do meio-aberto sem alterar o estado do circuito."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Contabiliza uma falha e abre o circuito ao atingir o limite."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class LatencyTracker:
+    """Janela deslizante de latências por endpoint para cálculo de percentis."""
+
+    def __init__(self, window: int = RESILIENCE_LATENCY_WINDOW) -> None:
+        """Inicializa a janela de amostras."""
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Registra a latência de uma chamada bem-sucedida."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(
+        self, fraction: float, min_samples: int = RESILIENCE_HEDGE_MIN_SAMPLES
+    ) -> float | None:
+        """Retorna o percentil pedido, ou None se ainda não houver amostras suficientes."""
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class ResilientCaller(BaseClass):
+    """Executa chamadas ao Spotify com circuit breaker, retries com jitter, hedging e prazos."""
+
+    def __init__(
+        self,
+        max_attempts: int = RESILIENCE_MAX_ATTEMPTS,
+        base_delay: float = RESILIENCE_BASE_DELAY,
+        max_delay: float = RESILIENCE_MAX_DELAY,
+        *,
+        hedging: bool = True,
+    ) -> None:
+        """Inicializa a política de retries e o pool de threads para requisições duplicadas."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedging = hedging
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._latencies: dict[str, LatencyTracker] = {}
+        self._registry_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=RESILIENCE_HEDGE_MAX_WORKERS, thread_name_prefix="hedge"
+        )
+        self.logger.info(
+            f"ResilientCaller inicializado: max_attempts={max_attempts}, "
+            f"base_delay={base_delay}s, max_delay={max_delay}s, hedging={hedging}"
+        )
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Retorna (criando se necessário) o circuit breaker do endpoint."""
+        with self._registry_lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker()
+                self._latencies[endpoint] = LatencyTracker()
+            return self._breakers[endpoint]
+
+    def call(
+        self,
+        endpoint: str,
+        func: Callable[..., Any],
+        *args: Any,
+        idempotent: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """Executa `func` aplicando a política de resiliência do endpoint informado.
+
+        Chamadas não idempotentes só são repetidas após respostas 429, em que o Spotify
+        garante que a requisição não foi processada; as idempotentes também são repetidas
+        após erros 5xx e de conexão e podem ser duplicadas (hedging) acima do p95.
+        """
+        with tracer.span(f"spotify {endpoint}", endpoint=endpoint, idempotent=idempotent):
+            return self._call(endpoint, func, args, kwargs, idempotent=idempotent)
+
+    def shutdown(self) -> None:
+        """Encerra o pool de threads usado pelas requisições duplicadas."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(
+        self,
+        endpoint: str,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        *,
+        idempotent: bool,
+    ) -> Any:
+        """Executa as tentativas da chamada com circuit breaker, retries e prazo."""
+        breaker = self.breaker(endpoint)
+        for attempt in range(1, self.max_attempts + 1):
+            self._check_deadline(endpoint)
+            if not breaker.allow():
+                self.logger.warning(f"Circuito aberto para '{endpoint}'. Chamada rejeitada.")
+                msg = f"Circuito aberto para o endpoint '{endpoint}'."
+                raise CircuitOpenError(msg)
+            try:
+                result = self._attempt(endpoint, func, args, kwargs, idempotent=idempotent)
+            except (SpotifyException, RequestsConnectionError, Timeout) as error:
+                status = _http_status(error)
+                if not self._is_retryable(error, status, idempotent=idempotent):
+                    # Um 4xx mostra que o endpoint respondeu: conta como sucesso e libera a sonda.
+                    if status is None or status >= _HTTP_SERVER_ERROR:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt == self.max_attempts:
+                    self.logger.exception(f"Tentativas esgotadas para '{endpoint}'.")
+                    raise
+                delay = self._backoff(attempt, retry_after(error))
+                self.logger.warning(
+                    f"Falha em '{endpoint}' (status={status}, tentativa {attempt}/"
+                    f"{self.max_attempts}). Nova tentativa em {delay:.2f}s."
+                )
+                self._sleep_within_deadline(endpoint, delay)
+            except BaseException as error:
+                self._record_outcome(breaker, error)
+                raise
+            else:
+                breaker.record_success()
+                return result
+        msg = f"Nenhuma tentativa executada para '{endpoint}'."
+        raise DeadlineExceededError(msg)
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, error: BaseException) -> None:
+        """Contabiliza um erro fora da política de retries sem travar a sonda do meio-aberto."""
+        status = _http_status(error)
+        if status is not None and status >= _HTTP_SERVER_ERROR:
+            breaker.record_failure()
+        elif status is not None or isinstance(error, SpotifyOauthError):
+            # Código inválido ou refresh token revogado: o endpoint respondeu normalmente.
+            breaker.record_success()
+        else:
+            # Prazo esgotado ou interrupção não dizem nada sobre a saúde do endpoint.
+            breaker.release()
+
+    def _attempt(
+        self,
+        endpoint: str,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        *,
+        idempotent: bool,
+    ) -> Any:
+        """Executa uma tentativa, duplicando chamadas idempotentes lentas após o p95."""
+        latency = self._latencies[endpoint]
+        hedge_after = latency.percentile(0.95) if self.hedging and idempotent else None
+        started = time.monotonic()
+        if hedge_after is None:
+            result = func(*args, **kwargs)
+            latency.record(time.monotonic() - started)
+            return result
+
+        running = threading.Event()
+
+        def run_primary() -> Any:
+            running.set()
+            return func(*args, **kwargs)
+
+        # Cada tarefa roda em uma cópia do contexto para preservar o prazo da requisição.
+        primary = self._executor.submit(copy_context().run, run_primary)
+        # O p95 conta a partir do início real da chamada: a espera na fila de um pool saturado
+        # não dispara duplicatas, que só aumentariam a carga.
+        if not running.wait(self._bounded(None)):
+            primary.cancel()
+            msg = f"Prazo esgotado aguardando vaga para '{endpoint}'."
+            raise DeadlineExceededError(msg)
+        started = time.monotonic()
+        done, _ = wait([primary], timeout=self._bounded(hedge_after))
+        futures: list[Future] = [primary]
+        if not done:
+            self.logger.info(
+                f"Chamada a '{endpoint}' acima do p95 ({hedge_after:.3f}s). Duplicando."
+            )
+            futures.append(self._executor.submit(copy_context().run, func, *args, **kwargs))
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=self._bounded(None), return_when=FIRST_COMPLETED)
+            if not done:
+                msg = f"Prazo esgotado aguardando '{endpoint}'."
+                raise DeadlineExceededError(msg)
+            for future in done:
+                if future.exception() is None or not pending:
+                    result = future.result()
+                    latency.record(time.monotonic() - started)
+                    return result
+        msg = f"Nenhuma resposta recebida de '{endpoint}'."
+        raise DeadlineExceededError(msg)
+
+    def _is_retryable(self, error: BaseException, status: int | None, *, idempotent: bool) -> bool:
+        """Decide se o erro permite nova tentativa conforme a idempotência da chamada."""
+        if status == _HTTP_TOO_MANY_REQUESTS:
+            return True
+        if not idempotent:
+            return False
+        if isinstance(error, (RequestsConnectionError, Timeout)):
+            return True
+        return status is not None and status >= _HTTP_SERVER_ERROR
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        """Calcula a espera exponencial com jitter completo, respeitando `Retry-After`."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)  # noqa: S311
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def _bounded(self, timeout: float | None) -> float | None:
+        """Limita um timeout ao prazo restante da requisição."""
+        remaining = remaining_time()
+        if remaining is None:
+            return timeout
+        return max(0.0, remaining if timeout is None else min(timeout, remaining))
+
+    def _check_deadline(self, endpoint: str) -> None:
+        """Interrompe a chamada se o prazo da requisição já tiver expirado."""
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            self.logger.warning(f"Prazo esgotado antes de chamar '{endpoint}'.")
+            msg = f"Prazo da requisição esgotado para '{endpoint}'."
+            raise DeadlineExceededError(msg)
+
+    def _sleep_within_deadline(self, endpoint: str, delay: float) -> None:
+        """Aguarda o backoff, desistindo se a espera ultrapassar o prazo da requisição."""
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            self.logger.warning(f"Backoff de {delay:.2f}s excede o prazo de '{endpoint}'.")
+            msg = f"Prazo insuficiente para nova tentativa em '{endpoint}'."
+            raise DeadlineExceededError(msg)
+        time.sleep(delay)
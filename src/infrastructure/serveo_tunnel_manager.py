@@ -1,11 +1,25 @@
 """Funções utilitárias para gerenciamento do túnel SSH Serveo."""
 
+from dataclasses import dataclass
+from http import HTTPStatus
 import subprocess
 import sys
-from typing import TYPE_CHECKING
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import requests
 
 from src.common.base.base_class import BaseClass
-from src.config.constants import SETTINGS_FILE
+from src.config.constants import (
+    TUNNEL_BACKOFF_INITIAL,
+    TUNNEL_BACKOFF_MAX,
+    TUNNEL_COMMAND,
+    TUNNEL_PROBE_FAILURES,
+    TUNNEL_PROBE_INTERVAL,
+    TUNNEL_PROBE_TIMEOUT,
+    TUNNEL_STOP_TIMEOUT,
+)
 from src.config.settings_manager import SettingsManager
 from src.infrastructure.logger import LoggerSingleton
 from src.infrastructure.return_handler import ReturnHandler
@@ -14,39 +28,67 @@ if TYPE_CHECKING:
     from logging import Logger
 
 
+@dataclass(slots=True)
+class TunnelMetrics:
+    """Contadores do túnel supervisionado."""
+
+    restarts: int = 0
+    """Quantidade de reinícios do túnel."""
+
+    probe_failures: int = 0
+    """Quantidade total de verificações de saúde com falha."""
+
+    last_exit_code: int | None = None
+    """Código de saída do último processo encerrado."""
+
+    started_at: float | None = None
+    """Instante (`time.monotonic`) em que o processo atual foi iniciado."""
+
+
 class ServeoTunnelManager(BaseClass):
     """Gerencia o túnel SSH Serveo para redirecionamento de portas."""
 
-    def __init__(self, return_handler: ReturnHandler) -> None:
-        """Inicializa o gerenciador do túnel com logger e handler."""
+    def __init__(
+        self, return_handler: ReturnHandler, settings: dict[str, Any] | None = None
+    ) -> None:
+        """Inicializa o gerenciador do túnel com a seção `serveo` das configurações."""
         self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
         self.logger.info("Inicializando com ReturnHandler.")
-        self.settings = SettingsManager()
-        self.serveo_domain: str = self.settings.settings["serveo"]["domain"]
+        settings = settings if settings is not None else SettingsManager().settings["serveo"]
+        self.serveo_domain: str = settings["domain"]
         self.logger.info(f"Domínio Serveo configurado: {self.serveo_domain}")
         self.handler = return_handler
-        self.ssh_command = [
-            r"C:\Windows\System32\OpenSSH\ssh.exe",
-            "-R",
-            f"{self.serveo_domain}",
-            "serveo.net",
+        self.enabled = bool(settings.get("enabled", False))
+        self.command = [
+            part.format(domain=self.serveo_domain)
+            for part in settings.get("command") or TUNNEL_COMMAND
         ]
-        self.logger.info(f"Comando SSH configurado: {self.ssh_command}")
+        self.logger.info(f"Comando do túnel configurado: {self.command}")
+        self.probe_url: str | None = settings.get("probe_url")
+        self.probe_interval = float(settings.get("probe_interval", TUNNEL_PROBE_INTERVAL))
+        self.probe_timeout = float(settings.get("probe_timeout", TUNNEL_PROBE_TIMEOUT))
+        self.probe_failures = int(settings.get("probe_failures", TUNNEL_PROBE_FAILURES))
+        self.backoff_initial = float(settings.get("backoff_initial", TUNNEL_BACKOFF_INITIAL))
+        self.backoff_max = float(settings.get("backoff_max", TUNNEL_BACKOFF_MAX))
+        self.metrics = TunnelMetrics()
+        self.process: subprocess.Popen | None = None
+        self._stop = threading.Event()
+        self._supervisor: threading.Thread | None = None
 
     def start_tunnel(self) -> subprocess.Popen:
         """Inicia o túnel SSH Serveo em background."""
         self.logger.info("Iniciando túnel SSH Serveo.")
         try:
-            self.logger.info(f"Executando comando: {self.ssh_command}")
+            self.logger.info(f"Executando comando: {self.command}")
             ssh_tunnel_process = subprocess.Popen(
-                self.ssh_command,
+                self.command,
                 stdout=sys.stdout,
                 stderr=sys.stderr,
             )
         except FileNotFoundError:
-            self.logger.exception("Executável SSH não encontrado.")
+            self.logger.exception("Executável do túnel não encontrado.")
             self.handler.exception(
-                message="Executável SSH não encontrado.",
+                message="Executável do túnel não encontrado.",
                 exception=FileNotFoundError,
             )
         except OSError:
@@ -65,10 +107,101 @@ class ServeoTunnelManager(BaseClass):
         if proc.poll() is None:
             proc.terminate()
             try:
-                proc.wait(timeout=5)
+                proc.wait(timeout=TUNNEL_STOP_TIMEOUT)
                 self.logger.info("Túnel SSH Serveo encerrado com sucesso.")
             except subprocess.TimeoutExpired:
                 proc.kill()
+                proc.wait()
                 self.logger.warning("Forçou encerramento do túnel SSH Serveo após timeout.")
         else:
             self.logger.info(f"Processo já finalizado (PID: {proc.pid}).")
+
+    def supervise(self) -> threading.Thread:
+        """Mantém o túnel ativo em uma thread, reiniciando-o com backoff quando cai."""
+        if self._supervisor is not None and self._supervisor.is_alive():
+            return self._supervisor
+        self._stop.clear()
+        self._supervisor = threading.Thread(target=self._supervise, name="tunnel", daemon=True)
+        self._supervisor.start()
+        return self._supervisor
+
+    def stop(self) -> None:
+        """Interrompe a supervisão e encerra o processo do túnel."""
+        self._stop.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+            self._supervisor = None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Retorna o estado do túnel: PID, tempo no ar, reinícios e falhas de verificação."""
+        process = self.process
+        running = process is not None and process.poll() is None
+        started_at = self.metrics.started_at
+        return {
+            "running": running,
+            "pid": process.pid if running else None,
+            "uptime": round(time.monotonic() - started_at, 1) if running and started_at else 0.0,
+            "restarts": self.metrics.restarts,
+            "probe_failures": self.metrics.probe_failures,
+            "last_exit_code": self.metrics.last_exit_code,
+        }
+
+    def _supervise(self) -> None:
+        """Inicia o túnel, monitora-o e o reinicia até `stop` ser chamado."""
+        backoff = self.backoff_initial
+        while not self._stop.is_set():
+            started = time.monotonic()
+            reason = self._run_once()
+            if self._stop.is_set():
+                break
+            # Um túnel que ficou estável por tempo suficiente volta ao backoff inicial.
+            if time.monotonic() - started >= self.backoff_max:
+                backoff = self.backoff_initial
+            self.metrics.restarts += 1
+            self.logger.warning(
+                f"Túnel caiu ({reason}); reinício {self.metrics.restarts} em {backoff:.1f}s."
+            )
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.backoff_max)
+        self.logger.info("Supervisão do túnel encerrada.")
+
+    def _run_once(self) -> str:
+        """Executa um processo do túnel até ele sair, falhar nas verificações ou ser parado."""
+        try:
+            self.process = process = self.start_tunnel()
+        except OSError as error:
+            return f"falha ao iniciar: {error}"
+        self.metrics.started_at = time.monotonic()
+        failures = 0
+        reason = "parado"
+        while not self._stop.wait(self.probe_interval):
+            if process.poll() is not None:
+                reason = f"processo saiu com código {process.returncode}"
+                break
+            if self._probe():
+                failures = 0
+                continue
+            failures += 1
+            self.metrics.probe_failures += 1
+            self.logger.warning(f"Verificação do túnel falhou ({failures}/{self.probe_failures}).")
+            if failures >= self.probe_failures:
+                reason = f"{failures} verificações seguidas com falha"
+                break
+        self.stop_tunnel(process)
+        self.metrics.last_exit_code = process.returncode
+        uptime = time.monotonic() - self.metrics.started_at
+        self.logger.info(f"Túnel ficou no ar por {uptime:.1f}s.")
+        return reason
+
+    def _probe(self) -> bool:
+        """Verifica se o `/healthz` responde 200 pelo túnel; sem `probe_url`, basta o processo."""
+        if not self.probe_url:
+            return True
+        try:
+            response = requests.get(
+                self.probe_url, timeout=self.probe_timeout, allow_redirects=False
+            )
+        except requests.RequestException:
+            return False
+        # Um redirecionamento (ex: o HTTPS forçado pelo Talisman) não prova que o app respondeu.
+        return response.status_code == HTTPStatus.OK
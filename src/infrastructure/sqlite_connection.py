@@ -0,0 +1,20 @@
+"""Conexões SQLite curtas compartilhadas pelos armazenamentos em disco."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import sqlite3
+
+from src.config.constants import SQLITE_BUSY_TIMEOUT
+from src.config.constypes import PathLike
+
+
+@contextmanager
+def sqlite_connection(path: PathLike) -> Iterator[sqlite3.Connection]:
+    """Abre uma conexão curta em transação, segura para threads e processos distintos."""
+    connection = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT)
+    connection.row_factory = sqlite3.Row
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
@@ -0,0 +1,102 @@
+"""Renderização de templates HTML pré-compilados, com cache das páginas que se repetem."""
+
+from collections import OrderedDict
+import os
+from pathlib import Path
+import threading
+from typing import TYPE_CHECKING, Any
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import TEMPLATE_DIR, TEMPLATE_RENDER_CACHE_SIZE
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from logging import Logger
+
+
+class TemplateRenderer(BaseClass):
+    """Renderiza templates compilados na inicialização, fora do pipeline do `render_template`.
+
+    Os templates não recebem os globais do Flask (`request`, `url_for`, `session`).
+    """
+
+    def __init__(
+        self,
+        template_dir: str | Path = TEMPLATE_DIR,
+        *,
+        auto_reload: bool | None = None,
+        cache_size: int = TEMPLATE_RENDER_CACHE_SIZE,
+    ) -> None:
+        """Compila todos os templates HTML; `auto_reload` segue `FLASK_DEBUG` por padrão."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        if auto_reload is None:
+            auto_reload = os.getenv("FLASK_DEBUG") == "1"
+        self.auto_reload = auto_reload
+        # Com `auto_reload`, o Jinja verifica a data do arquivo a cada `get_template`.
+        self.environment = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(),
+            auto_reload=auto_reload,
+            cache_size=-1,
+        )
+        self.templates: dict[str, Template] = {
+            name: self.environment.get_template(name)
+            for name in self.environment.list_templates(extensions=["html"])
+        }
+        # Em desenvolvimento, as páginas não são guardadas para refletir edições nos templates.
+        self.cache_size = 0 if auto_reload else cache_size
+        self.hits = 0
+        self.misses = 0
+        self._rendered: OrderedDict[Hashable, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger.info(
+            f"{len(self.templates)} templates compilados de {template_dir} "
+            f"(auto_reload={auto_reload})."
+        )
+
+    def render(self, name: str, **context: Any) -> str:
+        """Renderiza o template compilado, sem cache (páginas com dados únicos por usuário)."""
+        return self._template(name).render(**context)
+
+    def render_cached(self, name: str, **context: Any) -> str:
+        """Renderiza o template, reaproveitando a página já gerada para os mesmos parâmetros.
+
+        Use apenas para parâmetros que se repetem entre requisições (ex: mensagens de erro);
+        páginas únicas só ocupariam o cache e descartariam as reaproveitáveis.
+        """
+        key = (name, *sorted(context.items()))
+        try:
+            hash(key)
+        except TypeError:
+            # Parâmetros mutáveis (listas, dicionários) não entram no cache.
+            return self.render(name, **context)
+        if not self.cache_size:
+            return self.render(name, **context)
+        with self._lock:
+            html = self._rendered.get(key)
+            if html is not None:
+                self._rendered.move_to_end(key)
+                self.hits += 1
+                return html
+        html = self.render(name, **context)
+        with self._lock:
+            self.misses += 1
+            self._rendered[key] = html
+            if len(self._rendered) > self.cache_size:
+                self._rendered.popitem(last=False)
+        return html
+
+    def clear(self) -> None:
+        """Descarta as páginas renderizadas em cache."""
+        with self._lock:
+            self._rendered.clear()
+
+    def _template(self, name: str) -> Template:
+        """Retorna o template compilado; com `auto_reload`, recarrega-o se o arquivo mudou."""
+        if self.auto_reload:
+            return self.environment.get_template(name)
+        template = self.templates.get(name)
+        return template if template is not None else self.environment.get_template(name)
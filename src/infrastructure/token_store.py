@@ -0,0 +1,106 @@
+"""Armazenamento persistente de tokens OAuth dos usuários em SQLite."""
+
+from collections.abc import Iterator
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import TOKEN_STORE_PATH
+from src.config.constypes import PathLike
+from src.infrastructure.logger import LoggerSingleton
+from src.infrastructure.sqlite_connection import sqlite_connection
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    user_id TEXT PRIMARY KEY,
+    refresh_token TEXT NOT NULL,
+    access_token TEXT,
+    expires_at INTEGER,
+    scope TEXT,
+    client_id TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+"""Esquema da tabela de tokens, com um registro por usuário do Spotify."""
+
+
+class TokenStore(BaseClass):
+    """Persiste refresh tokens para execuções offline sem o fluxo interativo do navegador."""
+
+    def __init__(self, path: PathLike = TOKEN_STORE_PATH) -> None:
+        """Abre (ou cria) o banco de tokens no caminho informado."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        self.path = self._ensure_path(path)
+        with sqlite_connection(self.path) as connection:
+            # WAL permite leituras concorrentes de vários processos durante as gravações.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(tokens)")}
+            if "client_id" not in columns:
+                # Bancos criados antes do pool de credenciais não têm a coluna.
+                connection.execute("ALTER TABLE tokens ADD COLUMN client_id TEXT")
+        self.logger.info(f"TokenStore inicializado em {self.path}")
+
+    def save(self, user_id: str, token_info: dict[str, Any], client_id: str | None = None) -> None:
+        """Grava ou atualiza o token do usuário, preservando o refresh token anterior se omitido."""
+        with sqlite_connection(self.path) as connection:
+            connection.execute(
+                """
+                INSERT INTO tokens (user_id, refresh_token, access_token, expires_at, scope,
+                                    client_id, updated_at)
+                VALUES (:user_id, :refresh_token, :access_token, :expires_at, :scope,
+                        :client_id, :updated_at)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    refresh_token = COALESCE(excluded.refresh_token, tokens.refresh_token),
+                    access_token = excluded.access_token,
+                    expires_at = excluded.expires_at,
+                    scope = excluded.scope,
+                    client_id = COALESCE(excluded.client_id, tokens.client_id),
+                    updated_at = excluded.updated_at
+                """,
+                {
+                    "user_id": user_id,
+                    "refresh_token": token_info.get("refresh_token"),
+                    "access_token": token_info.get("access_token"),
+                    "expires_at": token_info.get("expires_at"),
+                    "scope": token_info.get("scope"),
+                    "client_id": client_id,
+                    "updated_at": time.time(),
+                },
+            )
+        self.logger.info(f"Token do usuário {user_id} armazenado.")
+
+    def get(self, user_id: str) -> dict[str, Any] | None:
+        """Retorna o token armazenado do usuário, ou None se não houver."""
+        with sqlite_connection(self.path) as connection:
+            row = connection.execute(
+                "SELECT * FROM tokens WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def iter_refresh_tokens(self, page_size: int = 500) -> Iterator[tuple[str, str, str | None]]:
+        """Itera sobre (usuário, refresh token, client ID) em páginas, sem carregar tudo."""
+        last_user_id = ""
+        while True:
+            # Cada página usa uma conexão curta: nenhum cursor fica aberto entre os yields
+            # (processos criados por fork não podem herdar conexões SQLite abertas).
+            with sqlite_connection(self.path) as connection:
+                rows = connection.execute(
+                    "SELECT user_id, refresh_token, client_id FROM tokens WHERE user_id > ? "
+                    "ORDER BY user_id LIMIT ?",
+                    (last_user_id, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["user_id"], row["refresh_token"], row["client_id"]
+            last_user_id = rows[-1]["user_id"]
+
+    def delete(self, user_id: str) -> None:
+        """Remove o token do usuário (ex: após revogação da autorização)."""
+        with sqlite_connection(self.path) as connection:
+            connection.execute("DELETE FROM tokens WHERE user_id = ?", (user_id,))
+        self.logger.info(f"Token do usuário {user_id} removido.")
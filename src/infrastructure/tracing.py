@@ -0,0 +1,406 @@
+"""Tracing em processo com spans por contexto, propagação W3C `traceparent` e saída JSONL."""
+
+import atexit
+from collections.abc import Callable, Iterable, Iterator
+from contextvars import ContextVar
+from functools import wraps
+import json
+import logging
+from pathlib import Path
+import queue
+import random
+import re
+import threading
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+import requests
+import yaml
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import (
+    SETTINGS_FILE,
+    TRACING_DEFAULT_PATH,
+    TRACING_DEFAULT_SAMPLE_RATE,
+)
+
+if TYPE_CHECKING:
+    from _typeshed.wsgi import StartResponse, WSGIApplication, WSGIEnvironment
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+"""Formato W3C `traceparent` (versão 00): trace ID, span pai e flags."""
+
+_SAMPLED_FLAG = 0x01
+"""Bit de amostragem das flags do `traceparent`."""
+
+
+class Span:
+    """Intervalo de tempo nomeado dentro de um trace, com atributos e status."""
+
+    __slots__ = (
+        "attributes",
+        "duration_ns",
+        "name",
+        "parent_id",
+        "root",
+        "sampled",
+        "span_id",
+        "start_ns",
+        "start_time",
+        "status",
+        "trace_id",
+    )
+
+    def __init__(
+        self, name: str, trace_id: str, parent_id: int | str | None, *, sampled: bool
+    ) -> None:
+        """Inicia o span no instante atual."""
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.root = False
+        self.attributes: dict[str, Any] = {}
+        self.status = "ok"
+        self.start_time = time.time() if sampled else 0.0
+        self.start_ns = time.perf_counter_ns()
+        self.duration_ns = 0
+
+    @property
+    def traceparent(self) -> str:
+        """Retorna o cabeçalho W3C `traceparent` que identifica este span como pai."""
+        return f"00-{self.trace_id}-{self.span_id:016x}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Define um atributo do span (ignorado se o trace não for amostrado)."""
+        if self.sampled:
+            self.attributes[key] = value
+
+    def add_time(self, key: str, seconds: float) -> None:
+        """Acumula um tempo, em milissegundos, em um atributo do span."""
+        if self.sampled:
+            self.attributes[key] = self.attributes.get(key, 0.0) + seconds * 1000
+
+    def to_dict(self) -> dict[str, Any]:
+        """Retorna a representação do span gravada no arquivo JSONL."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": f"{self.span_id:016x}",
+            "parent_id": (
+                f"{self.parent_id:016x}" if isinstance(self.parent_id, int) else self.parent_id
+            ),
+            "name": self.name,
+            "start": round(self.start_time, 6),
+            "duration_ms": round(self.duration_ns / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+"""Span ativo no contexto atual (thread, tarefa asyncio ou cópia de contexto)."""
+
+
+class _NoopScope:
+    """Escopo vazio devolvido quando o tracing está desligado; custa apenas uma chamada."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_: object) -> None:
+        return None
+
+
+_NOOP_SCOPE = _NoopScope()
+"""Instância única do escopo vazio."""
+
+
+class _SpanScope:
+    """Context manager que ativa um span no contexto atual e o finaliza na saída."""
+
+    __slots__ = ("span", "token", "tracer")
+
+    def __init__(self, tracer: "Tracer", span: Span) -> None:
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        _tb: TracebackType | None,
+    ) -> None:
+        _current_span.reset(self.token)
+        if exc_type is not None:
+            self.span.status = "error"
+            self.span.set_attribute("error", f"{exc_type.__name__}: {exc}")
+        self.tracer.finish(self.span)
+
+
+class Tracer(BaseClass):
+    """Cria spans, decide a amostragem por trace e grava os traces finalizados em JSONL."""
+
+    def __init__(self) -> None:
+        """Inicializa o tracer desligado; `configure` o habilita."""
+        self.enabled = False
+        self.sample_rate = TRACING_DEFAULT_SAMPLE_RATE
+        self.path = Path(TRACING_DEFAULT_PATH)
+        self._open_traces: dict[str, list[Span]] = {}
+        self._lock = threading.Lock()
+        self._pending: queue.SimpleQueue[list[Span] | None] = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+
+    def configure(
+        self,
+        *,
+        enabled: bool,
+        sample_rate: float = TRACING_DEFAULT_SAMPLE_RATE,
+        path: str | Path = TRACING_DEFAULT_PATH,
+    ) -> None:
+        """Liga ou desliga o tracing e define a taxa de amostragem e o arquivo de saída."""
+        self.shutdown()
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.path = self._ensure_path(path)
+        self.enabled = enabled
+        if enabled:
+            _instrument_logging(logging.getLogger())
+            self._writer = threading.Thread(
+                target=self._write_loop, args=(self.path,), name="tracing", daemon=True
+            )
+            self._writer.start()
+
+    def shutdown(self) -> None:
+        """Grava os traces pendentes e encerra a thread de escrita."""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._pending.put(None)
+            writer.join()
+
+    def configure_from_settings(self, settings_file: str | Path = SETTINGS_FILE) -> None:
+        """Configura o tracing a partir da seção `tracing` do arquivo de configurações."""
+        path = Path(settings_file)
+        settings: dict[str, Any] = {}
+        if path.is_file():
+            with path.open("r", encoding="utf-8") as file:
+                settings = (yaml.safe_load(file) or {}).get("tracing") or {}
+        self.configure(
+            enabled=bool(settings.get("enabled", False)),
+            sample_rate=float(settings.get("sample_rate", TRACING_DEFAULT_SAMPLE_RATE)),
+            path=settings.get("path", TRACING_DEFAULT_PATH),
+        )
+
+    def span(self, name: str, **attributes: Any) -> _SpanScope | _NoopScope:
+        """Abre um span filho do span atual (ou a raiz de um novo trace)."""
+        if not self.enabled:
+            return _NOOP_SCOPE
+        parent = _current_span.get()
+        if parent is None:
+            span = Span(name, f"{random.getrandbits(128):032x}", None, sampled=self._sample())
+            self._open(span)
+        elif not parent.sampled:
+            # Trace descartado: a raiz já carrega a decisão e o `traceparent` propagado.
+            return _NOOP_SCOPE
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, sampled=True)
+        if attributes and span.sampled:
+            span.attributes.update(attributes)
+        return _SpanScope(self, span)
+
+    def start_trace(
+        self, name: str, traceparent: str | None = None, **attributes: Any
+    ) -> _SpanScope | _NoopScope:
+        """Abre o span raiz de uma requisição, continuando o trace do `traceparent` recebido."""
+        if not self.enabled:
+            return _NOOP_SCOPE
+        match = _TRACEPARENT.match(traceparent or "")
+        if match is None:
+            span = Span(name, f"{random.getrandbits(128):032x}", None, sampled=self._sample())
+        else:
+            trace_id, parent_id, flags = match.groups()
+            sampled = bool(int(flags, 16) & _SAMPLED_FLAG)
+            span = Span(name, trace_id, parent_id, sampled=sampled)
+        self._open(span)
+        if attributes and span.sampled:
+            span.attributes.update(attributes)
+        return _SpanScope(self, span)
+
+    def current(self) -> Span | None:
+        """Retorna o span ativo no contexto atual."""
+        return _current_span.get()
+
+    def traceparent(self) -> str | None:
+        """Retorna o `traceparent` do span atual, para propagação em chamadas de saída."""
+        span = _current_span.get()
+        return span.traceparent if span is not None else None
+
+    def finish(self, span: Span) -> None:
+        """Finaliza o span e grava o trace inteiro quando a raiz local termina."""
+        span.duration_ns = time.perf_counter_ns() - span.start_ns
+        if not span.sampled:
+            return
+        with self._lock:
+            spans = self._open_traces.get(span.trace_id)
+            if spans is not None and not span.root:
+                spans.append(span)
+                return
+            # Raiz local: grava o trace; span tardio (ex: requisição duplicada): grava sozinho.
+            if span.root:
+                self._open_traces.pop(span.trace_id, None)
+            finished = [*(spans if span.root and spans else []), span]
+        # A serialização e a escrita ficam fora da thread da requisição.
+        self._pending.put(finished)
+
+    def _open(self, span: Span) -> None:
+        """Registra a raiz local de um trace amostrado para acumular seus spans."""
+        span.root = True
+        if span.sampled:
+            with self._lock:
+                self._open_traces.setdefault(span.trace_id, [])
+
+    def _write_loop(self, path: Path) -> None:
+        """Grava em JSONL os traces finalizados, até receber o sinal de encerramento."""
+        with path.open("a", encoding="utf-8") as file:
+            while (finished := self._pending.get()) is not None:
+                file.writelines(json.dumps(span.to_dict(), default=str) + "\n" for span in finished)
+                if self._pending.empty():
+                    file.flush()
+
+    def _sample(self) -> bool:
+        """Decide se um novo trace será gravado."""
+        return random.random() < self.sample_rate  # noqa: S311
+
+
+tracer = Tracer()
+"""Tracer da aplicação, desligado até ser configurado."""
+
+atexit.register(tracer.shutdown)
+
+
+def traced[**P, R](name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decora uma função para registrar um span a cada chamada."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TracedSession(requests.Session):
+    """Sessão HTTP que registra um span por requisição e propaga o `traceparent`."""
+
+    def request(self, method: str | bytes, url: str | bytes, *args: Any, **kwargs: Any) -> Any:
+        """Executa a requisição dentro de um span `HTTP <método>`."""
+        if not tracer.enabled:
+            return super().request(method, url, *args, **kwargs)
+        method_name = method.decode() if isinstance(method, bytes) else method
+        target = url.decode() if isinstance(url, bytes) else url
+        with tracer.span(f"HTTP {method_name}", url=target.split("?", 1)[0]) as span:
+            traceparent = span.traceparent if span is not None else tracer.traceparent()
+            if traceparent is not None:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), "traceparent": traceparent}
+            response = super().request(method, url, *args, **kwargs)
+            if span is not None:
+                span.set_attribute("status_code", response.status_code)
+            return response
+
+
+class TracingMiddleware:
+    """Middleware WSGI que abre o span raiz de cada requisição, incluindo o corpo transmitido."""
+
+    def __init__(self, app: "WSGIApplication") -> None:
+        """Envolve a aplicação WSGI informada."""
+        self.app = app
+
+    def __call__(
+        self, environ: "WSGIEnvironment", start_response: "StartResponse"
+    ) -> Iterable[bytes]:
+        """Executa a requisição dentro de um trace, continuando o `traceparent` recebido."""
+        if not tracer.enabled:
+            return self.app(environ, start_response)
+        scope = tracer.start_trace(
+            f"{environ.get('REQUEST_METHOD')} {environ.get('PATH_INFO')}",
+            environ.get("HTTP_TRACEPARENT"),
+        )
+        span = scope.__enter__()
+        try:
+            result = self.app(environ, start_response)
+        except BaseException as error:
+            _current_span.reset(scope.token)
+            span.status = "error"
+            span.set_attribute("error", f"{type(error).__name__}: {error}")
+            tracer.finish(span)
+            raise
+        # O span volta a ser ativado a cada bloco do corpo em `_TracedBody`.
+        _current_span.reset(scope.token)
+        return _TracedBody(result, span)
+
+
+class _TracedBody:
+    """Corpo da resposta WSGI que mantém o span raiz ativo até o último bloco."""
+
+    def __init__(self, result: Iterable[bytes], span: Span) -> None:
+        self.result = result
+        self.span = span
+
+    def __iter__(self) -> Iterator[bytes]:
+        iterator = iter(self.result)
+        while True:
+            token = _current_span.set(self.span)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _current_span.reset(token)
+            yield chunk
+
+    def close(self) -> None:
+        """Fecha o corpo original e finaliza o span raiz."""
+        try:
+            close = getattr(self.result, "close", None)
+            if close is not None:
+                close()
+        finally:
+            tracer.finish(self.span)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+def _instrument_logging(logger: logging.Logger) -> None:
+    """Acumula no span atual o tempo gasto pelos handlers de log."""
+    for handler in logger.handlers:
+        if getattr(handler, "_traced", False):
+            continue
+        original = handler.handle
+
+        def handle(record: logging.LogRecord, original: Callable = original) -> Any:
+            span = _current_span.get() if tracer.enabled else None
+            if span is None or not span.sampled:
+                return original(record)
+            started = time.perf_counter()
+            try:
+                return original(record)
+            finally:
+                span.add_time("log_ms", time.perf_counter() - started)
+
+        handler.handle = handle  # type: ignore[method-assign]
+        handler._traced = True  # type: ignore[attr-defined]  # noqa: SLF001
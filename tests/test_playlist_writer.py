@@ -0,0 +1,136 @@
+"""Testes da inserção em lotes com checkpoint e da retomada sem duplicar faixas."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from spotipy.exceptions import SpotifyException
+
+from src.application.playlist_writer import PlaylistWriter
+from src.config.constants import SPOTIFY_ADD_ITEMS_LIMIT
+from src.infrastructure.checkpoint_store import CheckpointStore, PlaylistJob
+from src.infrastructure.resilience import ResilientCaller
+
+_PLAYLIST = {"id": "playlist", "external_urls": {"spotify": "https://open.spotify.com/p"}}
+"""Playlist de destino devolvida pelo Spotify na criação."""
+
+_TRACKS = [f"spotify:track:{index}" for index in range(SPOTIFY_ADD_ITEMS_LIMIT * 2 + 10)]
+"""Faixas do job: três lotes, o último incompleto."""
+
+
+class FakeSpotify:
+    """Playlist em memória que registra cada faixa adicionada e pode falhar num lote."""
+
+    def __init__(self) -> None:
+        """Começa com a playlist vazia e sem falhas programadas."""
+        self.items: list[str] = []
+        self.calls = 0
+        self.fail_on: int | None = None
+        self.fail_after_apply = False
+
+    def playlist_add_items(self, _playlist_id: str, items: list[str]) -> dict[str, Any]:
+        """Adiciona o lote; na chamada `fail_on`, falha antes ou depois de aplicá-lo."""
+        self.calls += 1
+        if self.calls == self.fail_on:
+            if self.fail_after_apply:
+                # A resposta se perde depois que o Spotify já aplicou o lote.
+                self.items.extend(items)
+            raise SpotifyException(500, -1, "HTTP 500")
+        self.items.extend(items)
+        return {"snapshot_id": self._snapshot()}
+
+    def playlist(self, _playlist_id: str, fields: str) -> dict[str, Any]:  # noqa: ARG002
+        """Retorna o `snapshot_id` e o total de faixas atuais."""
+        return {"snapshot_id": self._snapshot(), "tracks": {"total": len(self.items)}}
+
+    def _snapshot(self) -> str:
+        """Gera um `snapshot_id` que muda a cada alteração da playlist."""
+        return f"snapshot-{len(self.items)}"
+
+
+@pytest.fixture
+def checkpoints(tmp_path: Path) -> CheckpointStore:
+    """Banco de checkpoints isolado por teste."""
+    return CheckpointStore(tmp_path / "checkpoints.db")
+
+
+def _writer(checkpoints: CheckpointStore) -> PlaylistWriter:
+    """Escritor sem novas tentativas nem hedging, para que cada falha chegue ao teste."""
+    return PlaylistWriter(ResilientCaller(max_attempts=1, hedging=False), checkpoints)
+
+
+def _interrupted_job(
+    spotify: FakeSpotify, checkpoints: CheckpointStore, *, after_apply: bool
+) -> PlaylistJob:
+    """Executa o job até falhar no segundo lote e retorna o checkpoint gravado."""
+    job = checkpoints.start("job", "user", _PLAYLIST, _TRACKS)
+    spotify.fail_on = 2
+    spotify.fail_after_apply = after_apply
+    with pytest.raises(SpotifyException):
+        _writer(checkpoints).write(spotify, job)
+    spotify.fail_on = None
+    pending = checkpoints.get("job")
+    assert pending is not None
+    return pending
+
+
+def test_resume_sends_only_pending_batches(checkpoints: CheckpointStore) -> None:
+    """Retomar um job interrompido envia só os lotes que o Spotify não recebeu."""
+    spotify = FakeSpotify()
+    job = _interrupted_job(spotify, checkpoints, after_apply=False)
+    assert job.committed == SPOTIFY_ADD_ITEMS_LIMIT
+
+    finished = _writer(checkpoints).write(spotify, job)
+
+    assert finished.done
+    assert spotify.items == _TRACKS
+    assert checkpoints.get("job") is None
+
+
+def test_reconcile_commits_batch_applied_without_checkpoint(
+    checkpoints: CheckpointStore,
+) -> None:
+    """Um lote aplicado cuja resposta se perdeu é confirmado, não reenviado."""
+    spotify = FakeSpotify()
+    job = _interrupted_job(spotify, checkpoints, after_apply=True)
+    assert job.committed == SPOTIFY_ADD_ITEMS_LIMIT
+
+    reconciled = _writer(checkpoints)._reconcile(spotify, job)  # noqa: SLF001
+
+    assert reconciled.committed == SPOTIFY_ADD_ITEMS_LIMIT * 2
+    assert reconciled.snapshot_id == spotify._snapshot()  # noqa: SLF001
+
+
+def test_resume_after_lost_response_does_not_duplicate(checkpoints: CheckpointStore) -> None:
+    """A retomada após uma resposta perdida termina com cada faixa uma única vez."""
+    spotify = FakeSpotify()
+    job = _interrupted_job(spotify, checkpoints, after_apply=True)
+
+    _writer(checkpoints).write(spotify, job)
+
+    assert spotify.items == _TRACKS
+
+
+def test_resume_finished_job_sends_nothing(checkpoints: CheckpointStore) -> None:
+    """Um job cujos lotes já foram todos aplicados não reenvia nenhuma faixa."""
+    spotify = FakeSpotify()
+    job = checkpoints.start("job", "user", _PLAYLIST, _TRACKS)
+    spotify.items = list(_TRACKS)
+    calls = spotify.calls
+
+    finished = _writer(checkpoints).write(spotify, job)
+
+    assert finished.done
+    assert spotify.calls == calls
+    assert spotify.items == _TRACKS
+
+
+def test_resume_pending_only_touches_user_jobs(checkpoints: CheckpointStore) -> None:
+    """`resume_pending` conclui os jobs do usuário e ignora os de outros usuários."""
+    spotify = FakeSpotify()
+    _interrupted_job(spotify, checkpoints, after_apply=False)
+    checkpoints.start("other", "someone-else", {"id": "other"}, _TRACKS)
+
+    assert _writer(checkpoints).resume_pending(spotify, "user") == 1
+    assert spotify.items == _TRACKS
+    assert checkpoints.get("other") is not None
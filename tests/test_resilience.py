@@ -0,0 +1,140 @@
+"""Testes do circuit breaker, dos prazos e do hedging do `ResilientCaller`."""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Any
+
+import pytest
+import requests
+from spotipy.exceptions import SpotifyException
+from spotipy.oauth2 import SpotifyOauthError
+
+from src.common.errors.errors import CircuitOpenError, DeadlineExceededError
+from src.config.constants import (
+    RESILIENCE_BREAKER_FAILURE_THRESHOLD,
+    RESILIENCE_HEDGE_MIN_SAMPLES,
+    SPOTIFY_REQUEST_TIMEOUT,
+)
+from src.infrastructure.resilience import (
+    CircuitBreaker,
+    DeadlineSession,
+    ResilientCaller,
+    deadline_scope,
+)
+
+_ENDPOINT = "playlists"
+"""Endpoint usado nos testes."""
+
+
+def _raise(status: int) -> None:
+    """Simula uma resposta de erro do Spotify com o status informado."""
+    raise SpotifyException(status, -1, f"HTTP {status}")
+
+
+def _open_breaker() -> tuple[ResilientCaller, CircuitBreaker]:
+    """Abre o circuito do endpoint com um 503 e libera a sonda do meio-aberto."""
+    caller = ResilientCaller(max_attempts=1, hedging=False)
+    breaker = caller.breaker(_ENDPOINT)
+    breaker.failure_threshold = 1
+    with pytest.raises(SpotifyException):
+        caller.call(_ENDPOINT, _raise, 503)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        caller.call(_ENDPOINT, lambda: "ok")
+    breaker.reset_timeout = 0
+    return caller, breaker
+
+
+def test_probe_with_client_error_closes_circuit() -> None:
+    """Uma sonda que recebe 4xx mostra que o endpoint respondeu e fecha o circuito."""
+    caller, breaker = _open_breaker()
+    with pytest.raises(SpotifyException):
+        caller.call(_ENDPOINT, _raise, 404)
+    assert breaker.state == "closed"
+    assert caller.call(_ENDPOINT, lambda: "ok") == "ok"
+
+
+def test_probe_with_unexpected_error_releases_probe() -> None:
+    """Uma sonda interrompida por erro fora da política reabre o circuito sem travá-lo."""
+    caller, breaker = _open_breaker()
+
+    def expire() -> None:
+        raise DeadlineExceededError("prazo")
+
+    with pytest.raises(DeadlineExceededError):
+        caller.call(_ENDPOINT, expire)
+    assert breaker.state == "half-open"
+    assert caller.call(_ENDPOINT, lambda: "ok") == "ok"
+    assert breaker.state == "closed"
+
+
+def test_rejected_oauth_code_does_not_open_circuit() -> None:
+    """Códigos OAuth inválidos ou reutilizados não bloqueiam a troca de token dos demais."""
+    caller = ResilientCaller(max_attempts=1, hedging=False)
+
+    def exchange() -> None:
+        raise SpotifyOauthError("invalid_grant", error="invalid_grant")
+
+    for _ in range(RESILIENCE_BREAKER_FAILURE_THRESHOLD * 2):
+        with pytest.raises(SpotifyOauthError):
+            caller.call("oauth/token", exchange)
+    assert caller.breaker("oauth/token").state == "closed"
+
+
+def test_oauth_server_error_counts_as_failure() -> None:
+    """Um 5xx do endpoint de token, convertido pelo spotipy, continua abrindo o circuito."""
+    caller = ResilientCaller(max_attempts=1, hedging=False)
+    caller.breaker("oauth/token").failure_threshold = 1
+    response = requests.Response()
+    response.status_code = 503
+
+    def post() -> None:
+        raise requests.HTTPError(response=response)
+
+    def exchange() -> None:
+        # Como no spotipy: o `HTTPError` fica no contexto do `SpotifyOauthError`.
+        try:
+            post()
+        except requests.HTTPError:
+            raise SpotifyOauthError("server_error") from None
+
+    with pytest.raises(SpotifyOauthError):
+        caller.call("oauth/token", exchange)
+    assert caller.breaker("oauth/token").state == "open"
+
+
+def test_session_bounds_timeout_by_remaining_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """O timeout de cada requisição é limitado pelo prazo restante no momento da chamada."""
+    timeouts: list[float] = []
+
+    def fake_request(_: requests.Session, *__: Any, **kwargs: Any) -> None:
+        timeouts.append(kwargs["timeout"])
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    session = DeadlineSession()
+    session.request("GET", "https://api.spotify.com/v1/me", timeout=SPOTIFY_REQUEST_TIMEOUT)
+    with deadline_scope(0.5):
+        session.request("GET", "https://api.spotify.com/v1/me", timeout=SPOTIFY_REQUEST_TIMEOUT)
+    assert timeouts[0] == SPOTIFY_REQUEST_TIMEOUT
+    assert 0 < timeouts[1] <= 0.5  # noqa: PLR2004
+
+
+def test_queued_primary_is_not_hedged() -> None:
+    """Uma chamada que só espera na fila do pool não é duplicada ao passar do p95."""
+    caller = ResilientCaller(max_attempts=1)
+    caller.breaker(_ENDPOINT)
+    for _ in range(RESILIENCE_HEDGE_MIN_SAMPLES):
+        caller._latencies[_ENDPOINT].record(0.001)  # noqa: SLF001
+    caller._executor = ThreadPoolExecutor(max_workers=1)  # noqa: SLF001
+    release = threading.Event()
+    caller._executor.submit(release.wait)  # noqa: SLF001
+    calls: list[float] = []
+
+    def fetch() -> str:
+        calls.append(time.monotonic())
+        return "ok"
+
+    threading.Timer(0.1, release.set).start()
+    assert caller.call(_ENDPOINT, fetch, idempotent=True) == "ok"
+    assert len(calls) == 1
@@ -0,0 +1,104 @@
+"""Testes da supervisão do túnel com um subprocesso fictício no lugar do ssh."""
+
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import sys
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from src.infrastructure.return_handler import ReturnHandler
+from src.infrastructure.serveo_tunnel_manager import ServeoTunnelManager
+
+_TIMEOUT = 5.0
+"""Segundos máximos de espera por uma condição da supervisão."""
+
+_PROBE_FAILURES = 2
+"""Verificações seguidas com falha que derrubam o túnel nos testes."""
+
+_RESTARTS = 2
+"""Reinícios aguardados no teste de processo que sai sozinho."""
+
+
+def _settings(script: str, probe_url: str | None = None) -> dict[str, Any]:
+    """Configura o túnel para executar `script` em Python em vez do ssh, com esperas curtas."""
+    return {
+        "domain": "teste:80:localhost:8888",
+        "enabled": True,
+        "command": [sys.executable, "-c", script],
+        "probe_url": probe_url,
+        "probe_interval": 0.05,
+        "probe_timeout": 1,
+        "probe_failures": _PROBE_FAILURES,
+        "backoff_initial": 0.01,
+        "backoff_max": 0.05,
+    }
+
+
+def _wait_for(condition: Any) -> None:
+    """Aguarda a condição ficar verdadeira ou falha após `_TIMEOUT`."""
+    deadline = time.monotonic() + _TIMEOUT
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Condição não atingida a tempo.")
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def health_server() -> Iterator[tuple[str, dict[str, int]]]:
+    """Servidor HTTP local cujo status de resposta é controlado pelo teste."""
+    state = {"status": HTTPStatus.OK}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(state["status"])
+            self.send_header("Location", "https://localhost/healthz")
+            self.end_headers()
+
+        def log_message(self, *_: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/healthz", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_restarts_process_that_exits() -> None:
+    """Um processo que sai sozinho é reiniciado com backoff até a supervisão parar."""
+    manager = ServeoTunnelManager(ReturnHandler(), _settings("import time; time.sleep(0.1)"))
+    manager.supervise()
+    try:
+        _wait_for(lambda: manager.metrics.restarts >= _RESTARTS)
+    finally:
+        manager.stop()
+    assert manager.metrics.last_exit_code is not None
+    assert not manager.snapshot()["running"]
+
+
+def test_probe_requires_ok(health_server: tuple[str, dict[str, int]]) -> None:
+    """Só um 200 conta como saudável; um redirecionamento não."""
+    url, state = health_server
+    manager = ServeoTunnelManager(ReturnHandler(), _settings("pass", url))
+    assert manager._probe()  # noqa: SLF001
+    state["status"] = HTTPStatus.FOUND
+    assert not manager._probe()  # noqa: SLF001
+
+
+def test_restarts_after_failed_probes(health_server: tuple[str, dict[str, int]]) -> None:
+    """Verificações seguidas com falha derrubam e reiniciam um processo ainda vivo."""
+    url, state = health_server
+    state["status"] = HTTPStatus.FOUND
+    manager = ServeoTunnelManager(ReturnHandler(), _settings("import time; time.sleep(30)", url))
+    manager.supervise()
+    try:
+        _wait_for(lambda: manager.metrics.restarts >= 1)
+    finally:
+        manager.stop()
+    assert manager.metrics.probe_failures >= _PROBE_FAILURES
+    assert not manager.snapshot()["running"]
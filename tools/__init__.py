@@ -0,0 +1 @@
+"""Scripts utilitários e benchmarks do projeto."""
@@ -0,0 +1,109 @@
+"""Benchmark da renderização de `app.html`/`error.html`: Flask contra o `TemplateRenderer`.
+
+Execute a partir da raiz do projeto: `python -m tools.bench_templates --requests 20000`.
+"""
+
+import argparse
+from collections.abc import Callable
+import random
+import time
+from typing import Any
+
+from flask import Flask, render_template
+
+from src.application.playlist_specs import PlaylistResult
+from src.config.constants import APP_TEMPLATE, TEMPLATE_DIR
+from src.infrastructure.template_renderer import TemplateRenderer
+
+_ERRORS = (
+    "Nenhuma faixa do arquivo foi encontrada no Spotify.",
+    "Erro ao criar a playlist no Spotify.",
+    "Parâmetro 'code' ausente na URL de callback.",
+    "Formato de importação não suportado: .txt",
+    "Spotify indisponível no momento. Tente novamente.",
+)
+"""Mensagens de erro que se repetem entre as requisições, como no `/callback`."""
+
+type Page = tuple[str, dict[str, Any], bool]
+"""Requisição simulada: template, parâmetros e se os parâmetros se repetem (cacheáveis)."""
+
+
+def _workload(requests: int, error_ratio: float, seed: int = 42) -> list[Page]:
+    """Gera as requisições: erros de um conjunto pequeno e páginas de playlists únicas."""
+    rng = random.Random(seed)  # noqa: S311
+    pages: list[Page] = []
+    for index in range(requests):
+        if rng.random() < error_ratio:
+            pages.append(("error.html", {"error": rng.choice(_ERRORS)}, True))
+            continue
+        # Cada usuário recebe links próprios: a página de sucesso nunca se repete.
+        results = [
+            PlaylistResult(
+                f"Playlist {item}", f"https://open.spotify.com/playlist/{index:016x}{item}"
+            )
+            for item in range(rng.randint(1, 4))
+        ]
+        pages.append((APP_TEMPLATE, {"playlists": results}, False))
+    return pages
+
+
+def _measure(render: Callable[[str, dict[str, Any], bool], str], pages: list[Page]) -> float:
+    """Retorna o tempo médio, em microssegundos, de cada renderização."""
+    started = time.perf_counter()
+    for name, context, repeats in pages:
+        render(name, context, repeats)
+    return (time.perf_counter() - started) / len(pages) * 1e6
+
+
+def main() -> None:
+    """Compara o tempo por requisição do `render_template` e do `TemplateRenderer`."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000, help="Requisições simuladas.")
+    parser.add_argument(
+        "--error-ratio", type=float, default=0.2, help="Fração de requisições com página de erro."
+    )
+    args = parser.parse_args()
+    pages = _workload(args.requests, args.error_ratio)
+
+    def flask_render(name: str, context: dict[str, Any], _: bool) -> str:  # noqa: FBT001
+        return render_template(name, **context)
+
+    app = Flask(__name__, template_folder=TEMPLATE_DIR.resolve())
+    with app.app_context():
+        app.jinja_env.auto_reload = True
+        flask_reload = _measure(flask_render, pages)
+        app.jinja_env.auto_reload = False
+        flask_static = _measure(flask_render, pages)
+
+    compiled = TemplateRenderer(auto_reload=False)
+    renderer = TemplateRenderer(auto_reload=False)
+
+    def uncached(name: str, context: dict[str, Any], _: bool) -> str:  # noqa: FBT001
+        return compiled.render(name, **context)
+
+    def production(name: str, context: dict[str, Any], repeats: bool) -> str:  # noqa: FBT001
+        # Como no handler: só as páginas com parâmetros repetidos passam pelo cache.
+        if repeats:
+            return renderer.render_cached(name, **context)
+        return renderer.render(name, **context)
+
+    results = [
+        ("render_template (auto_reload)", flask_reload),
+        ("render_template", flask_static),
+        ("TemplateRenderer sem cache", _measure(uncached, pages)),
+        ("TemplateRenderer (cache de erros)", _measure(production, pages)),
+    ]
+    errors = sum(repeats for _, _, repeats in pages)
+    print(f"{len(pages):,} requisições, {errors:,} com página de erro")
+    for label, micros in results:
+        print(f"{label:<34} {micros:8.1f} µs/requisição  ({flask_reload / micros:5.2f}x)")
+    lookups = renderer.hits + renderer.misses
+    print(
+        f"Cache: {renderer.hits:,} acertos, {renderer.misses:,} faltas "
+        f"({renderer.hits / max(lookups, 1):.1%} das páginas cacheáveis, "
+        f"{renderer.hits / len(pages):.1%} das requisições)"
+    )
+
+
+if __name__ == "__main__":
+    main()
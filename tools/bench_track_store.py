@@ -0,0 +1,137 @@
+"""Benchmark de memória do `TrackStore` contra o JSON bruto retornado pelo spotipy.
+
+Execute a partir da raiz do projeto: `python -m tools.bench_track_store --tracks 1000000`.
+"""
+
+import argparse
+import random
+import string
+import time
+import tracemalloc
+from typing import Any
+
+from src.application.track_store import TrackStore
+
+_ALPHABET = string.digits + string.ascii_letters
+"""Alfabeto base62 usado nos IDs do Spotify."""
+
+_PAGE_SIZE = 100
+"""Quantidade de itens por página, igual ao limite de `playlist_items`."""
+
+_EXPLICIT_RATIO = 0.1
+"""Proporção de faixas sintéticas marcadas como explícitas."""
+
+
+def _spotify_id(rng: random.Random) -> str:
+    """Gera um ID base62 aleatório com 22 caracteres."""
+    return "".join(rng.choices(_ALPHABET, k=22))
+
+
+def _fake_page(rng: random.Random, artists: list[str], albums: list[str]) -> dict[str, Any]:
+    """Gera uma página sintética no formato de `playlist_items` do Spotify."""
+    items = []
+    for _ in range(_PAGE_SIZE):
+        track_id = _spotify_id(rng)
+        album_id = rng.choice(albums)
+        artist_ids = rng.sample(artists, k=rng.choice((1, 1, 1, 2)))
+        artist_objects = [
+            {
+                "external_urls": {"spotify": f"https://open.spotify.com/artist/{artist_id}"},
+                "href": f"https://api.spotify.com/v1/artists/{artist_id}",
+                "id": artist_id,
+                "name": f"Artista {artist_id[:6]}",
+                "type": "artist",
+                "uri": f"spotify:artist:{artist_id}",
+            }
+            for artist_id in artist_ids
+        ]
+        items.append(
+            {
+                "added_at": "2025-01-01T00:00:00Z",
+                "added_by": {"id": "usuario", "type": "user"},
+                "is_local": False,
+                "track": {
+                    "album": {
+                        "album_type": "album",
+                        "artists": artist_objects,
+                        "available_markets": ["BR", "US", "PT", "AR", "MX"],
+                        "href": f"https://api.spotify.com/v1/albums/{album_id}",
+                        "id": album_id,
+                        "images": [
+                            {
+                                "height": size,
+                                "width": size,
+                                "url": f"https://i.scdn.co/{album_id}/{size}",
+                            }
+                            for size in (640, 300, 64)
+                        ],
+                        "name": f"Álbum {album_id[:6]}",
+                        "release_date": "2020-01-01",
+                        "type": "album",
+                        "uri": f"spotify:album:{album_id}",
+                    },
+                    "artists": artist_objects,
+                    "available_markets": ["BR", "US", "PT", "AR", "MX"],
+                    "disc_number": 1,
+                    "duration_ms": rng.randint(120_000, 360_000),
+                    "explicit": rng.random() < _EXPLICIT_RATIO,
+                    "external_ids": {"isrc": f"BR{rng.randint(0, 10**10):010d}"},
+                    "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+                    "href": f"https://api.spotify.com/v1/tracks/{track_id}",
+                    "id": track_id,
+                    "is_local": False,
+                    "name": f"Faixa {track_id[:10]}",
+                    "popularity": rng.randint(0, 100),
+                    "track_number": rng.randint(1, 12),
+                    "type": "track",
+                    "uri": f"spotify:track:{track_id}",
+                },
+            }
+        )
+    return {"items": items, "next": None}
+
+
+def main() -> None:
+    """Compara o consumo de memória do JSON bruto e do `TrackStore` para N faixas."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=1_000_000, help="Faixas no TrackStore.")
+    parser.add_argument(
+        "--raw-sample", type=int, default=20_000, help="Faixas mantidas como JSON bruto."
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(42)  # noqa: S311
+    artists = [_spotify_id(rng) for _ in range(max(args.tracks // 20, 1))]
+    albums = [_spotify_id(rng) for _ in range(max(args.tracks // 10, 1))]
+
+    tracemalloc.start()
+    raw_pages = [_fake_page(rng, artists, albums) for _ in range(args.raw_sample // _PAGE_SIZE)]
+    raw_bytes = tracemalloc.get_traced_memory()[0]
+    del raw_pages
+    tracemalloc.stop()
+    raw_per_track = raw_bytes / args.raw_sample
+    print(f"JSON bruto: {raw_per_track:,.0f} bytes/faixa (amostra de {args.raw_sample:,} faixas)")
+    raw_total = raw_per_track * args.tracks / 1e9
+    print(f"JSON bruto estimado para {args.tracks:,} faixas: {raw_total:.2f} GB")
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    store = TrackStore()
+    started = time.perf_counter()
+    for _ in range(args.tracks // _PAGE_SIZE):
+        # Cada página é descartada logo após ser convertida para as colunas.
+        store.extend_from_page(_fake_page(rng, artists, albums))
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    store_bytes = current - baseline
+    print(
+        f"TrackStore: {len(store):,} faixas, {store_bytes / 1e6:.1f} MB "
+        f"({store_bytes / max(len(store), 1):,.0f} bytes/faixa), "
+        f"pico {(peak - baseline) / 1e6:.1f} MB, {elapsed:.1f}s"
+    )
+    print(f"Redução: {raw_per_track * len(store) / max(store_bytes, 1):,.0f}x")
+
+
+if __name__ == "__main__":
+    main()